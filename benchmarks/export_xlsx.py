@@ -0,0 +1,165 @@
+"""
+Бенчмарк выгрузки Excel: прежний путь (pandas DataFrame + pd.ExcelWriter в
+BytesIO) против потоковой записи openpyxl write_only (ExportService.write).
+
+Каждый режим запускается в отдельном процессе, чтобы пиковый RSS не смешивался:
+
+    python benchmarks/export_xlsx.py --patients 2000
+
+Нужны pandas и openpyxl из src/requirements.txt. БД — временный SQLite-файл
+с заполненными срезами T0–T12 (лист «Срезы» — самый широкий).
+"""
+import argparse
+import json
+import os
+import random
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import date, datetime, time as dtime
+from pathlib import Path
+
+SRC = Path(__file__).resolve().parents[1] / "src"
+
+
+def _tables() -> list[str]:
+    # все таблицы выгрузки: пациенты, статусы, шкалы и срезы T0–T12
+    from database.services.export import TABLES
+
+    return list(TABLES)
+
+
+def _peak_rss_mb() -> float:
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux — КиБ, macOS — байты
+    return peak / 1024 / (1024 if sys.platform == "darwin" else 1)
+
+
+def _random_value(column):
+    from sqlalchemy import Boolean, Date, DateTime, Float, Integer, SmallInteger, String, Time
+
+    t = column.type
+    if isinstance(t, Boolean):
+        return random.random() < 0.5
+    if isinstance(t, (Integer, SmallInteger)):
+        return random.randint(0, 100)
+    if isinstance(t, Float):
+        return round(random.uniform(0, 200), 2)
+    if isinstance(t, String):
+        return "x" * min(8, t.length or 8)
+    if isinstance(t, DateTime):
+        return datetime(2024, 5, 1, 10, 0)
+    if isinstance(t, Date):
+        return date(2024, 5, 1)
+    if isinstance(t, Time):
+        return dtime(10, 30)
+    return None
+
+
+def seed(patients: int) -> None:
+    from sqlalchemy import insert
+
+    from database.db import engine
+    from database.models import Person, PersonSlices
+    from database.services.slices import SLICES
+
+    random.seed(1)
+    skip = {"id", "slices_id", "created_at", "updated_at"}
+    with engine.begin() as conn:
+        conn.execute(insert(Person), [
+            {
+                "card_number": f"B{i}", "last_name": f"Фамилия{i}", "first_name": "Имя",
+                "birth_date": date(1950 + i % 50, 1, 1), "inclusion_date": date(2024, 1, 1),
+                "height": 170, "weight": 110, "gender": bool(i % 2),
+            }
+            for i in range(patients)
+        ])
+        conn.execute(insert(PersonSlices), [
+            {"person_id": i + 1, **{spec.flag: True for spec in SLICES.values()}}
+            for i in range(patients)
+        ])
+        for spec in SLICES.values():
+            columns = [c for c in spec.model.__table__.columns if c.key not in skip]
+            conn.execute(insert(spec.model), [
+                {"slices_id": i + 1, **{c.key: _random_value(c) for c in columns}}
+                for i in range(patients)
+            ])
+
+
+def run_pandas(out: str) -> None:
+    # прежний путь export_patients: DataFrame на лист, весь workbook в памяти
+    import io
+
+    import pandas as pd
+
+    import database.functions as db_funcs
+    from database.services.export import TABLES
+
+    tables = _tables()
+    result = db_funcs.export_tables(tables)
+    scales = [k for k in tables if TABLES[k].sheet in ("persons", "scales")]
+    slices = [k for k in tables if TABLES[k].sheet in ("persons", "slices")]
+    df_scales = pd.DataFrame(result.sheet(scales)).replace({True: 1, False: 0})
+    df_slices = pd.DataFrame(result.sheet(slices)).replace({True: 1, False: 0})
+    buf = io.BytesIO()
+    with pd.ExcelWriter(buf, engine="openpyxl") as writer:
+        df_scales.to_excel(writer, index=False, sheet_name="Шкалы")
+        df_slices.to_excel(writer, index=False, sheet_name="Срезы")
+    Path(out).write_bytes(buf.getvalue())
+
+
+def run_stream(out: str) -> None:
+    import database.functions as db_funcs
+
+    db_funcs.export_to_file(_tables(), "xlsx", out)
+
+
+def child(mode: str, out: str) -> None:
+    started = time.perf_counter()
+    {"pandas": run_pandas, "stream": run_stream}[mode](out)
+    print(json.dumps({
+        "mode": mode,
+        "seconds": round(time.perf_counter() - started, 2),
+        "peak_rss_mb": round(_peak_rss_mb(), 1),
+        "file_mb": round(os.path.getsize(out) / 2**20, 1),
+    }))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--patients", type=int, default=2000)
+    parser.add_argument("--mode", choices=["seed", "pandas", "stream"], help=argparse.SUPPRESS)
+    parser.add_argument("--out", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    sys.path.insert(0, str(SRC))
+    if args.mode == "seed":
+        seed(args.patients)
+        return
+    if args.mode:
+        child(args.mode, args.out)
+        return
+
+    with tempfile.TemporaryDirectory() as tmp:
+        env = {**os.environ, "DATABASE_URL": f"sqlite:///{tmp}/bench.sqlite3"}
+        subprocess.run(
+            [sys.executable, __file__, "--mode", "seed", "--patients", str(args.patients)],
+            check=True, env=env,
+        )
+        print(f"patients: {args.patients}")
+        for mode in ("pandas", "stream"):
+            proc = subprocess.run(
+                [sys.executable, __file__, "--mode", mode, "--out", f"{tmp}/{mode}.xlsx"],
+                check=True, env=env, capture_output=True, text=True,
+            )
+            stats = json.loads(proc.stdout.strip().splitlines()[-1])
+            print(
+                f"{mode:>6}: {stats['seconds']:>7} s  peak RSS {stats['peak_rss_mb']:>7} MiB  "
+                f"file {stats['file_mb']} MiB"
+            )
+
+
+if __name__ == "__main__":
+    main()
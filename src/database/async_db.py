@@ -0,0 +1,104 @@
+import asyncio
+import os
+
+from sqlalchemy import event
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncEngine, async_sessionmaker, create_async_engine
+from sqlalchemy.pool import StaticPool
+
+from database.db import DEFAULT_DATABASE_URL, UnitOfWorkSession, _env_bool, _env_int, _sqlite_pragmas
+from database.migrations import upgrade
+
+_ASYNC_DRIVERS = {
+    "sqlite": "sqlite+aiosqlite",
+    "postgresql": "postgresql+asyncpg",
+}
+
+
+def to_async_url(url: str) -> str:
+    """sqlite:///… -> sqlite+aiosqlite:///…, postgresql(+psycopg)://… -> postgresql+asyncpg://…"""
+    sa_url = make_url(url)
+    backend = sa_url.get_backend_name()
+    if backend not in _ASYNC_DRIVERS:
+        raise ValueError(f"No async driver configured for {backend}")
+    return sa_url.set(drivername=_ASYNC_DRIVERS[backend]).render_as_string(hide_password=False)
+
+
+def create_async_db_engine(url: str | None = None, *, echo: bool | None = None) -> AsyncEngine:
+    """
+    Асинхронный движок по тем же настройкам, что и create_db_engine
+    (для SQLite — те же PRAGMA на каждом соединении).
+    URL: ASYNC_DATABASE_URL, иначе DATABASE_URL с заменой драйвера
+    на aiosqlite / asyncpg.
+    """
+    url = url or os.getenv("ASYNC_DATABASE_URL") or to_async_url(
+        os.getenv("DATABASE_URL") or DEFAULT_DATABASE_URL
+    )
+    echo = _env_bool("DB_ECHO", False) if echo is None else echo
+    sa_url = make_url(url)
+
+    if sa_url.get_backend_name() == "sqlite":
+        busy_timeout_ms = _env_int("SQLITE_BUSY_TIMEOUT_MS", 5000)
+        in_memory = sa_url.database in (None, "", ":memory:")
+        kwargs = {}
+        if in_memory:
+            kwargs["poolclass"] = StaticPool
+        engine = create_async_engine(
+            sa_url,
+            echo=echo,
+            connect_args={"timeout": busy_timeout_ms / 1000},
+            **kwargs,
+        )
+        # события соединений — на синхронном движке под async-обёрткой
+        event.listen(engine.sync_engine, "connect", _sqlite_pragmas(busy_timeout_ms, wal=not in_memory))
+        return engine
+
+    return create_async_engine(
+        sa_url,
+        echo=echo,
+        pool_size=_env_int("DB_POOL_SIZE", 10),
+        max_overflow=_env_int("DB_MAX_OVERFLOW", 20),
+        pool_timeout=_env_int("DB_POOL_TIMEOUT", 30),
+        pool_recycle=_env_int("DB_POOL_RECYCLE", 1800),
+        pool_pre_ping=True,
+    )
+
+
+_engine: AsyncEngine | None = None
+_sessionmaker: async_sessionmaker | None = None
+# первые параллельные вызовы (asyncio.gather) не должны создавать по движку
+# и одновременно запускать миграции
+_init_lock = asyncio.Lock()
+
+
+async def get_async_sessionmaker() -> async_sessionmaker:
+    """Движок создаётся при первом обращении: aiosqlite/asyncpg нужны только async-API."""
+    global _engine, _sessionmaker
+    if _sessionmaker is not None:
+        return _sessionmaker
+    async with _init_lock:
+        if _sessionmaker is None:
+            engine = create_async_db_engine()
+            try:
+                async with engine.begin() as conn:
+                    await conn.run_sync(upgrade)
+            except BaseException:
+                await engine.dispose()
+                raise
+            _engine = engine
+            _sessionmaker = async_sessionmaker(
+                bind=engine,
+                sync_session_class=UnitOfWorkSession,
+                autoflush=False,
+                expire_on_commit=False,
+            )
+    return _sessionmaker
+
+
+async def dispose_async_engine() -> None:
+    global _engine, _sessionmaker, _init_lock
+    if _engine is not None:
+        await _engine.dispose()
+    _engine = _sessionmaker = None
+    # движок и блокировка привязаны к циклу событий — следующий asyncio.run начнёт заново
+    _init_lock = asyncio.Lock()
@@ -0,0 +1,61 @@
+"""
+Асинхронный двойник database.functions.
+
+Для каждой публичной функции фасада, работающей с БД, здесь есть async-версия
+с тем же именем, сигнатурой и возвращаемым типом (функции без БД — очередь
+выгрузок, подсказки из индекса в памяти, список полей — не оборачиваются). Вызов открывает свою AsyncSession и выполняет
+синхронную функцию в ней через run_sync, поэтому логика сервисов (ошибки,
+NotFoundError -> None, commit) одна и та же. Независимые чтения можно
+выполнять параллельно:
+
+    person, scales, slices = await asyncio.gather(
+        get_person(pid), scales_get_results(pid), slices_get_many([pid]),
+    )
+"""
+import functools
+import inspect
+
+from sqlalchemy.orm import Session
+
+from database import functions as _sync
+from database.async_db import get_async_sessionmaker
+from database.db import _current_session
+
+# публичные функции фасада, которые не ходят в БД: сессия им не нужна
+_NOT_DB = {
+    "export_fields",
+    "export_xlsx_bytes",
+    "suggest_persons",
+    "submit_export_job",
+    "get_export_job",
+    "list_export_jobs",
+    "cancel_export_job",
+    "delete_export_job",
+}
+
+
+def _call_bound(session: Session, fn, args, kwargs):
+    # session_scope() внутри фасада подхватит эту сессию
+    token = _current_session.set(session)
+    try:
+        return fn(*args, **kwargs)
+    finally:
+        _current_session.reset(token)
+
+
+def _async_twin(fn):
+    @functools.wraps(fn)
+    async def twin(*args, **kwargs):
+        sessionmaker = await get_async_sessionmaker()
+        async with sessionmaker() as session:
+            return await session.run_sync(_call_bound, fn, args, kwargs)
+
+    return twin
+
+
+__all__ = []
+for _name, _fn in inspect.getmembers(_sync, inspect.isfunction):
+    if _name.startswith("_") or _name in _NOT_DB or _fn.__module__ != _sync.__name__:
+        continue
+    globals()[_name] = _async_twin(_fn)
+    __all__.append(_name)
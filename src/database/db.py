@@ -1,21 +1,215 @@
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker
+import os
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Iterator
 
-from database.models import Base
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import Engine, make_url
+from sqlalchemy.orm import Session, sessionmaker
+from sqlalchemy.pool import QueuePool, StaticPool
 
-engine = create_engine(
-    "sqlite:///./patients_db.sqlite3",
-    echo=True,
-    future=True,
-    connect_args={"check_same_thread": False},
-)
+from database.migrations import migrate
+
+DEFAULT_DATABASE_URL = "sqlite:///./patients_db.sqlite3"
+
+
+def _env_int(name: str, default: int) -> int:
+    raw = os.getenv(name)
+    return int(raw) if raw not in (None, "") else default
+
+
+def _env_bool(name: str, default: bool) -> bool:
+    raw = os.getenv(name)
+    if raw in (None, ""):
+        return default
+    return raw.strip().lower() in {"1", "true", "yes", "on"}
+
+
+def _sqlite_pragmas(busy_timeout_ms: int, wal: bool):
+    """Обработчик connect: настраивает каждое новое SQLite-соединение."""
+
+    def on_connect(dbapi_conn, _record):
+        cur = dbapi_conn.cursor()
+        try:
+            if wal:
+                # WAL: читатели не блокируют писателя и наоборот
+                cur.execute("PRAGMA journal_mode=WAL")
+                cur.execute("PRAGMA synchronous=NORMAL")
+            cur.execute(f"PRAGMA busy_timeout={int(busy_timeout_ms)}")
+            cur.execute("PRAGMA foreign_keys=ON")
+        finally:
+            cur.close()
+
+    return on_connect
+
+
+def create_db_engine(
+    url: str | None = None,
+    *,
+    echo: bool | None = None,
+    pool_size: int | None = None,
+    max_overflow: int | None = None,
+    pool_timeout: int | None = None,
+    pool_recycle: int | None = None,
+    sqlite_busy_timeout_ms: int | None = None,
+) -> Engine:
+    """
+    Фабрика движка по URL и настройкам.
+
+    Не переданные аргументы берутся из окружения:
+    DATABASE_URL, DB_ECHO, DB_POOL_SIZE, DB_MAX_OVERFLOW, DB_POOL_TIMEOUT,
+    DB_POOL_RECYCLE, SQLITE_BUSY_TIMEOUT_MS.
+
+    * Postgres (и прочие серверные СУБД) — QueuePool с pre-ping и recycle.
+    * SQLite — WAL, synchronous=NORMAL, busy_timeout и foreign_keys на каждом
+      соединении; для ``:memory:`` — единственное общее соединение (StaticPool).
+    """
+    url = url or os.getenv("DATABASE_URL") or DEFAULT_DATABASE_URL
+    echo = _env_bool("DB_ECHO", False) if echo is None else echo
+    sa_url = make_url(url)
+
+    if sa_url.get_backend_name() == "sqlite":
+        busy_timeout_ms = (
+            _env_int("SQLITE_BUSY_TIMEOUT_MS", 5000)
+            if sqlite_busy_timeout_ms is None
+            else sqlite_busy_timeout_ms
+        )
+        in_memory = sa_url.database in (None, "", ":memory:")
+        kwargs = {}
+        if in_memory:
+            kwargs["poolclass"] = StaticPool
+        engine = create_engine(
+            sa_url,
+            echo=echo,
+            future=True,
+            connect_args={"check_same_thread": False},
+            **kwargs,
+        )
+        event.listen(engine, "connect", _sqlite_pragmas(busy_timeout_ms, wal=not in_memory))
+        return engine
+
+    return create_engine(
+        sa_url,
+        echo=echo,
+        future=True,
+        poolclass=QueuePool,
+        pool_size=_env_int("DB_POOL_SIZE", 10) if pool_size is None else pool_size,
+        max_overflow=_env_int("DB_MAX_OVERFLOW", 20) if max_overflow is None else max_overflow,
+        pool_timeout=_env_int("DB_POOL_TIMEOUT", 30) if pool_timeout is None else pool_timeout,
+        pool_recycle=_env_int("DB_POOL_RECYCLE", 1800) if pool_recycle is None else pool_recycle,
+        pool_pre_ping=True,
+    )
+
+
+class UnitOfWorkSession(Session):
+    """Session, у которой commit() откладывается внутри unit_of_work(batch=True)."""
+
+    def commit(self) -> None:
+        if self.info.get("defer_commit"):
+            # сервисы вызывают commit() сами — в пакетном режиме только flush,
+            # фиксация одна, при выходе из unit_of_work
+            self.flush()
+            return
+        super().commit()
+
+
+engine = create_db_engine()
 
 SessionLocal = sessionmaker(
     bind=engine,
+    class_=UnitOfWorkSession,
     autoflush=False,
     autocommit=False,
     expire_on_commit=False,
     future=True,
 )
 
-Base.metadata.create_all(bind=engine)
+# создание/обновление схемы: версионные миграции вместо голого create_all
+migrate(engine)
+
+_current_session: ContextVar[Session | None] = ContextVar("current_session", default=None)
+
+
+def _begin_snapshot(session: Session) -> None:
+    """Открывает транзакцию, в которой все чтения видят один снимок БД."""
+    dialect = session.get_bind().dialect.name
+    if dialect == "postgresql":
+        session.connection(execution_options={"isolation_level": "REPEATABLE READ"})
+    elif dialect == "sqlite":
+        # pysqlite сам не открывает транзакцию перед SELECT
+        session.connection().exec_driver_sql("BEGIN")
+
+
+@contextmanager
+def unit_of_work(
+    *,
+    batch: bool = False,
+    snapshot: bool = False,
+    commit_on: tuple[type[BaseException], ...] = (),
+) -> Iterator[Session]:
+    """
+    Одна сессия на отрисовку страницы/выгрузку: все вызовы database.functions
+    внутри блока переиспользуют её вместо открытия своих SessionLocal().
+
+    batch=True — commit() сервисов превращается во flush(), а фиксация
+    происходит один раз при выходе из блока (или откат при ошибке).
+    snapshot=True — отдельная сессия в транзакции с согласованным снимком
+    (REPEATABLE READ в Postgres, BEGIN в SQLite) — для выгрузок.
+    commit_on — исключения, которые не ошибка, а управление ходом выполнения
+    (перезапуск скрипта Streamlit): на них изменения фиксируются, а не откатываются.
+    Вложенные блоки переиспользуют внешнюю сессию.
+    """
+    session = None if snapshot else _current_session.get()
+    owner = session is None
+    token = None
+    if owner:
+        session = SessionLocal()
+        token = _current_session.set(session)
+        if snapshot:
+            session.info["snapshot"] = True
+            _begin_snapshot(session)
+
+    enable_batch = batch and not session.info.get("defer_commit")
+    if enable_batch:
+        session.info["defer_commit"] = True
+    try:
+        yield session
+        if enable_batch:
+            session.info.pop("defer_commit", None)
+            session.commit()
+    except commit_on:
+        if enable_batch:
+            session.info.pop("defer_commit", None)
+        session.commit()
+        raise
+    except BaseException:
+        if enable_batch:
+            session.info.pop("defer_commit", None)
+        session.rollback()
+        raise
+    finally:
+        if owner:
+            _current_session.reset(token)
+            session.close()
+
+
+@contextmanager
+def session_scope() -> Iterator[Session]:
+    """Сессия текущего unit_of_work, а вне его — новая короткая сессия."""
+    session = _current_session.get()
+    if session is None:
+        with SessionLocal() as session:
+            yield session
+        return
+    try:
+        yield session
+    except BaseException:
+        # разделяемая сессия не должна остаться в сломанном состоянии;
+        # пакет (batch) откатит сам unit_of_work
+        if not session.info.get("defer_commit"):
+            session.rollback()
+        raise
+    # вне пакета и снимка транзакция не держится между вызовами (объекты не
+    # истекают: expire_on_commit=False), соединение возвращается в пул
+    if not session.info.get("defer_commit") and not session.info.get("snapshot") and session.in_transaction():
+        session.commit()
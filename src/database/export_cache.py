@@ -0,0 +1,117 @@
+"""
+Кэш готовых файлов выгрузки на диске.
+
+Ключ — выбор таблиц/колонок, формат и версия данных (ExportService.data_version),
+поэтому повторная выгрузка без правок в БД отдаётся готовым файлом. Вытеснение —
+LRU по времени последнего обращения (mtime файла) с ограничением по числу
+файлов и суммарному размеру.
+
+Настройки окружения: EXPORT_CACHE_DIR (по умолчанию <EXPORT_DIR>/cache),
+EXPORT_CACHE_MB (512), EXPORT_CACHE_ENTRIES (50).
+"""
+import hashlib
+import json
+import os
+import shutil
+import threading
+import uuid
+from pathlib import Path
+from typing import NamedTuple
+
+from database.db import _env_int
+
+
+class CachedExport(NamedTuple):
+    path: Path
+    rows: int
+
+
+def link_or_copy(src: str | os.PathLike, dst: str | os.PathLike) -> None:
+    """Жёсткая ссылка (мгновенно, без второй копии на диске), иначе — копия."""
+    tmp = Path(f"{dst}.{uuid.uuid4().hex}.tmp")
+    try:
+        os.link(src, tmp)
+    except OSError:
+        shutil.copyfile(src, tmp)
+    os.replace(tmp, dst)
+
+
+class ExportCache:
+    def __init__(self, directory: str | os.PathLike, max_bytes: int, max_entries: int):
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def key(*parts) -> str:
+        raw = json.dumps(parts, ensure_ascii=False, sort_keys=True, default=str)
+        return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+    def _path(self, key: str, fmt: str) -> Path:
+        return self.directory / f"{key}.{fmt}"
+
+    def get(self, key: str, fmt: str) -> CachedExport | None:
+        path = self._path(key, fmt)
+        meta = path.with_name(path.name + ".json")
+        try:
+            rows = json.loads(meta.read_text(encoding="utf-8"))["rows"]
+            os.utime(path)  # отметка обращения для LRU
+        except (OSError, ValueError, KeyError):
+            return None
+        return CachedExport(path, rows)
+
+    def put(self, key: str, fmt: str, src: str | os.PathLike, rows: int) -> CachedExport:
+        path = self._path(key, fmt)
+        link_or_copy(src, path)
+        os.utime(path)
+        # описание пишется последним: без него файл считается отсутствующим
+        path.with_name(path.name + ".json").write_text(json.dumps({"rows": rows}), encoding="utf-8")
+        self._evict()
+        return CachedExport(path, rows)
+
+    def put_bytes(self, key: str, fmt: str, data: bytes, rows: int) -> CachedExport:
+        tmp = self.directory / f"{uuid.uuid4().hex}.tmp"
+        tmp.write_bytes(data)
+        try:
+            return self.put(key, fmt, tmp, rows)
+        finally:
+            tmp.unlink()
+
+    def _evict(self) -> None:
+        with self._lock:
+            files = []
+            for path in self.directory.iterdir():
+                if path.suffix in (".json", ".tmp"):
+                    continue
+                try:
+                    st = path.stat()
+                except OSError:
+                    continue
+                files.append((st.st_mtime, st.st_size, path))
+            files.sort(reverse=True)  # свежие первыми
+            total = 0
+            for n, (_, size, path) in enumerate(files):
+                total += size
+                # самый свежий (только что положенный) остаётся даже сверх лимита
+                if n and (n >= self.max_entries or total > self.max_bytes):
+                    path.with_name(path.name + ".json").unlink(missing_ok=True)
+                    path.unlink(missing_ok=True)
+
+
+_cache: ExportCache | None = None
+_cache_lock = threading.Lock()
+
+
+def get_export_cache() -> ExportCache:
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            directory = os.getenv("EXPORT_CACHE_DIR") or Path(os.getenv("EXPORT_DIR") or "./exports") / "cache"
+            _cache = ExportCache(
+                directory,
+                max_bytes=_env_int("EXPORT_CACHE_MB", 512) * 2**20,
+                max_entries=_env_int("EXPORT_CACHE_ENTRIES", 50),
+            )
+        return _cache
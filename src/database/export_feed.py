@@ -0,0 +1,43 @@
+"""
+Ночная дельта-выгрузка для внешнего хранилища.
+
+    cd src
+    python -m database.export_feed --feed warehouse --format parquet --out /data/patients.parquet
+
+Выгружает только пациентов, изменённых с прошлого запуска того же --feed
+(первый запуск — все пациенты), и сохраняет новую отметку в export_watermarks.
+Отметка сдвинута назад на EXPORT_DELTA_OVERLAP_S секунд, поэтому соседние
+дельты могут пересекаться: загружать их нужно upsert'ом по patient_id.
+Удалённые с отметки пациенты — в поле "deleted" итогового JSON: их строки
+из хранилища удаляются до загрузки файла.
+"""
+import argparse
+import json
+from datetime import datetime
+
+from database.functions import export_delta
+from database.services.export import EXPORT_FORMATS, TABLES
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(prog="python -m database.export_feed")
+    parser.add_argument("--feed", default="default", help="имя потока (своя отметка на каждый)")
+    parser.add_argument("--format", dest="fmt", choices=EXPORT_FORMATS, default="parquet")
+    parser.add_argument("--out", required=True, help="путь к файлу выгрузки")
+    parser.add_argument("--tables", nargs="+", default=list(TABLES), choices=list(TABLES))
+    parser.add_argument("--since", type=datetime.fromisoformat, help="явная отметка вместо сохранённой")
+    args = parser.parse_args(argv)
+
+    delta = export_delta(args.tables, args.fmt, args.feed, args.out, args.since)
+    print(json.dumps({
+        "feed": args.feed,
+        "path": delta.path,
+        "rows": delta.rows,
+        "since": delta.since.isoformat() if delta.since else None,
+        "watermark": delta.watermark.isoformat(),
+        "deleted": delta.deleted,
+    }, ensure_ascii=False))
+
+
+if __name__ == "__main__":
+    main()
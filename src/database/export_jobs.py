@@ -0,0 +1,241 @@
+"""
+Фоновые выгрузки пациентов.
+
+Выгрузка ставится в очередь локального пула потоков и не зависит от
+Streamlit-скрипта: перезапуск страницы или переход в другое меню её не
+прерывает. Задача хранит прогресс (строк записано / всего) и может быть
+отменена. Готовый файл и его описание (<id>.json) лежат в EXPORT_DIR, так что
+любая следующая сессия — и после перезапуска приложения — скачивает файл без
+повторного расчёта. Повтор той же выгрузки без правок в БД берётся из кэша
+(database.export_cache) и завершается сразу при постановке.
+
+Настройки окружения: EXPORT_DIR (по умолчанию ./exports), EXPORT_WORKERS (1).
+"""
+import os
+import threading
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Iterable
+
+from database.db import _env_int, session_scope, unit_of_work
+from database.export_cache import ExportCache, get_export_cache, link_or_copy
+from database.schemas.export_jobs import ExportJobRead
+from database.services.export import (
+    EXPORT_FORMATS, EXPORT_LAYOUTS, LONG_HEADER, ExportService, Selection, selection_dict,
+)
+
+
+class ExportCancelled(Exception):
+    pass
+
+
+_ACTIVE = ("queued", "running")
+
+
+class ExportJobManager:
+    def __init__(
+        self, directory: str | os.PathLike, max_workers: int = 1, cache: ExportCache | None = None
+    ):
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.cache = cache
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="export")
+        self._lock = threading.Lock()
+        self._jobs: dict[str, ExportJobRead] = {}
+        self._cancel: dict[str, threading.Event] = {}
+        self._load()
+
+    # --- хранение описаний на диске ---
+
+    def _meta_path(self, job_id: str) -> Path:
+        return self.directory / f"{job_id}.json"
+
+    def _file_path(self, job: ExportJobRead) -> Path:
+        return self.directory / f"{job.id}.{job.fmt}"
+
+    def _save(self, job: ExportJobRead) -> None:
+        tmp = self._meta_path(job.id).with_suffix(".json.tmp")
+        tmp.write_text(job.model_dump_json(), encoding="utf-8")
+        os.replace(tmp, self._meta_path(job.id))
+
+    def _load(self) -> None:
+        for meta in self.directory.glob("*.json"):
+            try:
+                job = ExportJobRead.model_validate_json(meta.read_text(encoding="utf-8"))
+            except ValueError:
+                continue
+            if job.status in _ACTIVE:
+                # процесс завершился посреди выгрузки
+                job = job.model_copy(update={"status": "failed", "error": "interrupted"})
+                self._save(job)
+            elif job.status == "done" and not (job.path and os.path.exists(job.path)):
+                continue
+            self._jobs[job.id] = job
+
+    def _update(self, job_id: str, *, save: bool = False, **fields) -> ExportJobRead:
+        with self._lock:
+            job = self._jobs[job_id].model_copy(update=fields)
+            self._jobs[job_id] = job
+        if save:
+            self._save(job)
+        return job
+
+    # --- API ---
+
+    def submit(
+        self,
+        tables: Selection,
+        fmt: str = "csv",
+        person_ids: Iterable[int] | None = None,
+        layout: str = "wide",
+    ) -> ExportJobRead:
+        if fmt not in EXPORT_FORMATS:
+            raise ValueError(f"Unknown export format: {fmt}")
+        if layout not in EXPORT_LAYOUTS:
+            raise ValueError(f"Unknown export layout: {layout}")
+        tables = selection_dict(tables)
+        if person_ids is not None:
+            person_ids = list(person_ids)
+
+        job = ExportJobRead(
+            id=uuid.uuid4().hex, tables=tables, fmt=fmt, layout=layout,
+            created_at=datetime.now(timezone.utc),
+        )
+        key = None
+        if self.cache is not None:
+            with session_scope() as session:
+                key, _ = self._cache_key(ExportService(session), job, person_ids)
+        with self._lock:
+            self._jobs[job.id] = job
+            self._cancel[job.id] = threading.Event()
+        if key is not None and self._from_cache(job, key):
+            return self.get(job.id)
+        self._save(job)
+        self._executor.submit(self._run, job.id, person_ids)
+        return job
+
+    def get(self, job_id: str) -> ExportJobRead | None:
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def jobs(self) -> list[ExportJobRead]:
+        """Все задачи, новые первыми."""
+        with self._lock:
+            jobs = list(self._jobs.values())
+        return sorted(jobs, key=lambda j: j.created_at, reverse=True)
+
+    def cancel(self, job_id: str) -> bool:
+        event = self._cancel.get(job_id)
+        job = self.get(job_id)
+        if event is None or job is None or job.status not in _ACTIVE:
+            return False
+        event.set()
+        return True
+
+    def delete(self, job_id: str) -> bool:
+        """Удаляет завершённую задачу вместе с файлом; активную сначала нужно отменить."""
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is None or job.status in _ACTIVE:
+                return False
+            del self._jobs[job_id]
+            self._cancel.pop(job_id, None)
+        for path in (job.path, self._meta_path(job_id)):
+            if path and os.path.exists(path):
+                os.remove(path)
+        return True
+
+    # --- кэш ---
+
+    def _cache_key(
+        self, svc: ExportService, job: ExportJobRead, person_ids: list[int] | None
+    ) -> tuple[str, bool]:
+        """Ключ кэша по выбору, формату и версии данных; второй элемент — можно ли сохранять."""
+        version = svc.data_version(job.tables, job.layout)
+        header = LONG_HEADER if job.layout == "long" else svc.header(job.tables)
+        ids = None if person_ids is None else sorted(person_ids)
+        return self.cache.key(job.fmt, job.layout, job.tables, header, ids, version.token), version.settled
+
+    def _from_cache(self, job: ExportJobRead, key: str) -> bool:
+        hit = self.cache.get(key, job.fmt)
+        if hit is None:
+            return False
+        final = self._file_path(job)
+        link_or_copy(hit.path, final)
+        self._update(
+            job.id, status="done", rows_done=hit.rows, rows_total=hit.rows, path=str(final),
+            cached=True, finished_at=datetime.now(timezone.utc), save=True,
+        )
+        return True
+
+    # --- выполнение ---
+
+    def _run(self, job_id: str, person_ids: list[int] | None) -> None:
+        job = self.get(job_id)
+        cancel = self._cancel[job_id]
+        final = self._file_path(job)
+        partial = final.with_name(final.name + ".part")
+
+        def progress(done: int) -> None:
+            self._update(job_id, rows_done=done)
+            if cancel.is_set():
+                raise ExportCancelled
+
+        try:
+            if cancel.is_set():
+                raise ExportCancelled
+            # один согласованный снимок на всю выгрузку
+            with unit_of_work(snapshot=True) as session:
+                svc = ExportService(session)
+                key = settled = None
+                if self.cache is not None:
+                    # версия данных — в том же снимке, из которого пишется файл
+                    key, settled = self._cache_key(svc, job, person_ids)
+                    if self._from_cache(job, key):
+                        return
+                if job.layout == "long":
+                    total = svc.count_long(job.tables, person_ids)
+                else:
+                    total = svc.count(person_ids)
+                self._update(job_id, status="running", rows_total=total, save=True)
+                _, written = svc.write(
+                    job.tables, job.fmt, str(partial), person_ids, progress=progress, layout=job.layout
+                )
+            os.replace(partial, final)
+            if settled:
+                self.cache.put(key, job.fmt, final, written)
+            self._update(
+                job_id, status="done", rows_done=written, path=str(final),
+                finished_at=datetime.now(timezone.utc), save=True,
+            )
+        except ExportCancelled:
+            self._update(job_id, status="cancelled", finished_at=datetime.now(timezone.utc), save=True)
+        except Exception as e:
+            self._update(
+                job_id, status="failed", error=str(e), finished_at=datetime.now(timezone.utc), save=True
+            )
+        finally:
+            if partial.exists():
+                partial.unlink()
+
+    def shutdown(self, wait: bool = True) -> None:
+        self._executor.shutdown(wait=wait, cancel_futures=True)
+
+
+_manager: ExportJobManager | None = None
+_manager_lock = threading.Lock()
+
+
+def get_export_job_manager() -> ExportJobManager:
+    """Один менеджер на процесс: его разделяют все сессии Streamlit."""
+    global _manager
+    with _manager_lock:
+        if _manager is None:
+            _manager = ExportJobManager(
+                os.getenv("EXPORT_DIR") or "./exports",
+                max_workers=_env_int("EXPORT_WORKERS", 1),
+                cache=get_export_cache(),
+            )
+        return _manager
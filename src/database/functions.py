@@ -1,10 +1,23 @@
-from database.db import SessionLocal
-from datetime import date
+from database.db import session_scope
+from database.export_jobs import get_export_job_manager
+from database.person_index import PersonSuggestion, get_person_index
+from datetime import date, datetime
+from io import BytesIO
+from typing import Iterable, Sequence
 from database.schemas.ariscat import AriscatInput, AriscatRead
 from database.schemas.caprini import CapriniRead, CapriniInput
 from database.schemas.elganzouri import ElGanzouriRead, ElGanzouriInput
 from database.schemas.lee import LeeRcriRead, LeeRcriInput, LeeRcriUpdate
-from database.schemas.persons import PersonCreate, PersonRead, PersonUpdate
+from database.schemas.export_jobs import ExportJobRead
+from database.schemas.persons import (
+    PatientBundle,
+    PersonCreate,
+    PersonRead,
+    PersonSearchHit,
+    PersonSearchPage,
+    PersonUpdate,
+)
+from database.schemas.person_scales import PersonScalesResults
 from database.schemas.soba import SobaRead, SobaCreate, SobaUpdate
 from database.schemas.stopbang import StopBangRead, StopBangInput
 from database.schemas.las_vegas import LasVegasRead, LasVegasInput
@@ -15,39 +28,32 @@ from database.schemas.slice_t0 import SliceT0Input, SliceT0Read
 from database.schemas.slice_t1 import SliceT1Input, SliceT1Read
 from database.schemas.slice_t2 import SliceT2Input, SliceT2Read
 from database.services.ariscat import AriscatService
+from database.services.bulk import BulkUpsertService
 from database.services.caprini import CapriniService
+from database.services.export import (
+    TABLES as EXPORT_TABLES, DataVersion, ExportDelta, ExportResult, ExportService, Selection, write_xlsx,
+)
 from database.services.elganzouri import ElGanzouriService
 from database.services.lee import LeeRcriService
 from database.services.persons import PersonsService
+from database.services.person_scales import PersonScalesService
 from database.services.soba import SobaService
 from database.services.stopbang import StopBangService
 from database.services.las_vegas import LasVegasService
 from database.services.aldrete import AldreteService
 from database.services.mmse import MMSEService
 from database.services.qor15 import Qor15Service
-from database.services.slice_t0 import SliceT0Service
-from database.services.slice_t1 import SliceT1Service
-from database.services.slice_t2 import SliceT2Service
+from database.services.slices import SliceService
 from database.schemas.slice_t3 import SliceT3Input, SliceT3Read
-from database.services.slice_t3 import SliceT3Service
 from database.schemas.slice_t4 import SliceT4Input, SliceT4Read
-from database.services.slice_t4 import SliceT4Service
 from database.schemas.slice_t5 import SliceT5Input, SliceT5Read
-from database.services.slice_t5 import SliceT5Service
 from database.schemas.slice_t6 import SliceT6Input, SliceT6Read
-from database.services.slice_t6 import SliceT6Service
 from database.schemas.slice_t7 import SliceT7Input, SliceT7Read
-from database.services.slice_t7 import SliceT7Service
 from database.schemas.slice_t8 import SliceT8Input, SliceT8Read
-from database.services.slice_t8 import SliceT8Service
 from database.schemas.slice_t9 import SliceT9Input, SliceT9Read
-from database.services.slice_t9 import SliceT9Service
 from database.schemas.slice_t10 import SliceT10Input, SliceT10Read
-from database.services.slice_t10 import SliceT10Service
 from database.schemas.slice_t11 import SliceT11Input, SliceT11Read
-from database.services.slice_t11 import SliceT11Service
 from database.schemas.slice_t12 import SliceT12Input, SliceT12Read
-from database.services.slice_t12 import SliceT12Service
 from database.services.utils import NotFoundError
 
 
@@ -63,7 +69,7 @@ def create_person(
     weight,
     gender,
 ) -> PersonRead:
-    with SessionLocal() as session:
+    with session_scope() as session:
         service = PersonsService(session)
         p = service.create_person(
             PersonCreate(
@@ -83,15 +89,25 @@ def create_person(
 
 
 def get_person(person_id):
-    with SessionLocal() as session:
+    with session_scope() as session:
         service = PersonsService(session)
         p = service.get_person(person_id)
         return p
 
 
+def get_patient_bundle(person_id: int, header_only: bool = False) -> PatientBundle | None:
+    """Карточка пациента со всеми шкалами и срезами (header_only — только карточка)."""
+    with session_scope() as session:
+        service = PersonsService(session)
+        try:
+            return service.get_bundle(person_id, header_only=header_only)
+        except NotFoundError:
+            return None
+
+
 def elg_get_result(person_id: int) -> ElGanzouriRead | None:
     """Вернёт сохранённый результат или None, если нет."""
-    with SessionLocal() as session:
+    with session_scope() as session:
         svc = ElGanzouriService(session)
         try:
             return svc.get_result(person_id)
@@ -101,7 +117,7 @@ def elg_get_result(person_id: int) -> ElGanzouriRead | None:
 
 def elg_upsert_result(person_id: int, data: ElGanzouriInput) -> ElGanzouriRead:
     """Создаёт/обновляет результат шкалы и возвращает его."""
-    with SessionLocal() as session:
+    with session_scope() as session:
         svc = ElGanzouriService(session)
         saved = svc.upsert_result(person_id, data)
         return saved
@@ -109,7 +125,7 @@ def elg_upsert_result(person_id: int, data: ElGanzouriInput) -> ElGanzouriRead:
 
 def ar_get_result(person_id: int) -> AriscatRead | None:
     """Вернёт сохранённый результат ARISCAT или None, если его ещё нет."""
-    with SessionLocal() as session:
+    with session_scope() as session:
         svc = AriscatService(session)
         try:
             return svc.get_result(person_id)
@@ -119,7 +135,7 @@ def ar_get_result(person_id: int) -> AriscatRead | None:
 
 def ar_upsert_result(person_id: int, data: AriscatInput) -> AriscatRead:
     """Создаёт/обновляет результат ARISCAT и возвращает его."""
-    with SessionLocal() as session:
+    with session_scope() as session:
         svc = AriscatService(session)
         saved = svc.upsert_result(person_id, data)
         return saved
@@ -127,13 +143,13 @@ def ar_upsert_result(person_id: int, data: AriscatInput) -> AriscatRead:
 
 def ar_clear_result(person_id: int) -> bool:
     """Удаляет результат ARISCAT и сбрасывает флаг заполнения."""
-    with SessionLocal() as session:
+    with session_scope() as session:
         svc = AriscatService(session)
         return svc.clear_result(person_id)
 
 
 def sb_get_result(person_id: int) -> StopBangRead | None:
-    with SessionLocal() as session:
+    with session_scope() as session:
         svc = StopBangService(session)
         try:
             return svc.get_result(person_id)
@@ -142,20 +158,20 @@ def sb_get_result(person_id: int) -> StopBangRead | None:
 
 
 def sb_upsert_result(person_id: int, data: StopBangInput) -> StopBangRead:
-    with SessionLocal() as session:
+    with session_scope() as session:
         svc = StopBangService(session)
         return svc.upsert_result(person_id, data)
 
 
 def sb_clear_result(person_id: int) -> bool:
-    with SessionLocal() as session:
+    with session_scope() as session:
         svc = StopBangService(session)
         return svc.clear_result(person_id)
 
 
 def get_soba(person_id: int) -> SobaRead | None:
     """Вернёт сохранённую SOBA или None, если записи ещё нет."""
-    with SessionLocal() as session:
+    with session_scope() as session:
         svc = SobaService(session)
         try:
             return svc.get_for_person(person_id)
@@ -164,19 +180,19 @@ def get_soba(person_id: int) -> SobaRead | None:
 
 
 def upsert_soba(person_id: int, data: SobaCreate | SobaUpdate) -> SobaRead:
-    with SessionLocal() as session:
+    with session_scope() as session:
         svc = SobaService(session)
         return svc.upsert_for_person(person_id, data)
 
 
 def delete_soba(person_id: int) -> bool:
-    with SessionLocal() as session:
+    with session_scope() as session:
         svc = SobaService(session)
         return svc.delete_for_person(person_id)
 
 
 def lv_get_result(person_id: int) -> LasVegasRead | None:
-    with SessionLocal() as session:
+    with session_scope() as session:
         svc = LasVegasService(session)
         try:
             return svc.get_result(person_id)
@@ -185,19 +201,19 @@ def lv_get_result(person_id: int) -> LasVegasRead | None:
 
 
 def lv_upsert_result(person_id: int, data: LasVegasInput) -> LasVegasRead:
-    with SessionLocal() as session:
+    with session_scope() as session:
         svc = LasVegasService(session)
         return svc.upsert_result(person_id, data)
 
 
 def lv_clear_result(person_id: int) -> bool:
-    with SessionLocal() as session:
+    with session_scope() as session:
         svc = LasVegasService(session)
         return svc.clear_result(person_id)
 
 
 def qor15_get_result(person_id: int) -> Qor15Read | None:
-    with SessionLocal() as session:
+    with session_scope() as session:
         svc = Qor15Service(session)
         try:
             return svc.get_result(person_id)
@@ -206,19 +222,19 @@ def qor15_get_result(person_id: int) -> Qor15Read | None:
 
 
 def qor15_upsert_result(person_id: int, data: Qor15Input) -> Qor15Read:
-    with SessionLocal() as session:
+    with session_scope() as session:
         svc = Qor15Service(session)
         return svc.upsert_result(person_id, data)
 
 
 def qor15_clear_result(person_id: int) -> bool:
-    with SessionLocal() as session:
+    with session_scope() as session:
         svc = Qor15Service(session)
         return svc.clear_result(person_id)
 
 
 def ald_get_result(person_id: int) -> AldreteRead | None:
-    with SessionLocal() as session:
+    with session_scope() as session:
         svc = AldreteService(session)
         try:
             return svc.get_result(person_id)
@@ -227,19 +243,19 @@ def ald_get_result(person_id: int) -> AldreteRead | None:
 
 
 def ald_upsert_result(person_id: int, data: AldreteInput) -> AldreteRead:
-    with SessionLocal() as session:
+    with session_scope() as session:
         svc = AldreteService(session)
         return svc.upsert_result(person_id, data)
 
 
 def ald_clear_result(person_id: int) -> bool:
-    with SessionLocal() as session:
+    with session_scope() as session:
         svc = AldreteService(session)
         return svc.clear_result(person_id)
 
 
 def mmse_get_result(person_id: int, timepoint: int) -> MMSEResultRead | None:
-    with SessionLocal() as session:
+    with session_scope() as session:
         svc = MMSEService(session)
         try:
             return svc.get_result(person_id, timepoint)
@@ -248,20 +264,20 @@ def mmse_get_result(person_id: int, timepoint: int) -> MMSEResultRead | None:
 
 
 def mmse_upsert_result(person_id: int, timepoint: int, data: MMSEInput) -> MMSEResultRead:
-    with SessionLocal() as session:
+    with session_scope() as session:
         svc = MMSEService(session)
         return svc.upsert_result(person_id, timepoint, data)
 
 
 def mmse_clear_result(person_id: int, timepoint: int) -> bool:
-    with SessionLocal() as session:
+    with session_scope() as session:
         svc = MMSEService(session)
         return svc.clear_result(person_id, timepoint)
 
 
 def update_person_fields(person_id: int, **fields):
     """Частичное обновление полей пациента (age/height/weight и т.п.)."""
-    with SessionLocal() as session:
+    with session_scope() as session:
         svc = PersonsService(session)
         return svc.update_person(person_id, PersonUpdate(**fields))
 
@@ -274,10 +290,13 @@ def search_persons(
     age: int | None = None,
     card_number: str | None = None,
     inclusion_date: date | None = None,
+    match: str = "infix",
     limit: int = 50,
     offset: int = 0,
+    after: tuple[str, str, int] | None = None,
+    before: tuple[str, str, int] | None = None,
 ):
-    with SessionLocal() as session:
+    with session_scope() as session:
         svc = PersonsService(session)
         return svc.search_persons(
             last_name=last_name,
@@ -286,13 +305,48 @@ def search_persons(
             age=age,
             card_number=card_number,
             inclusion_date=inclusion_date,
+            match=match,
             limit=limit,
             offset=offset,
+            after=after,
+            before=before,
         )
 
 
+def search_persons_page(
+    *,
+    limit: int = 50,
+    after: tuple[str, str, int] | None = None,
+    before: tuple[str, str, int] | None = None,
+    **filters,
+) -> PersonSearchPage:
+    """Страница поиска с курсорами next_cursor/prev_cursor (фильтры — как у search_persons)."""
+    with session_scope() as session:
+        svc = PersonsService(session)
+        return svc.search_page(limit=limit, after=after, before=before, **filters)
+
+
+def search_persons_fuzzy(query: str, limit: int = 20) -> list[PersonSearchHit]:
+    """Поиск с опечатками по ФИО и номеру истории, по убыванию похожести."""
+    with session_scope() as session:
+        svc = PersonsService(session)
+        return svc.search_persons_fuzzy(query, limit)
+
+
+def suggest_persons(query: str, limit: int = 10) -> list[PersonSuggestion]:
+    """Подсказки при наборе из индекса в памяти (database.person_index), без запроса к БД."""
+    return get_person_index().suggest(query, limit)
+
+
+def count_persons(**filters) -> int:
+    """Точное число найденных пациентов; считать один раз на набор фильтров, не на страницу."""
+    with session_scope() as session:
+        svc = PersonsService(session)
+        return svc.count_persons(**filters)
+
+
 def rcri_get_result(person_id: int) -> LeeRcriRead | None:
-    with SessionLocal() as session:
+    with session_scope() as session:
         svc = LeeRcriService(session)
         try:
             return svc.get_result(person_id)
@@ -301,19 +355,19 @@ def rcri_get_result(person_id: int) -> LeeRcriRead | None:
 
 
 def rcri_upsert_result(person_id: int, data: LeeRcriInput | LeeRcriUpdate) -> LeeRcriRead:
-    with SessionLocal() as session:
+    with session_scope() as session:
         svc = LeeRcriService(session)
         return svc.upsert_result(person_id, data)
 
 
 def rcri_clear_result(person_id: int) -> bool:
-    with SessionLocal() as session:
+    with session_scope() as session:
         svc = LeeRcriService(session)
         return svc.clear_result(person_id)
 
 
 def caprini_get_result(person_id: int) -> CapriniRead | None:
-    with SessionLocal() as session:
+    with session_scope() as session:
         svc = CapriniService(session)
         try:
             return svc.get_result(person_id)
@@ -322,284 +376,355 @@ def caprini_get_result(person_id: int) -> CapriniRead | None:
 
 
 def caprini_upsert_result(person_id: int, data: CapriniInput) -> CapriniRead:
-    with SessionLocal() as session:
+    with session_scope() as session:
         svc = CapriniService(session)
         return svc.upsert_result(person_id, data)
 
 
 def caprini_clear_result(person_id: int) -> bool:
-    with SessionLocal() as session:
+    with session_scope() as session:
         svc = CapriniService(session)
         return svc.clear_result(person_id)
 
 
-def t0_get_result(person_id: int) -> SliceT0Read | None:
-    with SessionLocal() as session:
-        svc = SliceT0Service(session)
+def scales_get_results(person_id: int) -> PersonScalesResults:
+    """Все шкалы пациента одним вызовом; незаполненные — None."""
+    with session_scope() as session:
+        svc = PersonScalesService(session)
+        return svc.get_results(person_id)
+
+
+def bulk_upsert_scales(scale: str, records: Iterable[tuple[int, object]]) -> int:
+    """
+    Массовая запись одной шкалы для многих пациентов.
+    scale — ключ из services.scales.SCALES ("stopbang", "caprini", "mmse_t0", …),
+    records — пары (person_id, ввод шкалы).
+    """
+    with session_scope() as session:
+        svc = BulkUpsertService(session)
+        return svc.upsert_scales(scale, records)
+
+
+def bulk_upsert_slices(timepoint: int, records: Iterable[tuple[int, object]]) -> int:
+    """Массовая запись среза T{timepoint}: records — пары (person_id, SliceTNInput)."""
+    with session_scope() as session:
+        svc = BulkUpsertService(session)
+        return svc.upsert_slices(timepoint, records)
+
+
+def export_tables(tables: Selection, person_ids: Iterable[int] | None = None) -> ExportResult:
+    """
+    Колоночная выгрузка: один SELECT на таблицу из services.export.TABLES
+    ("persons", "scales_status", "caprini", …, "t0" … "t12").
+    tables — список ключей или {ключ: [поля]} — в SELECT попадут только эти поля.
+    """
+    with session_scope() as session:
+        svc = ExportService(session)
+        return svc.export(tables, person_ids)
+
+
+def export_to_file(
+    tables: Selection,
+    fmt: str = "csv",
+    path: str | None = None,
+    person_ids: Iterable[int] | None = None,
+    layout: str = "wide",
+) -> tuple[str, int]:
+    """
+    Потоковая выгрузка выбранных таблиц одним файлом CSV/Parquet/XLSX:
+    чтение порциями, память не растёт с числом пациентов. layout="long" —
+    срезы строкой на значение (patient_id, timepoint, parameter, ...).
+    Возвращает (путь, строк).
+    """
+    with session_scope() as session:
+        svc = ExportService(session)
+        return svc.write(tables, fmt, path, person_ids, layout=layout)
+
+
+def export_delta(
+    tables: Selection,
+    fmt: str = "csv",
+    feed: str = "default",
+    path: str | None = None,
+    since: datetime | None = None,
+) -> ExportDelta:
+    """
+    Дельта-выгрузка потока feed: только пациенты, изменённые с его прошлой
+    отметки (или since); отметка обновляется после записи файла. Удалённые
+    с отметки пациенты — в ExportDelta.deleted.
+    """
+    with session_scope() as session:
+        svc = ExportService(session)
+        return svc.write_delta(tables, fmt, feed, path, since)
+
+
+def get_export_watermark(feed: str = "default") -> datetime | None:
+    with session_scope() as session:
+        svc = ExportService(session)
+        return svc.watermark(feed)
+
+
+def export_xlsx_bytes(
+    header: Sequence[str], sheets: dict[str, Sequence[int]], rows: list[tuple]
+) -> bytes:
+    """Небольшой XLSX в памяти (sheets — лист: номера колонок header)."""
+    buf = BytesIO()
+    write_xlsx(buf, header, sheets, [rows])
+    return buf.getvalue()
+
+
+def patient_data_version(person_id: int) -> DataVersion:
+    """
+    Дешёвый отпечаток данных пациента (один запрос агрегатов): пока token тот же,
+    собранную выгрузку пациента можно брать из кэша.
+    """
+    with session_scope() as session:
+        svc = ExportService(session)
+        return svc.person_version(person_id)
+
+
+def export_fields() -> dict[str, list[str]]:
+    """Поля каждой таблицы выгрузки — для выбора колонок в интерфейсе."""
+    return {key: list(table.fields) for key, table in EXPORT_TABLES.items()}
+
+
+def list_export_presets() -> dict[str, dict[str, list[str] | None]]:
+    """Готовые (services.export.EXPORT_PRESETS) и сохранённые наборы полей: {имя: выбор}."""
+    with session_scope() as session:
+        svc = ExportService(session)
+        return svc.presets()
+
+
+def save_export_preset(name: str, tables: Selection) -> str:
+    with session_scope() as session:
+        svc = ExportService(session)
+        return svc.save_preset(name, tables)
+
+
+def delete_export_preset(name: str) -> bool:
+    with session_scope() as session:
+        svc = ExportService(session)
+        return svc.delete_preset(name)
+
+
+def submit_export_job(
+    tables: Selection,
+    fmt: str = "csv",
+    person_ids: Iterable[int] | None = None,
+    layout: str = "wide",
+) -> ExportJobRead:
+    """Ставит потоковую выгрузку в фоновую очередь (database.export_jobs)."""
+    return get_export_job_manager().submit(tables, fmt, person_ids, layout)
+
+
+def get_export_job(job_id: str) -> ExportJobRead | None:
+    return get_export_job_manager().get(job_id)
+
+
+def list_export_jobs() -> list[ExportJobRead]:
+    return get_export_job_manager().jobs()
+
+
+def cancel_export_job(job_id: str) -> bool:
+    return get_export_job_manager().cancel(job_id)
+
+
+def delete_export_job(job_id: str) -> bool:
+    return get_export_job_manager().delete(job_id)
+
+
+def slice_get_result(timepoint: int, person_id: int):
+    with session_scope() as session:
+        svc = SliceService(session)
         try:
-            return svc.get(person_id)
+            return svc.get(timepoint, person_id)
         except NotFoundError:
             return None
 
 
+def slice_upsert_result(timepoint: int, person_id: int, data):
+    with session_scope() as session:
+        svc = SliceService(session)
+        return svc.upsert(timepoint, person_id, data)
+
+
+def slice_clear_result(timepoint: int, person_id: int) -> bool:
+    with session_scope() as session:
+        svc = SliceService(session)
+        return svc.delete(timepoint, person_id)
+
+
+def slices_get_many(
+    person_ids: Iterable[int] | None = None,
+    timepoints: Iterable[int] | None = None,
+) -> dict[int, dict[int, object]]:
+    """{person_id: {timepoint: SliceTNRead}} — один запрос на точку, а не на пару пациент × точка."""
+    with session_scope() as session:
+        svc = SliceService(session)
+        return svc.get_many(person_ids, timepoints)
+
+
+def slices_get_many_records(
+    person_ids: Iterable[int] | None = None,
+    timepoints: Iterable[int] | None = None,
+) -> dict[int, dict[int, tuple]]:
+    """Как slices_get_many, но лёгкие namedtuple-записи без Pydantic — для пакетной обработки."""
+    with session_scope() as session:
+        svc = SliceService(session)
+        return svc.get_many_records(person_ids, timepoints)
+
+
+def t0_get_result(person_id: int) -> SliceT0Read | None:
+    return slice_get_result(0, person_id)
+
+
 def t0_upsert_result(person_id: int, data: SliceT0Input) -> SliceT0Read:
-    with SessionLocal() as session:
-        svc = SliceT0Service(session)
-        return svc.upsert(person_id, data)
+    return slice_upsert_result(0, person_id, data)
 
 
 def t0_clear_result(person_id: int) -> bool:
-    with SessionLocal() as session:
-        svc = SliceT0Service(session)
-        return svc.delete(person_id)
+    return slice_clear_result(0, person_id)
 
 
 def t1_get_result(person_id: int) -> SliceT1Read | None:
-    with SessionLocal() as session:
-        svc = SliceT1Service(session)
-        try:
-            return svc.get(person_id)
-        except NotFoundError:
-            return None
+    return slice_get_result(1, person_id)
 
 
 def t1_upsert_result(person_id: int, data: SliceT1Input) -> SliceT1Read:
-    with SessionLocal() as session:
-        svc = SliceT1Service(session)
-        return svc.upsert(person_id, data)
+    return slice_upsert_result(1, person_id, data)
 
 
 def t1_clear_result(person_id: int) -> bool:
-    with SessionLocal() as session:
-        svc = SliceT1Service(session)
-        return svc.delete(person_id)
+    return slice_clear_result(1, person_id)
 
 
 def t2_get_result(person_id: int) -> SliceT2Read | None:
-    with SessionLocal() as session:
-        svc = SliceT2Service(session)
-        try:
-            return svc.get(person_id)
-        except NotFoundError:
-            return None
+    return slice_get_result(2, person_id)
 
 
 def t2_upsert_result(person_id: int, data: SliceT2Input) -> SliceT2Read:
-    with SessionLocal() as session:
-        svc = SliceT2Service(session)
-        return svc.upsert(person_id, data)
+    return slice_upsert_result(2, person_id, data)
 
 
 def t2_clear_result(person_id: int) -> bool:
-    with SessionLocal() as session:
-        svc = SliceT2Service(session)
-        return svc.delete(person_id)
+    return slice_clear_result(2, person_id)
 
 
 def t3_get_result(person_id: int) -> SliceT3Read | None:
-    with SessionLocal() as session:
-        svc = SliceT3Service(session)
-        try:
-            return svc.get(person_id)
-        except NotFoundError:
-            return None
+    return slice_get_result(3, person_id)
 
 
 def t3_upsert_result(person_id: int, data: SliceT3Input) -> SliceT3Read:
-    with SessionLocal() as session:
-        svc = SliceT3Service(session)
-        return svc.upsert(person_id, data)
+    return slice_upsert_result(3, person_id, data)
 
 
 def t3_clear_result(person_id: int) -> bool:
-    with SessionLocal() as session:
-        svc = SliceT3Service(session)
-        return svc.delete(person_id)
+    return slice_clear_result(3, person_id)
 
 
 def t4_get_result(person_id: int) -> SliceT4Read | None:
-    with SessionLocal() as session:
-        svc = SliceT4Service(session)
-        try:
-            return svc.get(person_id)
-        except NotFoundError:
-            return None
+    return slice_get_result(4, person_id)
 
 
 def t4_upsert_result(person_id: int, data: SliceT4Input) -> SliceT4Read:
-    with SessionLocal() as session:
-        svc = SliceT4Service(session)
-        return svc.upsert(person_id, data)
+    return slice_upsert_result(4, person_id, data)
 
 
 def t4_clear_result(person_id: int) -> bool:
-    with SessionLocal() as session:
-        svc = SliceT4Service(session)
-        return svc.delete(person_id)
+    return slice_clear_result(4, person_id)
 
 
 def t5_get_result(person_id: int) -> SliceT5Read | None:
-    with SessionLocal() as session:
-        svc = SliceT5Service(session)
-        try:
-            return svc.get(person_id)
-        except NotFoundError:
-            return None
+    return slice_get_result(5, person_id)
 
 
 def t5_upsert_result(person_id: int, data: SliceT5Input) -> SliceT5Read:
-    with SessionLocal() as session:
-        svc = SliceT5Service(session)
-        return svc.upsert(person_id, data)
+    return slice_upsert_result(5, person_id, data)
 
 
 def t5_clear_result(person_id: int) -> bool:
-    with SessionLocal() as session:
-        svc = SliceT5Service(session)
-        return svc.delete(person_id)
+    return slice_clear_result(5, person_id)
 
 
 def t6_get_result(person_id: int) -> SliceT6Read | None:
-    with SessionLocal() as session:
-        svc = SliceT6Service(session)
-        try:
-            return svc.get(person_id)
-        except NotFoundError:
-            return None
+    return slice_get_result(6, person_id)
 
 
 def t6_upsert_result(person_id: int, data: SliceT6Input) -> SliceT6Read:
-    with SessionLocal() as session:
-        svc = SliceT6Service(session)
-        return svc.upsert(person_id, data)
+    return slice_upsert_result(6, person_id, data)
 
 
 def t6_clear_result(person_id: int) -> bool:
-    with SessionLocal() as session:
-        svc = SliceT6Service(session)
-        return svc.delete(person_id)
+    return slice_clear_result(6, person_id)
 
 
 def t7_get_result(person_id: int) -> SliceT7Read | None:
-    with SessionLocal() as session:
-        svc = SliceT7Service(session)
-        try:
-            return svc.get(person_id)
-        except NotFoundError:
-            return None
+    return slice_get_result(7, person_id)
 
 
 def t7_upsert_result(person_id: int, data: SliceT7Input) -> SliceT7Read:
-    with SessionLocal() as session:
-        svc = SliceT7Service(session)
-        return svc.upsert(person_id, data)
+    return slice_upsert_result(7, person_id, data)
 
 
 def t7_clear_result(person_id: int) -> bool:
-    with SessionLocal() as session:
-        svc = SliceT7Service(session)
-        return svc.delete(person_id)
+    return slice_clear_result(7, person_id)
 
 
 def t8_get_result(person_id: int) -> SliceT8Read | None:
-    with SessionLocal() as session:
-        svc = SliceT8Service(session)
-        try:
-            return svc.get(person_id)
-        except NotFoundError:
-            return None
+    return slice_get_result(8, person_id)
 
 
 def t8_upsert_result(person_id: int, data: SliceT8Input) -> SliceT8Read:
-    with SessionLocal() as session:
-        svc = SliceT8Service(session)
-        return svc.upsert(person_id, data)
+    return slice_upsert_result(8, person_id, data)
 
 
 def t8_clear_result(person_id: int) -> bool:
-    with SessionLocal() as session:
-        svc = SliceT8Service(session)
-        return svc.delete(person_id)
+    return slice_clear_result(8, person_id)
 
 
 def t9_get_result(person_id: int) -> SliceT9Read | None:
-    with SessionLocal() as session:
-        svc = SliceT9Service(session)
-        try:
-            return svc.get(person_id)
-        except NotFoundError:
-            return None
+    return slice_get_result(9, person_id)
 
 
 def t9_upsert_result(person_id: int, data: SliceT9Input) -> SliceT9Read:
-    with SessionLocal() as session:
-        svc = SliceT9Service(session)
-        return svc.upsert(person_id, data)
+    return slice_upsert_result(9, person_id, data)
 
 
 def t9_clear_result(person_id: int) -> bool:
-    with SessionLocal() as session:
-        svc = SliceT9Service(session)
-        return svc.delete(person_id)
+    return slice_clear_result(9, person_id)
 
 
 def t10_get_result(person_id: int) -> SliceT10Read | None:
-    with SessionLocal() as session:
-        svc = SliceT10Service(session)
-        try:
-            return svc.get(person_id)
-        except NotFoundError:
-            return None
+    return slice_get_result(10, person_id)
 
 
 def t10_upsert_result(person_id: int, data: SliceT10Input) -> SliceT10Read:
-    with SessionLocal() as session:
-        svc = SliceT10Service(session)
-        return svc.upsert(person_id, data)
+    return slice_upsert_result(10, person_id, data)
 
 
 def t10_clear_result(person_id: int) -> bool:
-    with SessionLocal() as session:
-        svc = SliceT10Service(session)
-        return svc.delete(person_id)
+    return slice_clear_result(10, person_id)
 
 
 def t11_get_result(person_id: int) -> SliceT11Read | None:
-    with SessionLocal() as session:
-        svc = SliceT11Service(session)
-        try:
-            return svc.get(person_id)
-        except NotFoundError:
-            return None
+    return slice_get_result(11, person_id)
 
 
 def t11_upsert_result(person_id: int, data: SliceT11Input) -> SliceT11Read:
-    with SessionLocal() as session:
-        svc = SliceT11Service(session)
-        return svc.upsert(person_id, data)
+    return slice_upsert_result(11, person_id, data)
 
 
 def t11_clear_result(person_id: int) -> bool:
-    with SessionLocal() as session:
-        svc = SliceT11Service(session)
-        return svc.delete(person_id)
+    return slice_clear_result(11, person_id)
+
 
 def t12_get_result(person_id: int) -> SliceT12Read | None:
-    with SessionLocal() as session:
-        svc = SliceT12Service(session)
-        try:
-            return svc.get(person_id)
-        except NotFoundError:
-            return None
+    return slice_get_result(12, person_id)
 
 
 def t12_upsert_result(person_id: int, data: SliceT12Input) -> SliceT12Read:
-    with SessionLocal() as session:
-        svc = SliceT12Service(session)
-        return svc.upsert(person_id, data)
+    return slice_upsert_result(12, person_id, data)
 
 
 def t12_clear_result(person_id: int) -> bool:
-    with SessionLocal() as session:
-        svc = SliceT12Service(session)
-        return svc.delete(person_id)
+    return slice_clear_result(12, person_id)
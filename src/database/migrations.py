@@ -0,0 +1,221 @@
+"""
+Версионные миграции схемы без внешних зависимостей.
+
+Каждая миграция — функция от Connection с номером версии. Применённые версии
+хранятся в таблице schema_version. Новая (пустая) БД создаётся целиком по
+моделям (create_all) и сразу помечается последней версией, а в существующей
+БД выполняются только недостающие миграции — файл SQLite не пересоздаётся.
+
+Новая миграция: добавить функцию в MIGRATIONS со следующим номером и то же
+изменение отразить в models.py (чтобы create_all давал ту же схему).
+
+Запуск вручную: ``python -m database.migrations``.
+"""
+from datetime import datetime, timezone
+from typing import Callable, NamedTuple
+
+from sqlalchemy import Column, DateTime, Integer, MetaData, String, Table, bindparam, inspect, select, text
+from sqlalchemy.engine import Connection, Engine
+from sqlalchemy.exc import DBAPIError
+
+from database.models import (
+    PERSON_FTS_TABLE as FTS_TABLE,
+    PERSON_SEARCH_FIELDS,
+    PERSON_TRGM_INDEX as TRGM_INDEX,
+    UPDATED_AT_INDEXES,
+    Base,
+    Person,
+    normalize_search,
+    person_search_document as document_sql,
+)
+
+
+class Migration(NamedTuple):
+    version: int
+    description: str
+    upgrade: Callable[[Connection], None]
+
+
+_meta = MetaData()
+schema_version = Table(
+    "schema_version",
+    _meta,
+    Column("version", Integer, primary_key=True),
+    Column("description", String(255), nullable=False),
+    Column("applied_at", DateTime(timezone=True), nullable=False),
+)
+
+
+def _create_indexes(conn: Connection, table: str, indexes: dict[str, tuple[str, ...]]) -> None:
+    for name, columns in indexes.items():
+        conn.execute(text(f"CREATE INDEX IF NOT EXISTS {name} ON {table} ({', '.join(columns)})"))
+
+
+def _m001_persons_search_indexes(conn: Connection) -> None:
+    _create_indexes(
+        conn,
+        "persons",
+        {
+            "ix_persons_last_name_first_name": ("last_name", "first_name"),
+            "ix_persons_first_name": ("first_name",),
+            "ix_persons_card_number": ("card_number",),
+            "ix_persons_birth_date": ("birth_date",),
+            "ix_persons_inclusion_date": ("inclusion_date",),
+        },
+    )
+
+
+def _m002_persons_updated_at(conn: Connection) -> None:
+    # таблица export_watermarks создаётся create_all в upgrade()
+    columns = {c["name"] for c in inspect(conn).get_columns("persons")}
+    if "updated_at" not in columns:
+        # как Person.updated_at: NULL допустим, значение по умолчанию — now()
+        if conn.dialect.name == "postgresql":
+            conn.execute(text("ALTER TABLE persons ADD COLUMN updated_at TIMESTAMP WITH TIME ZONE DEFAULT now()"))
+        else:
+            # SQLite не допускает ADD COLUMN с DEFAULT CURRENT_TIMESTAMP — заполняем отдельно,
+            # новые строки получают now() из default модели
+            conn.execute(text("ALTER TABLE persons ADD COLUMN updated_at DATETIME"))
+            conn.execute(text("UPDATE persons SET updated_at = CURRENT_TIMESTAMP"))
+    _create_indexes(conn, "persons", {"ix_persons_updated_at": ("updated_at",)})
+
+
+def _m003_persons_age_index(conn: Connection) -> None:
+    # составной индекс заменяет ix_persons_birth_date (тот же префикс)
+    _create_indexes(conn, "persons", {"ix_persons_birth_date_inclusion_date": ("birth_date", "inclusion_date")})
+    conn.execute(text("DROP INDEX IF EXISTS ix_persons_birth_date"))
+
+
+def _m004_persons_search_order(conn: Connection) -> None:
+    # id в конце индекса — keyset-пагинация без сортировки; старый индекс — его префикс
+    _create_indexes(conn, "persons", {"ix_persons_search_order": ("last_name", "first_name", "id")})
+    conn.execute(text("DROP INDEX IF EXISTS ix_persons_last_name_first_name"))
+
+
+def _m005_persons_search_columns(conn: Connection) -> None:
+    existing = {c["name"] for c in inspect(conn).get_columns("persons")}
+    for field in PERSON_SEARCH_FIELDS:
+        column = Person.__table__.c[f"{field}_norm"]
+        if column.name not in existing:
+            ddl = column.type.compile(dialect=conn.dialect)
+            conn.execute(text(f"ALTER TABLE persons ADD COLUMN {column.name} {ddl}"))
+    # заполнение той же normalize_search, что и при записи (SQL lower() в SQLite — только ASCII)
+    rows = conn.execute(text(f"SELECT id, {', '.join(PERSON_SEARCH_FIELDS)} FROM persons")).all()
+    if rows:
+        sets = ", ".join(f"{field}_norm = :{field}" for field in PERSON_SEARCH_FIELDS)
+        conn.execute(
+            text(f"UPDATE persons SET {sets} WHERE id = :row_id").bindparams(bindparam("row_id")),
+            [
+                {"row_id": row.id, **{f: normalize_search(getattr(row, f)) for f in PERSON_SEARCH_FIELDS}}
+                for row in rows
+            ],
+        )
+    _create_indexes(conn, "persons", {f"ix_persons_{f}_norm": (f"{f}_norm",) for f in PERSON_SEARCH_FIELDS})
+
+
+def _m006_persons_fuzzy_index(conn: Connection) -> None:
+    # FTS5 и pg_trgm могут отсутствовать — тогда поиск остаётся без индекса (перебором)
+    if conn.dialect.name == "sqlite":
+        norms = ", ".join(f"{field}_norm" for field in PERSON_SEARCH_FIELDS)
+        insert = f"INSERT INTO {FTS_TABLE} (rowid, doc) VALUES (new.id, {document_sql('new.')});"
+        try:
+            with conn.begin_nested():
+                conn.execute(text(f"CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} USING fts5(doc, tokenize='trigram')"))
+        except DBAPIError:
+            return
+        for ddl in (
+            f"CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_ai AFTER INSERT ON persons BEGIN {insert} END",
+            f"CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_ad AFTER DELETE ON persons "
+            f"BEGIN DELETE FROM {FTS_TABLE} WHERE rowid = old.id; END",
+            f"CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_au AFTER UPDATE OF {norms} ON persons "
+            f"BEGIN DELETE FROM {FTS_TABLE} WHERE rowid = old.id; {insert} END",
+            f"DELETE FROM {FTS_TABLE}",
+            f"INSERT INTO {FTS_TABLE} (rowid, doc) SELECT id, {document_sql()} FROM persons",
+        ):
+            conn.execute(text(ddl))
+    elif conn.dialect.name == "postgresql":
+        available = conn.execute(text("SELECT 1 FROM pg_available_extensions WHERE name = 'pg_trgm'")).first()
+        if available is None:
+            return
+        try:
+            with conn.begin_nested():
+                conn.execute(text("CREATE EXTENSION IF NOT EXISTS pg_trgm"))
+        except DBAPIError:  # нет прав на CREATE EXTENSION
+            return
+        conn.execute(text(
+            f"CREATE INDEX IF NOT EXISTS {TRGM_INDEX} ON persons USING gin (({document_sql()}) gin_trgm_ops)"
+        ))
+
+
+def _m007_updated_at_indexes(conn: Connection) -> None:
+    # таблица person_deletions создаётся create_all в upgrade()
+    for table, index in UPDATED_AT_INDEXES.items():
+        _create_indexes(conn, table, {index.name: ("updated_at",)})
+
+
+MIGRATIONS: list[Migration] = [
+    Migration(1, "persons: индексы для поиска и сортировки", _m001_persons_search_indexes),
+    Migration(2, "persons.updated_at и export_watermarks для дельта-выгрузок", _m002_persons_updated_at),
+    Migration(3, "persons: индекс (birth_date, inclusion_date) для поиска по возрасту", _m003_persons_age_index),
+    Migration(4, "persons: индекс (last_name, first_name, id) для постраничного поиска", _m004_persons_search_order),
+    Migration(5, "persons: нормализованные копии ФИО и номера истории для поиска", _m005_persons_search_columns),
+    Migration(6, "persons: индекс нечёткого поиска (FTS5 trigram / pg_trgm)", _m006_persons_fuzzy_index),
+    Migration(7, "индексы updated_at шкал и срезов, person_deletions для дельта-выгрузок", _m007_updated_at_indexes),
+]
+
+
+def current_version(conn: Connection) -> int:
+    if not inspect(conn).has_table(schema_version.name):
+        return 0
+    versions = conn.execute(select(schema_version.c.version)).scalars().all()
+    return max(versions, default=0)
+
+
+def _stamp(conn: Connection, migration: Migration) -> None:
+    conn.execute(
+        schema_version.insert().values(
+            version=migration.version,
+            description=migration.description,
+            applied_at=datetime.now(timezone.utc),
+        )
+    )
+
+
+def upgrade(conn: Connection) -> list[int]:
+    """Доводит схему до последней версии; возвращает номера применённых миграций."""
+    fresh = not inspect(conn).has_table("persons")
+    # новые таблицы из моделей создаются в любом случае (существующие не трогаются)
+    Base.metadata.create_all(conn)
+    _meta.create_all(conn)
+
+    if fresh:
+        # схема по моделям уже актуальна — только помечаем версии;
+        # индекс нечёткого поиска моделями не описывается и создаётся отдельно
+        _m006_persons_fuzzy_index(conn)
+        for migration in MIGRATIONS:
+            _stamp(conn, migration)
+        return []
+
+    done = current_version(conn)
+    applied = []
+    for migration in MIGRATIONS:
+        if migration.version <= done:
+            continue
+        migration.upgrade(conn)
+        _stamp(conn, migration)
+        applied.append(migration.version)
+    return applied
+
+
+def migrate(engine: Engine) -> list[int]:
+    """upgrade() в одной транзакции."""
+    with engine.begin() as conn:
+        return upgrade(conn)
+
+
+if __name__ == "__main__":
+    # импорт database.db сам применяет недостающие миграции
+    from database.db import engine
+
+    with engine.connect() as _conn:
+        print(f"schema version: {current_version(_conn)}")
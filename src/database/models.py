@@ -13,6 +13,9 @@ from sqlalchemy import (
     Boolean,
     Date,
     Time,
+    Index,
+    JSON,
+    event,
 )
 from sqlalchemy.sql import func
 from sqlalchemy.ext.hybrid import hybrid_property
@@ -37,11 +40,65 @@ from database.enums.elganzouri import (
     MouthOpening,
 )
 
-Base = declarative_base()
+
+class _ModelBase:
+    # created_at/updated_at и прочие серверные значения возвращаются через
+    # RETURNING в том же INSERT/UPDATE (SQLite 3.35+, Postgres) — после commit
+    # не нужен повторный SELECT (session.refresh)
+    __mapper_args__ = {"eager_defaults": True}
+
+
+Base = declarative_base(cls=_ModelBase)
+
+
+def normalize_search(value: str | None) -> str | None:
+    """Форма для поиска: пробелы схлопнуты, регистр снят (casefold), ё → е."""
+    if value is None:
+        return None
+    return " ".join(value.split()).casefold().replace("ё", "е")
+
+
+# поля пациента с нормализованной копией <поле>_norm для поиска
+PERSON_SEARCH_FIELDS = ("last_name", "first_name", "patronymic", "card_number")
+
+# индекс нечёткого поиска (миграция 6, repositories.person_search): моделями не
+# описывается — FTS5-таблица в SQLite, GIN-индекс pg_trgm в Postgres
+PERSON_FTS_TABLE = "persons_fts"
+PERSON_TRGM_INDEX = "ix_persons_search_trgm"
+
+
+def person_search_document(prefix: str = "") -> str:
+    """SQL-выражение документа нечёткого поиска; prefix — "new." / "old." в триггерах."""
+    parts = " || ' ' || ".join(f"coalesce({prefix}{field}_norm, '')" for field in PERSON_SEARCH_FIELDS)
+    return f"' ' || {parts} || ' '"
+
+
+def _search_column(length: int, source: str) -> Column:
+    # двоичное сравнение (в Postgres — COLLATE "C"): префикс ищется диапазоном по обычному индексу;
+    # значение при любом INSERT (ORM, пакетный, Core) — по умолчанию из исходного поля
+    return Column(
+        String(length).with_variant(String(length, collation="C"), "postgresql"),
+        nullable=True,
+        default=lambda context: normalize_search(context.get_current_parameters().get(source)),
+    )
 
 
 class Person(Base):
     __tablename__ = "persons"
+    __table_args__ = (
+        # поиск и сортировка пациентов (PersonsRepository.search), миграция 1
+        Index("ix_persons_first_name", "first_name"),
+        Index("ix_persons_card_number", "card_number"),
+        Index("ix_persons_inclusion_date", "inclusion_date"),
+        # поиск по возрасту: окно birth_date + точная проверка по индексу, миграция 3
+        Index("ix_persons_birth_date_inclusion_date", "birth_date", "inclusion_date"),
+        # порядок поиска и keyset-курсор (last_name, first_name, id), миграция 4
+        Index("ix_persons_search_order", "last_name", "first_name", "id"),
+        # дельта-выгрузки (ExportService.write_delta), миграция 2
+        Index("ix_persons_updated_at", "updated_at"),
+        # регистронезависимый поиск по ФИО и номеру истории, миграция 5
+        *(Index(f"ix_persons_{field}_norm", f"{field}_norm") for field in PERSON_SEARCH_FIELDS),
+    )
 
     id = Column(Integer, primary_key=True, autoincrement=True, index=True)
     card_number = Column(String(64), nullable=True)
@@ -55,6 +112,17 @@ class Person(Base):
     weight = Column(Integer, nullable=False)  # Вес (кг)
     gender = Column(Boolean, nullable=False, default=False)
     # False (0) = мужской, True (1) = женский
+    # nullable и default в запросе (не только server_default): в SQLite миграция 2
+    # добавляет колонку без NOT NULL и без DEFAULT
+    updated_at = Column(
+        DateTime(timezone=True), default=func.now(), server_default=func.now(), onupdate=func.now()
+    )
+
+    # нормализованные копии (normalize_search) для поиска, миграция 5
+    last_name_norm = _search_column(128, "last_name")
+    first_name_norm = _search_column(128, "first_name")
+    patronymic_norm = _search_column(128, "patronymic")
+    card_number_norm = _search_column(64, "card_number")
 
     scales = relationship(
         "PersonScales",
@@ -96,6 +164,13 @@ class Person(Base):
         )
 
 
+@event.listens_for(Person, "before_update")
+def _person_search_norms(mapper, connection, target: Person) -> None:
+    # UPDATE через ORM: копии пересчитываются из текущих значений полей
+    for field in PERSON_SEARCH_FIELDS:
+        setattr(target, f"{field}_norm", normalize_search(getattr(target, field)))
+
+
 class PersonScales(Base):
     """
     Таблица со статусами заполнения шкал для пациента.
@@ -1779,3 +1854,42 @@ class Qor15Result(Base):
     )
 
     scales = relationship("PersonScales", back_populates="qor15")
+
+
+class ExportWatermark(Base):
+    """Отметка последней дельта-выгрузки по каждому потоку (feed)."""
+
+    __tablename__ = "export_watermarks"
+
+    feed = Column(String(64), primary_key=True)
+    watermark = Column(DateTime(timezone=True), nullable=False)
+    rows = Column(Integer, nullable=False, default=0)
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now(), nullable=False)
+
+
+class ExportPreset(Base):
+    """Сохранённый набор таблиц и полей выгрузки: {ключ таблицы: [поля] | null}."""
+
+    __tablename__ = "export_presets"
+
+    name = Column(String(128), primary_key=True)
+    selection = Column(JSON, nullable=False)
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now(), nullable=False)
+
+
+class PersonDeletion(Base):
+    """Удалённые пациенты — чтобы дельта-выгрузка сообщила об удалении (ExportDelta.deleted)."""
+
+    __tablename__ = "person_deletions"
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    person_id = Column(Integer, nullable=False)
+    deleted_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False, index=True)
+
+
+# дельта-выгрузки отбирают изменённые шкалы и срезы по updated_at, миграция 7
+UPDATED_AT_INDEXES = {
+    table.name: Index(f"ix_{table.name}_updated_at", table.c.updated_at)
+    for table in Base.metadata.sorted_tables
+    if "updated_at" in table.c and table.name != Person.__tablename__ and not table.name.startswith("export_")
+}
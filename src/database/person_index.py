@@ -0,0 +1,172 @@
+"""
+Индекс префиксов ФИО и номеров истории в памяти процесса — подсказки при
+наборе без запроса к БД на каждый символ.
+
+Ключи — пары (слово, id пациента) в отсортированном списке: каждое слово
+фамилии, имени, отчества и номер истории в форме normalize_search. Префикс
+ищется bisect'ом. Индекс загружается одним SELECT при первом обращении,
+после записи через PersonsService обновляется точечно — только когда
+транзакция действительно зафиксирована (в пакете unit_of_work — при выходе
+из блока, при откате изменения отбрасываются), а правки из других процессов
+подхватывает полной перезагрузкой раз в PERSON_INDEX_TTL_S (по умолчанию 300)
+секунд.
+"""
+import os
+import threading
+import time
+from bisect import bisect_left, insort
+from datetime import date
+from typing import Callable, Iterable, NamedTuple
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from database.models import normalize_search
+from database.repositories.persons import PersonsRepository
+
+
+class PersonSuggestion(NamedTuple):
+    id: int
+    fio: str
+    card_number: str | None
+    birth_date: date
+
+
+class PersonIndex:
+    def __init__(self, loader: Callable[[], Iterable[tuple]], ttl: float):
+        # loader — строки (id, last_name, first_name, patronymic, card_number, birth_date)
+        self._loader = loader
+        self._ttl = ttl
+        self._lock = threading.RLock()
+        self._keys: list[tuple[str, int]] = []
+        self._people: dict[int, tuple[PersonSuggestion, tuple[str, ...]]] = {}
+        self._loaded_at: float | None = None
+
+    @staticmethod
+    def _entry(person_id, last_name, first_name, patronymic, card_number, birth_date):
+        names = [v for v in (last_name, first_name, patronymic) if v]
+        words = [w for v in names for w in normalize_search(v).split()]
+        card = normalize_search(card_number)
+        if card:
+            words.append(card)
+        suggestion = PersonSuggestion(person_id, " ".join(names), card_number, birth_date)
+        return suggestion, tuple(dict.fromkeys(words))
+
+    def _ensure_loaded(self) -> None:
+        if self._loaded_at is not None and time.monotonic() - self._loaded_at < self._ttl:
+            return
+        with self._lock:
+            if self._loaded_at is not None and time.monotonic() - self._loaded_at < self._ttl:
+                return
+            people = {row[0]: self._entry(*row) for row in self._loader()}
+            self._keys = sorted((w, pid) for pid, (_, words) in people.items() for w in words)
+            self._people = people
+            self._loaded_at = time.monotonic()
+
+    def _drop(self, person_id: int) -> None:
+        old = self._people.pop(person_id, None)
+        if old is None:
+            return
+        for word in old[1]:
+            i = bisect_left(self._keys, (word, person_id))
+            if i < len(self._keys) and self._keys[i] == (word, person_id):
+                del self._keys[i]
+
+    def upsert(self, person) -> None:
+        """Добавить/обновить пациента (объект с полями PersonRead); до загрузки — ничего."""
+        with self._lock:
+            if self._loaded_at is None:
+                return
+            self._drop(person.id)
+            entry = self._entry(
+                person.id, person.last_name, person.first_name, person.patronymic,
+                person.card_number, person.birth_date,
+            )
+            self._people[person.id] = entry
+            for word in entry[1]:
+                insort(self._keys, (word, person.id))
+
+    def remove(self, person_id: int) -> None:
+        with self._lock:
+            self._drop(person_id)
+
+    def suggest(self, query: str, limit: int = 10) -> list[PersonSuggestion]:
+        """
+        Пациенты, у которых каждое слово запроса — начало какого-либо их слова
+        («иван пет» → Иванов Пётр …). Порядок — по совпавшему слову.
+        """
+        tokens = (normalize_search(query) or "").split()
+        if not tokens:
+            return []
+        self._ensure_loaded()
+        # по самому длинному слову — меньше кандидатов, остальные проверяются по записи
+        driver = max(tokens, key=len)
+        others = [t for t in tokens if t is not driver]
+        result, seen = [], set()
+        with self._lock:
+            keys = self._keys
+            i = bisect_left(keys, (driver,))
+            while i < len(keys) and keys[i][0].startswith(driver) and len(result) < limit:
+                person_id = keys[i][1]
+                i += 1
+                if person_id in seen:
+                    continue
+                seen.add(person_id)
+                suggestion, words = self._people[person_id]
+                if all(any(w.startswith(t) for w in words) for t in others):
+                    result.append(suggestion)
+        return result
+
+
+def _load_rows() -> list[tuple]:
+    # database.db (движок) — только при загрузке: модуль импортируется из сервисов
+    from database.db import session_scope
+
+    with session_scope() as session:
+        return PersonsRepository(session).index_rows()
+
+
+_index: PersonIndex | None = None
+_index_lock = threading.Lock()
+
+
+def get_person_index() -> PersonIndex:
+    global _index
+    with _index_lock:
+        if _index is None:
+            _index = PersonIndex(_load_rows, ttl=int(os.getenv("PERSON_INDEX_TTL_S", "300")))
+        return _index
+
+
+# изменения индекса, ждущие фиксации транзакции сессии: [(person | None, id)]
+_PENDING = "person_index_pending"
+
+
+def upsert_after_commit(session: Session, person) -> None:
+    """Добавить/обновить пациента в индексе после commit (person — объект Person)."""
+    session.info.setdefault(_PENDING, []).append((person, None))
+
+
+def remove_after_commit(session: Session, person_id: int) -> None:
+    session.info.setdefault(_PENDING, []).append((None, person_id))
+
+
+@event.listens_for(Session, "after_commit")
+def _apply_pending(session: Session) -> None:
+    pending = session.info.pop(_PENDING, None)
+    if not pending:
+        return
+    # атрибуты уже загружены (expire_on_commit=False) — без SQL
+    index = get_person_index()
+    for person, person_id in pending:
+        if person is None:
+            index.remove(person_id)
+        else:
+            index.upsert(person)
+
+
+@event.listens_for(Session, "after_transaction_end")
+def _drop_pending(session: Session, transaction) -> None:
+    # внешняя транзакция закончилась без commit (откат, close) — индекс не трогаем
+    if transaction.parent is None:
+        session.info.pop(_PENDING, None)
@@ -1,7 +1,7 @@
 from sqlalchemy.orm import Session
 from sqlalchemy import select, delete
 
-from database.models import AldreteResult
+from database.models import AldreteResult, PersonScales
 
 
 class AldreteRepository:
@@ -12,6 +12,14 @@ class AldreteRepository:
         stmt = select(AldreteResult).where(AldreteResult.scales_id == scales_id)
         return self.session.execute(stmt).scalar_one_or_none()
 
+    def get_by_person_id(self, person_id: int) -> AldreteResult | None:
+        stmt = (
+            select(AldreteResult)
+            .join(PersonScales, PersonScales.id == AldreteResult.scales_id)
+            .where(PersonScales.person_id == person_id)
+        )
+        return self.session.execute(stmt).scalar_one_or_none()
+
     def add(self, obj: AldreteResult) -> AldreteResult:
         self.session.add(obj)
         return obj
@@ -1,7 +1,7 @@
 from sqlalchemy.orm import Session
 from sqlalchemy import select, delete
 
-from database.models import AriscatResult
+from database.models import AriscatResult, PersonScales
 
 
 class AriscatRepository:
@@ -12,6 +12,14 @@ class AriscatRepository:
         stmt = select(AriscatResult).where(AriscatResult.scales_id == scales_id)
         return self.session.execute(stmt).scalar_one_or_none()
 
+    def get_by_person_id(self, person_id: int) -> AriscatResult | None:
+        stmt = (
+            select(AriscatResult)
+            .join(PersonScales, PersonScales.id == AriscatResult.scales_id)
+            .where(PersonScales.person_id == person_id)
+        )
+        return self.session.execute(stmt).scalar_one_or_none()
+
     def add(self, obj: AriscatResult) -> AriscatResult:
         self.session.add(obj)
         return obj
@@ -0,0 +1,123 @@
+import uuid
+from typing import Iterable, Sequence
+
+from sqlalchemy import Column, MetaData, Row, Table, func, select, update
+from sqlalchemy.orm import Session
+
+from database.models import Base
+from database.repositories.pg_copy import copy_in, copy_supported
+
+
+class BulkRepository:
+    """Set-based запись: INSERT … ON CONFLICT и UPDATE по списку id (SQLite, Postgres)."""
+
+    # ограничение на число параметров в IN (SQLite: 32766)
+    IN_CHUNK = 1000
+    # строк на один executemany
+    BATCH = 1000
+    # с такой пачки upsert в Postgres идёт через COPY во временную таблицу
+    COPY_MIN_ROWS = 500
+
+    def __init__(self, session: Session):
+        self.session = session
+
+    def _insert(self, model: type[Base]):
+        dialect = self.session.get_bind().dialect.name
+        if dialect == "postgresql":
+            from sqlalchemy.dialects.postgresql import insert
+        elif dialect == "sqlite":
+            from sqlalchemy.dialects.sqlite import insert
+        else:
+            raise NotImplementedError(f"Bulk upsert is not supported for {dialect}")
+        return insert(model.__table__)
+
+    def _chunks(self, ids: Iterable[int]) -> Iterable[list[int]]:
+        ids = sorted(set(ids))
+        for i in range(0, len(ids), self.IN_CHUNK):
+            yield ids[i:i + self.IN_CHUNK]
+
+    def ensure_parent_rows(self, model: type[Base], person_ids: Iterable[int]) -> dict[int, int]:
+        """
+        Создаёт недостающие строки PersonScales/PersonSlices одним INSERT …
+        ON CONFLICT DO NOTHING и возвращает {person_id: id}.
+        """
+        person_ids = sorted(set(person_ids))
+        if not person_ids:
+            return {}
+        stmt = self._insert(model).on_conflict_do_nothing(index_elements=["person_id"])
+        self.session.execute(stmt, [{"person_id": pid} for pid in person_ids])
+        out: dict[int, int] = {}
+        for chunk in self._chunks(person_ids):
+            stmt = select(model.person_id, model.id).where(model.person_id.in_(chunk))
+            out.update(self.session.execute(stmt).tuples().all())
+        return out
+
+    def fetch_rows(self, model: type[Base], key_column, keys: Iterable[int], *where) -> list[Row]:
+        """Строки таблицы (Core, без ORM-объектов) по списку значений key_column."""
+        out: list[Row] = []
+        for chunk in self._chunks(keys):
+            stmt = select(model.__table__).where(key_column.in_(chunk), *where)
+            out.extend(self.session.execute(stmt))
+        return out
+
+    def upsert(
+        self,
+        model: type[Base],
+        rows: Sequence[dict],
+        conflict: Sequence[str],
+        *,
+        coalesce: bool = False,
+    ) -> int:
+        """
+        INSERT … ON CONFLICT (conflict) DO UPDATE для пачки строк с одинаковым
+        набором ключей. coalesce=True — NULL во входных данных не затирает
+        сохранённое значение. Большие пачки в Postgres (psycopg) загружаются
+        COPY, остальные — executemany порциями по BATCH.
+        """
+        if not rows:
+            return 0
+        table = model.__table__
+        names = list(rows[0])
+        if len(rows) >= self.COPY_MIN_ROWS and copy_supported(self.session):
+            self._copy_upsert(table, names, rows, conflict, coalesce)
+            return len(rows)
+        stmt = self._on_conflict(self._insert(model), table, names, conflict, coalesce)
+        for i in range(0, len(rows), self.BATCH):
+            self.session.execute(stmt, list(rows[i:i + self.BATCH]))
+        return len(rows)
+
+    @staticmethod
+    def _on_conflict(stmt, table: Table, names: Sequence[str], conflict: Sequence[str], coalesce: bool):
+        set_ = {}
+        for name in names:
+            if name in conflict:
+                continue
+            new = stmt.excluded[name]
+            set_[name] = func.coalesce(new, table.c[name]) if coalesce else new
+        if "updated_at" in table.c:
+            set_["updated_at"] = func.now()
+        return stmt.on_conflict_do_update(index_elements=list(conflict), set_=set_)
+
+    def _copy_upsert(
+        self, table: Table, names: list[str], rows: Sequence[dict], conflict: Sequence[str], coalesce: bool
+    ) -> None:
+        """COPY во временную таблицу и один INSERT … SELECT … ON CONFLICT из неё."""
+        from sqlalchemy.dialects.postgresql import insert
+
+        conn = self.session.connection()
+        quote = conn.dialect.identifier_preparer.quote
+        tmp = f"_copy_{table.name}_{uuid.uuid4().hex[:8]}"
+        # типы колонок (включая Enum) — как в целевой таблице, без ограничений
+        conn.exec_driver_sql(
+            f"CREATE TEMP TABLE {quote(tmp)} ON COMMIT DROP AS "
+            f"SELECT {', '.join(quote(n) for n in names)} FROM {quote(table.name)} WITH NO DATA"
+        )
+        copy_in(self.session, tmp, [table.c[n] for n in names], ([row[n] for n in names] for row in rows))
+        source = Table(tmp, MetaData(), *(Column(n, table.c[n].type) for n in names))
+        stmt = insert(table).from_select(names, select(*source.c))
+        conn.execute(self._on_conflict(stmt, table, names, conflict, coalesce))
+        conn.exec_driver_sql(f"DROP TABLE {quote(tmp)}")
+
+    def set_flags(self, model: type[Base], ids: Iterable[int], **flags) -> None:
+        for chunk in self._chunks(ids):
+            self.session.execute(update(model).where(model.id.in_(chunk)).values(**flags))
@@ -1,6 +1,6 @@
 from sqlalchemy.orm import Session
 from sqlalchemy import select, delete
-from database.models import CapriniResult
+from database.models import CapriniResult, PersonScales
 
 
 class CapriniRepository:
@@ -11,6 +11,14 @@ class CapriniRepository:
         stmt = select(CapriniResult).where(CapriniResult.scales_id == scales_id)
         return self.session.execute(stmt).scalar_one_or_none()
 
+    def get_by_person_id(self, person_id: int) -> CapriniResult | None:
+        stmt = (
+            select(CapriniResult)
+            .join(PersonScales, PersonScales.id == CapriniResult.scales_id)
+            .where(PersonScales.person_id == person_id)
+        )
+        return self.session.execute(stmt).scalar_one_or_none()
+
     def add(self, obj: CapriniResult) -> CapriniResult:
         self.session.add(obj)
         return obj
@@ -1,7 +1,7 @@
 from sqlalchemy.orm import Session
 from sqlalchemy import select, delete
 
-from database.models import ElGanzouriResult
+from database.models import ElGanzouriResult, PersonScales
 
 
 class ElGanzouriRepository:
@@ -14,6 +14,14 @@ class ElGanzouriRepository:
         stmt = select(ElGanzouriResult).where(ElGanzouriResult.scales_id == scales_id)
         return self.session.execute(stmt).scalar_one_or_none()
 
+    def get_by_person_id(self, person_id: int) -> ElGanzouriResult | None:
+        stmt = (
+            select(ElGanzouriResult)
+            .join(PersonScales, PersonScales.id == ElGanzouriResult.scales_id)
+            .where(PersonScales.person_id == person_id)
+        )
+        return self.session.execute(stmt).scalar_one_or_none()
+
     def add(self, res: ElGanzouriResult) -> ElGanzouriResult:
         self.session.add(res)
         return res
@@ -0,0 +1,249 @@
+from datetime import datetime, timezone
+from typing import Iterable, Iterator, Sequence
+
+from sqlalchemy import Select, String, and_, func, or_, select, type_coerce, union, union_all
+from sqlalchemy.orm import Session
+
+from database.models import (
+    Base, ExportPreset, ExportWatermark, Person, PersonDeletion, PersonScales, PersonSlices,
+)
+from database.repositories.pg_copy import copy_rows, copy_supported
+
+
+def _in_persons(person_ids, column=Person.id):
+    # подзапрос (Select) не разворачивается в список — нет лимита на число параметров
+    return column.in_(person_ids if isinstance(person_ids, Select) else list(person_ids))
+
+
+class ExportRepository:
+    """
+    Запросы выгрузки: каждая таблица — один SELECT от persons с LEFT JOIN,
+    ровно одна строка на пациента в порядке persons.id. Поэтому результаты
+    разных таблиц выравниваются по позиции, без merge по patient_id.
+    """
+
+    def __init__(self, session: Session):
+        self.session = session
+
+    @staticmethod
+    def _from_persons(columns: Sequence, person_ids: Iterable[int] | None) -> Select:
+        stmt = select(Person.id, *columns).select_from(Person).order_by(Person.id)
+        if person_ids is not None:
+            stmt = stmt.where(_in_persons(person_ids))
+        return stmt
+
+    def persons_stmt(self, columns: Sequence, person_ids=None) -> Select:
+        return self._from_persons(columns, person_ids)
+
+    def scale_flags_stmt(self, columns: Sequence, person_ids=None) -> Select:
+        return self._from_persons(columns, person_ids).outerjoin(
+            PersonScales, PersonScales.person_id == Person.id
+        )
+
+    def scale_stmt(
+        self,
+        model: type[Base],
+        columns: Sequence,
+        person_ids=None,
+        timepoint: int | None = None,
+    ) -> Select:
+        on = model.scales_id == PersonScales.id
+        if timepoint is not None:
+            on = and_(on, model.timepoint == timepoint)
+        return (
+            self.scale_flags_stmt(columns, person_ids)
+            .outerjoin(model, on)
+        )
+
+    def slice_stmt(self, model: type[Base], columns: Sequence, person_ids=None) -> Select:
+        return (
+            self._from_persons(columns, person_ids)
+            .outerjoin(PersonSlices, PersonSlices.person_id == Person.id)
+            .outerjoin(model, model.slices_id == PersonSlices.id)
+        )
+
+    def slice_rows_stmt(
+        self, model: type[Base], keys: Sequence, values: Sequence, person_ids=None
+    ) -> Select:
+        """
+        Только заполненные строки среза: (person_id, *keys, *values), где хотя бы
+        одно из values не NULL. INNER JOIN — пациенты без среза в результат не попадают.
+        """
+        stmt = (
+            select(PersonSlices.person_id, *keys, *values)
+            .join(model, model.slices_id == PersonSlices.id)
+            .where(or_(*(column.isnot(None) for column in values)))
+            .order_by(PersonSlices.person_id)
+        )
+        if person_ids is not None:
+            stmt = stmt.where(_in_persons(person_ids, PersonSlices.person_id))
+        return stmt
+
+    def count_rows(self, stmt: Select) -> int:
+        return self.session.execute(
+            select(func.count()).select_from(stmt.order_by(None).subquery())
+        ).scalar_one()
+
+    def count(self, person_ids=None) -> int:
+        stmt = select(func.count()).select_from(Person)
+        if person_ids is not None:
+            stmt = stmt.where(_in_persons(person_ids))
+        return self.session.execute(stmt).scalar_one()
+
+    def fetch(self, stmt: Select) -> list[tuple]:
+        return self.session.execute(stmt).tuples().all()
+
+    @property
+    def copy_supported(self) -> bool:
+        return copy_supported(self.session)
+
+    def stream(self, stmt: Select, chunk_size: int) -> Iterator[Sequence[tuple]]:
+        """
+        Порции строк по chunk_size без загрузки всего результата: серверный
+        курсор, а в Postgres (psycopg) — COPY (SELECT …) TO STDOUT. COPY
+        занимает соединение целиком, поэтому такой поток может быть только один.
+        """
+        if self.copy_supported:
+            return copy_rows(self.session, stmt, chunk_size)
+        result = self.session.execute(stmt.execution_options(yield_per=chunk_size))
+        return result.tuples().partitions()
+
+    @staticmethod
+    def combine(stmts: Sequence[Select]) -> Select:
+        """
+        Один запрос из нескольких выровненных (первая колонка — patient_id):
+        JOIN подзапросов по patient_id, колонки — подряд, без повторных patient_id.
+        """
+        subs = [stmt.order_by(None).subquery() for stmt in stmts]
+        first = subs[0]
+        stmt = select(first.c[0], *(c for sub in subs for c in list(sub.c)[1:])).select_from(first)
+        for sub in subs[1:]:
+            stmt = stmt.join(sub, sub.c[0] == first.c[0])
+        return stmt.order_by(first.c[0])
+
+    # --- дельта-выгрузки ---
+
+    def _changed_since(self, column, since: datetime):
+        if self.session.get_bind().dialect.name == "sqlite":
+            # CURRENT_TIMESTAMP хранится строкой 'YYYY-MM-DD HH:MM:SS' (UTC), а параметр
+            # DateTime — с микросекундами. Колонка сравнивается как есть (индекс updated_at
+            # работает) со строкой в том же виде; секунда округляется вниз — лишние
+            # строки возможны, пропущенные — нет
+            if since.tzinfo is not None:
+                since = since.astimezone(timezone.utc).replace(tzinfo=None)
+            return type_coerce(column, String) >= since.strftime("%Y-%m-%d %H:%M:%S")
+        return column >= since
+
+    def changed_person_ids_stmt(
+        self,
+        since: datetime,
+        scale_models: Iterable[type[Base]],
+        slice_models: Iterable[type[Base]],
+    ) -> Select:
+        """id пациентов, у которых карточка, статусы или любая шкала/срез менялись с since."""
+        parts = [
+            select(Person.id).where(self._changed_since(Person.updated_at, since)),
+            select(PersonScales.person_id).where(self._changed_since(PersonScales.updated_at, since)),
+            select(PersonSlices.person_id).where(self._changed_since(PersonSlices.updated_at, since)),
+        ]
+        for model in scale_models:
+            parts.append(
+                select(PersonScales.person_id)
+                .join(model, model.scales_id == PersonScales.id)
+                .where(self._changed_since(model.updated_at, since))
+            )
+        for model in slice_models:
+            parts.append(
+                select(PersonSlices.person_id)
+                .join(model, model.slices_id == PersonSlices.id)
+                .where(self._changed_since(model.updated_at, since))
+            )
+        return select(union(*parts).subquery().c[0])
+
+    def deleted_person_ids(self, since: datetime) -> list[int]:
+        """id пациентов, удалённых с since (PersonDeletion)."""
+        stmt = (
+            select(PersonDeletion.person_id)
+            .where(self._changed_since(PersonDeletion.deleted_at, since))
+            .distinct()
+            .order_by(PersonDeletion.person_id)
+        )
+        return list(self.session.scalars(stmt))
+
+    def data_version(self, models: Sequence[type[Base]]) -> tuple[datetime, list[tuple]]:
+        """
+        Время БД и (count, max(updated_at)) каждой модели — одним запросом.
+        Вставка и удаление меняют count, правка строки — max(updated_at).
+        """
+        columns = [func.now()]
+        for model in models:
+            columns.append(select(func.count()).select_from(model).scalar_subquery())
+            columns.append(select(func.max(model.updated_at)).scalar_subquery())
+        now, *values = self.session.execute(select(*columns)).one()
+        return now, [tuple(values[i:i + 2]) for i in range(0, len(values), 2)]
+
+    def person_data_version(
+        self,
+        person_id: int,
+        scale_models: Iterable[type[Base]],
+        slice_models: Iterable[type[Base]],
+    ) -> tuple[datetime, int, datetime | None]:
+        """
+        Время БД, число строк и max(updated_at) карточки, статусов и всех
+        шкал/срезов одного пациента — одним запросом.
+        """
+        parts = [
+            select(Person.updated_at).where(Person.id == person_id),
+            select(PersonScales.updated_at).where(PersonScales.person_id == person_id),
+            select(PersonSlices.updated_at).where(PersonSlices.person_id == person_id),
+        ]
+        for model in scale_models:
+            parts.append(
+                select(model.updated_at)
+                .join(PersonScales, model.scales_id == PersonScales.id)
+                .where(PersonScales.person_id == person_id)
+            )
+        for model in slice_models:
+            parts.append(
+                select(model.updated_at)
+                .join(PersonSlices, model.slices_id == PersonSlices.id)
+                .where(PersonSlices.person_id == person_id)
+            )
+        rows = union_all(*parts).subquery()
+        stmt = select(func.now(), func.count(), func.max(rows.c[0])).select_from(rows)
+        return tuple(self.session.execute(stmt).one())
+
+    def db_now(self) -> datetime:
+        return self.session.execute(select(func.now())).scalar_one()
+
+    def get_watermark(self, feed: str) -> ExportWatermark | None:
+        return self.session.get(ExportWatermark, feed)
+
+    def save_watermark(self, feed: str, watermark: datetime, rows: int) -> ExportWatermark:
+        obj = self.get_watermark(feed)
+        if obj is None:
+            obj = ExportWatermark(feed=feed)
+            self.session.add(obj)
+        obj.watermark = watermark
+        obj.rows = rows
+        return obj
+
+    # --- наборы полей ---
+
+    def list_presets(self) -> list[ExportPreset]:
+        return list(self.session.scalars(select(ExportPreset).order_by(ExportPreset.name)))
+
+    def save_preset(self, name: str, selection: dict) -> ExportPreset:
+        obj = self.session.get(ExportPreset, name)
+        if obj is None:
+            obj = ExportPreset(name=name)
+            self.session.add(obj)
+        obj.selection = selection
+        return obj
+
+    def delete_preset(self, name: str) -> bool:
+        obj = self.session.get(ExportPreset, name)
+        if obj is None:
+            return False
+        self.session.delete(obj)
+        return True
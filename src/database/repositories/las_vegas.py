@@ -1,7 +1,7 @@
 from sqlalchemy.orm import Session
 from sqlalchemy import select, delete
 
-from database.models import LasVegasResult
+from database.models import LasVegasResult, PersonScales
 
 
 class LasVegasRepository:
@@ -12,6 +12,14 @@ class LasVegasRepository:
         stmt = select(LasVegasResult).where(LasVegasResult.scales_id == scales_id)
         return self.session.execute(stmt).scalar_one_or_none()
 
+    def get_by_person_id(self, person_id: int) -> LasVegasResult | None:
+        stmt = (
+            select(LasVegasResult)
+            .join(PersonScales, PersonScales.id == LasVegasResult.scales_id)
+            .where(PersonScales.person_id == person_id)
+        )
+        return self.session.execute(stmt).scalar_one_or_none()
+
     def add(self, obj: LasVegasResult) -> LasVegasResult:
         self.session.add(obj)
         return obj
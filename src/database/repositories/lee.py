@@ -2,7 +2,7 @@ from sqlalchemy.orm import Session
 from sqlalchemy import select, delete
 from typing import Optional
 
-from database.models import LeeRcriResult
+from database.models import LeeRcriResult, PersonScales
 
 
 class LeeRcriRepository:
@@ -13,6 +13,14 @@ class LeeRcriRepository:
         stmt = select(LeeRcriResult).where(LeeRcriResult.scales_id == scales_id)
         return self.session.execute(stmt).scalar_one_or_none()
 
+    def get_by_person_id(self, person_id: int) -> Optional[LeeRcriResult]:
+        stmt = (
+            select(LeeRcriResult)
+            .join(PersonScales, PersonScales.id == LeeRcriResult.scales_id)
+            .where(PersonScales.person_id == person_id)
+        )
+        return self.session.execute(stmt).scalar_one_or_none()
+
     def add(self, obj: LeeRcriResult) -> LeeRcriResult:
         self.session.add(obj)
         return obj
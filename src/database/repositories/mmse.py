@@ -1,7 +1,7 @@
 from sqlalchemy.orm import Session
 from sqlalchemy import select, delete
 
-from database.models import MMSEResult
+from database.models import MMSEResult, PersonScales
 
 
 class MMSERepository:
@@ -15,6 +15,17 @@ class MMSERepository:
         )
         return self.session.execute(stmt).scalar_one_or_none()
 
+    def get_by_person_and_time(self, person_id: int, timepoint: int) -> MMSEResult | None:
+        stmt = (
+            select(MMSEResult)
+            .join(PersonScales, PersonScales.id == MMSEResult.scales_id)
+            .where(
+                PersonScales.person_id == person_id,
+                MMSEResult.timepoint == timepoint,
+            )
+        )
+        return self.session.execute(stmt).scalar_one_or_none()
+
     def add(self, obj: MMSEResult) -> MMSEResult:
         self.session.add(obj)
         return obj
@@ -1,8 +1,21 @@
 # database/repositories/person_scales.py
 from sqlalchemy import select, delete
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, joinedload, selectinload
 from database.models import PersonScales
 
+# связи 1:1 PersonScales -> результат шкалы (MMSE — отдельно, 1:N)
+SCALE_RESULT_RELATIONS = (
+    "el_ganzouri",
+    "ariscat",
+    "stopbang",
+    "soba",
+    "lee_rcri",
+    "caprini",
+    "las_vegas",
+    "aldrete",
+    "qor15",
+)
+
 
 class PersonScalesRepository:
     def __init__(self, session: Session):
@@ -16,6 +29,21 @@ class PersonScalesRepository:
         stmt = select(PersonScales).where(PersonScales.person_id == person_id)
         return self.session.execute(stmt).scalar_one_or_none()
 
+    def get_with_results(self, person_id: int) -> PersonScales | None:
+        """
+        PersonScales со всеми результатами: 1:1-шкалы — LEFT JOIN в том же
+        SELECT, MMSE (1:N) — вторым запросом через selectinload.
+        """
+        stmt = (
+            select(PersonScales)
+            .where(PersonScales.person_id == person_id)
+            .options(
+                *(joinedload(getattr(PersonScales, rel)) for rel in SCALE_RESULT_RELATIONS),
+                selectinload(PersonScales.mmse_results),
+            )
+        )
+        return self.session.execute(stmt).unique().scalar_one_or_none()
+
     def add(self, ps: PersonScales) -> PersonScales:
         self.session.add(ps)
         return ps
@@ -0,0 +1,161 @@
+"""
+Нечёткий (с опечатками) поиск пациентов по ФИО и номеру истории.
+
+Документ пациента — нормализованные поля (*_norm) через пробел. Индекс:
+- SQLite: виртуальная таблица FTS5 persons_fts (tokenize=trigram), rowid = id
+  пациента, синхронизируется триггерами на persons; кандидаты выбираются по
+  совпавшим кускам слов (bm25), похожесть досчитывается в Python;
+- Postgres: GIN-индекс pg_trgm по тому же выражению, похожесть —
+  word_similarity() прямо в запросе.
+Без индекса (нет FTS5 или расширения pg_trgm) — тот же подсчёт в Python
+по всем строкам: медленнее, но результат тот же.
+"""
+import re
+import threading
+import weakref
+from typing import Iterable
+
+from sqlalchemy import func, literal_column, select, text
+from sqlalchemy.orm import Session
+
+from database.models import (
+    PERSON_FTS_TABLE as FTS_TABLE,
+    PERSON_TRGM_INDEX as TRGM_INDEX,
+    Person,
+    normalize_search,
+    person_search_document as document_sql,
+)
+
+# порог похожести (как pg_trgm.word_similarity_threshold, но мягче: короткие фамилии с опечаткой)
+SIMILARITY_THRESHOLD = 0.3
+# кандидатов из FTS5 на одну выдачу
+CANDIDATES = 200
+
+_WORD = re.compile(r"\w+")
+
+# индекс создаётся миграциями при старте — проверяется один раз на движок
+_backends: "weakref.WeakKeyDictionary" = weakref.WeakKeyDictionary()
+_backends_lock = threading.Lock()
+
+
+def _trigrams(word: str) -> set[str]:
+    padded = f"  {word} "  # как в pg_trgm: два пробела в начале, один в конце
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+def similarity(query: str, document: str) -> float:
+    """
+    Для каждого слова запроса — лучшая по документу доля общих триграмм
+    (|A ∩ B| / |A ∪ B|, как similarity() в pg_trgm); итог — среднее по словам.
+    """
+    words = _WORD.findall(normalize_search(query) or "")
+    doc = [_trigrams(w) for w in _WORD.findall(document)]
+    if not words or not doc:
+        return 0.0
+    total = 0.0
+    for word in words:
+        tq = _trigrams(word)
+        total += max(len(tq & td) / len(tq | td) for td in doc)
+    return total / len(words)
+
+
+def _phrase(value: str) -> str:
+    return '"' + value.replace('"', '""') + '"'
+
+
+def _fts_queries(query: str) -> tuple[str, str]:
+    """
+    Два запроса кандидатов (документ обрамлён пробелами, поэтому " ив" и "ов " в нём есть):
+    - куски слов по 4 символа как подстроки — опечатка портит только свой кусок,
+      остальные совпадают, а совпадений немного;
+    - любая из триграмм — запасной, для коротких слов (совпадает почти всё).
+    """
+    pieces, grams = set(), set()
+    for word in _WORD.findall(query):
+        padded = f" {word} "
+        grams.update(padded[i:i + 3] for i in range(len(padded) - 2))
+        chunks = [padded[i:i + 4] for i in range(0, len(padded), 4)]
+        if len(chunks) > 1 and len(chunks[-1]) < 3:
+            chunks[-2:] = [chunks[-2] + chunks[-1]]
+        pieces.update(c for c in chunks if len(c) >= 3)
+    return " OR ".join(map(_phrase, sorted(pieces))), " OR ".join(map(_phrase, sorted(grams)))
+
+
+class PersonSearchRepository:
+    def __init__(self, session: Session):
+        self.session = session
+
+    @property
+    def backend(self) -> str | None:
+        """"fts5" / "pg_trgm" — индекс есть; None — поиск перебором."""
+        engine = self.session.get_bind().engine
+        with _backends_lock:
+            if engine not in _backends:
+                _backends[engine] = self._detect_backend(engine.dialect.name)
+            return _backends[engine]
+
+    def _detect_backend(self, dialect: str) -> str | None:
+        if dialect == "sqlite":
+            found = self.session.execute(
+                text("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = :name"),
+                {"name": FTS_TABLE},
+            ).first()
+            return "fts5" if found else None
+        if dialect == "postgresql":
+            found = self.session.execute(
+                text("SELECT 1 FROM pg_indexes WHERE tablename = 'persons' AND indexname = :name"),
+                {"name": TRGM_INDEX},
+            ).first()
+            return "pg_trgm" if found else None
+        return None
+
+    def fuzzy(self, query: str, limit: int = 20) -> list[tuple[int, float]]:
+        """(id пациента, похожесть) по убыванию похожести, не ниже SIMILARITY_THRESHOLD."""
+        query = normalize_search(query) or ""
+        if not _WORD.search(query):
+            return []
+        backend = self.backend
+        if backend == "pg_trgm":
+            return self._pg_trgm(query, limit)
+        if backend == "fts5":
+            sql = text(
+                f"SELECT p.id, p.last_name_norm, p.first_name_norm, {document_sql('p.')} AS doc "
+                f"FROM {FTS_TABLE} JOIN persons p ON p.id = {FTS_TABLE}.rowid "
+                f"WHERE {FTS_TABLE} MATCH :match ORDER BY {FTS_TABLE}.rank LIMIT :candidates"
+            )
+            rows = []
+            for match in _fts_queries(query):
+                rows = self.session.execute(sql, {"match": match, "candidates": max(CANDIDATES, limit)}).all()
+                if len(rows) >= limit:
+                    break
+        else:
+            document = literal_column(document_sql())
+            rows = self.session.execute(
+                select(Person.id, Person.last_name_norm, Person.first_name_norm, document)
+            )
+        return self._rank(query, rows, limit)
+
+    @staticmethod
+    def _rank(query: str, rows: Iterable, limit: int) -> list[tuple[int, float]]:
+        scored = []
+        for person_id, last_name, first_name, doc in rows:
+            score = similarity(query, doc)
+            if score >= SIMILARITY_THRESHOLD:
+                scored.append((-score, last_name or "", first_name or "", person_id))
+        scored.sort()
+        return [(person_id, -score) for score, _, _, person_id in scored[:limit]]
+
+    def _pg_trgm(self, query: str, limit: int) -> list[tuple[int, float]]:
+        document = literal_column(document_sql())
+        # порог оператора <% действует в пределах транзакции
+        self.session.execute(
+            select(func.set_config("pg_trgm.word_similarity_threshold", str(SIMILARITY_THRESHOLD), True))
+        )
+        score = func.word_similarity(query, document)
+        stmt = (
+            select(Person.id, score)
+            .where(text(f":q <% ({document_sql()})").bindparams(q=query))
+            .order_by(score.desc(), Person.last_name_norm, Person.first_name_norm, Person.id)
+            .limit(limit)
+        )
+        return [(person_id, float(value)) for person_id, value in self.session.execute(stmt)]
@@ -1,10 +1,42 @@
-from typing import Sequence
+from typing import List, Sequence
 from datetime import date
 
-from sqlalchemy import select, delete
-from sqlalchemy.orm import Session
+from sqlalchemy import ColumnElement, Date, and_, cast, delete, extract, false, func, select, tuple_
+from sqlalchemy.orm import Session, joinedload, selectinload
 
-from database.models import Person
+from database.models import Person, PersonDeletion, PersonScales, PersonSlices, normalize_search
+from database.repositories.person_scales import SCALE_RESULT_RELATIONS
+
+
+# порядок выдачи поиска и ключ keyset-курсора (индекс ix_persons_search_order)
+SEARCH_ORDER = (Person.last_name, Person.first_name, Person.id)
+SearchCursor = tuple[str, str, int]
+# prefix — с начала значения (диапазон по индексу), infix — в любом месте
+SEARCH_MATCHES = ("prefix", "infix")
+
+
+def _ymd(column) -> ColumnElement:
+    # дата как число ГГГГММДД: (ref - birth) // 10000 — полные годы, как Person.age
+    return extract("year", column) * 10000 + extract("month", column) * 100 + extract("day", column)
+
+
+def _text_condition(column, value: str | None, match: str) -> ColumnElement | None:
+    """Условие по нормализованной колонке <поле>_norm; пустой запрос — без условия."""
+    value = normalize_search(value)
+    if not value:
+        return None
+    if match == "infix":
+        return column.contains(value, autoescape=True)
+    # строки с префиксом value — ровно [value, value с увеличенным последним символом)
+    return and_(column >= value, column < value[:-1] + chr(ord(value[-1]) + 1))
+
+
+# всё, что читает PersonRead (флаги шкал/срезов, MMSE), — отдельными SELECT … IN
+# на весь список: без N+1, а порядок и LIMIT основного запроса не меняются
+_READ_OPTIONS = (
+    selectinload(Person.scales).selectinload(PersonScales.mmse_results),
+    selectinload(Person.slices),
+)
 
 
 class PersonsRepository:
@@ -22,6 +54,37 @@ class PersonsRepository:
     def get(self, person_id: int) -> Person | None:
         return self.session.get(Person, person_id)
 
+    def get_with_details(self, person_id: int, *, results: bool = False) -> Person | None:
+        """
+        Пациент с флагами шкал/срезов (JOIN) и MMSE (selectinload) — 2 запроса.
+        results=True — ещё результаты шкал в том же JOIN и все срезы T0–T12
+        одним дополнительным запросом (итого 3).
+        """
+        scales = joinedload(Person.scales)
+        options = [scales.selectinload(PersonScales.mmse_results)]
+        if results:
+            options += [scales.joinedload(getattr(PersonScales, rel)) for rel in SCALE_RESULT_RELATIONS]
+            # срезы отдельным SELECT: в одном JOIN со шкалами строка вышла бы
+            # около тысячи колонок
+            slices = selectinload(Person.slices)
+            options += [slices.joinedload(getattr(PersonSlices, f"t{t}")) for t in range(13)]
+        else:
+            options.append(joinedload(Person.slices))
+        stmt = select(Person).where(Person.id == person_id).options(*options)
+        return self.session.execute(stmt).unique().scalar_one_or_none()
+
+    def get_many(self, person_ids: Sequence[int]) -> dict[int, Person]:
+        stmt = select(Person).where(Person.id.in_(person_ids)).options(*_READ_OPTIONS)
+        return {p.id: p for p in self.session.execute(stmt).scalars()}
+
+    def index_rows(self) -> list[tuple]:
+        """Поля для индекса подсказок (database.person_index) — Core-строки без ORM."""
+        stmt = select(
+            Person.id, Person.last_name, Person.first_name, Person.patronymic,
+            Person.card_number, Person.birth_date,
+        )
+        return [tuple(row) for row in self.session.execute(stmt)]
+
     def list(self, limit: int = 100, offset: int = 0) -> Sequence[Person]:
         stmt = select(Person).offset(offset).limit(limit)
         return self.session.execute(stmt).scalars().all()
@@ -37,9 +100,11 @@ class PersonsRepository:
     def delete(self, person_id: int) -> int:
         stmt = delete(Person).where(Person.id == person_id)
         res = self.session.execute(stmt)
+        if res.rowcount:
+            self.session.add(PersonDeletion(person_id=person_id))
         return res.rowcount or 0
 
-    def search(
+    def _search_conditions(
         self,
         *,
         last_name: str | None = None,
@@ -48,24 +113,87 @@ class PersonsRepository:
         age: int | None = None,
         card_number: str | None = None,
         inclusion_date: date | None = None,
+        match: str = "infix",
+    ) -> List[ColumnElement]:
+        if match not in SEARCH_MATCHES:
+            raise ValueError(f"Unknown match mode: {match}")
+        texts = {
+            Person.last_name_norm: last_name,
+            Person.first_name_norm: first_name,
+            Person.patronymic_norm: patronymic,
+            Person.card_number_norm: card_number,
+        }
+        conditions = []
+        for column, value in texts.items():
+            condition = _text_condition(column, value, match)
+            if condition is not None:
+                conditions.append(condition)
+        if inclusion_date:
+            conditions.append(Person.inclusion_date == inclusion_date)
+        if age is not None:
+            conditions.append(self._age_condition(age, inclusion_date))
+        return conditions
+
+    def search(
+        self,
+        *,
         limit: int = 50,
         offset: int = 0,
+        after: SearchCursor | None = None,
+        before: SearchCursor | None = None,
+        **filters,
     ) -> Sequence[Person]:
-        """Поиск пациентов по различным полям."""
-        stmt = select(Person)
-        if last_name:
-            stmt = stmt.where(Person.last_name.ilike(f"%{last_name}%"))
-        if first_name:
-            stmt = stmt.where(Person.first_name.ilike(f"%{first_name}%"))
-        if patronymic:
-            stmt = stmt.where(Person.patronymic.ilike(f"%{patronymic}%"))
-        if card_number:
-            stmt = stmt.where(Person.card_number.ilike(f"%{card_number}%"))
-        if inclusion_date:
-            stmt = stmt.where(Person.inclusion_date == inclusion_date)
+        """
+        Поиск пациентов по различным полям в порядке (фамилия, имя, id).
+        ФИО и номер истории сравниваются без учёта регистра и ё/е (колонки *_norm),
+        match — с начала значения или в любом месте.
+        after/before — ключ соседней записи (keyset): страница после неё или
+        перед ней; стоимость не зависит от номера страницы, в отличие от offset.
+        """
+        key = tuple_(*SEARCH_ORDER)
+        stmt = select(Person).where(*self._search_conditions(**filters)).options(*_READ_OPTIONS)
+        if before is not None:
+            # страницу перед курсором читаем в обратном порядке и разворачиваем
+            stmt = stmt.where(key < tuple_(*before)).order_by(*(c.desc() for c in SEARCH_ORDER))
+            persons = self.session.execute(stmt.offset(offset).limit(limit)).scalars().all()
+            return persons[::-1]
+        if after is not None:
+            stmt = stmt.where(key > tuple_(*after))
+        stmt = stmt.order_by(*(c.asc() for c in SEARCH_ORDER)).offset(offset).limit(limit)
+        return self.session.execute(stmt).scalars().all()
 
-        stmt = stmt.order_by(Person.last_name.asc(), Person.first_name.asc())
-        persons = self.session.execute(stmt).scalars().all()
-        if age is not None:
-            persons = [p for p in persons if p.age == age]
-        return persons[offset : offset + limit]
+    def count(self, **filters) -> int:
+        stmt = select(func.count()).select_from(Person).where(*self._search_conditions(**filters))
+        return self.session.execute(stmt).scalar_one()
+
+    def _age_condition(self, age: int, inclusion_date: date | None) -> ColumnElement:
+        """
+        Возраст на дату включения в SQL. Окно по birth_date с точностью до года
+        (от самой ранней до самой поздней даты включения) идёт по индексу,
+        точное условие проверяется только для строк внутри окна. Без
+        inclusion_date границы окна — подзапросы min/max в том же запросе.
+        """
+        if age < 0:
+            return false()
+        if inclusion_date is None:
+            low = self._years_back(select(func.min(Person.inclusion_date)).scalar_subquery(), age + 1, end=False)
+            high = self._years_back(select(func.max(Person.inclusion_date)).scalar_subquery(), age, end=True)
+        elif inclusion_date.year - age < 1:
+            return false()
+        else:
+            low = date(max(inclusion_date.year - age - 1, 1), 1, 1)
+            high = date(inclusion_date.year - age, 12, 31)
+        years = _ymd(Person.inclusion_date) - _ymd(Person.birth_date)
+        return and_(
+            Person.birth_date.between(low, high),
+            years.between(age * 10000, age * 10000 + 9999),
+        )
+
+    def _years_back(self, value: ColumnElement, years: int, end: bool) -> ColumnElement:
+        """Начало (end=False) или конец года даты value минус years лет — в SQL."""
+        if self.session.get_bind().dialect.name == "sqlite":
+            shift = ("+1 year", "-1 day") if end else ()
+            return func.date(value, f"-{years} years", "start of year", *shift)
+        # конец года: на год меньше и минус день — make_interval(лет, месяцев, недель, дней)
+        shift = func.make_interval(years - 1, 0, 0, 1) if end else func.make_interval(years)
+        return cast(func.date_trunc("year", value) - shift, Date)
@@ -0,0 +1,88 @@
+"""
+COPY для Postgres (драйвер psycopg 3): чтение COPY (SELECT …) TO STDOUT и
+загрузка COPY … FROM STDIN без построчной обработки запросов SQLAlchemy.
+Значения проходят через те же bind/result-процессоры типов (Enum и т. п.),
+что и в обычных запросах. На других СУБД и драйверах copy_supported() ложно —
+репозитории остаются на обычных SELECT и executemany.
+"""
+from typing import Iterable, Iterator, Sequence
+
+from sqlalchemy import Boolean, Column, Date, DateTime, Enum as SAEnum, Float, Integer, Select, Time
+from sqlalchemy.orm import Session
+
+
+def copy_supported(session: Session) -> bool:
+    dialect = session.get_bind().dialect
+    return dialect.name == "postgresql" and dialect.driver == "psycopg"
+
+
+def _copy_type(sa_type) -> str:
+    # текстовый COPY: тип нужен только чтобы разобрать значение в Python
+    if isinstance(sa_type, SAEnum):
+        return "text"
+    if isinstance(sa_type, Boolean):
+        return "bool"
+    if isinstance(sa_type, Integer):
+        return "int8"
+    if isinstance(sa_type, Float):
+        return "float8"
+    if isinstance(sa_type, DateTime):
+        return "timestamptz" if sa_type.timezone else "timestamp"
+    if isinstance(sa_type, Date):
+        return "date"
+    if isinstance(sa_type, Time):
+        return "time"
+    return "text"
+
+
+def _cursor(session: Session):
+    # соединение и транзакция сессии — COPY видит тот же снимок и незафиксированные изменения
+    return session.connection().connection.driver_connection.cursor()
+
+
+def copy_rows(session: Session, stmt: Select, chunk_size: int) -> Iterator[list[tuple]]:
+    """Строки stmt порциями по chunk_size через COPY (SELECT …) TO STDOUT."""
+    dialect = session.get_bind().dialect
+    compiled = stmt.compile(dialect=dialect, compile_kwargs={"render_postcompile": True})
+    columns = list(stmt.selected_columns)
+    processors = [
+        (i, proc) for i, proc in enumerate(c.type.result_processor(dialect, None) for c in columns)
+        if proc is not None
+    ]
+    with _cursor(session) as cursor:
+        with cursor.copy(f"COPY ({compiled.string}) TO STDOUT", compiled.params) as copy:
+            copy.set_types([_copy_type(c.type) for c in columns])
+            try:
+                chunk = []
+                for row in copy.rows():
+                    if processors:
+                        row = list(row)
+                        for i, proc in processors:
+                            row[i] = proc(row[i])
+                        row = tuple(row)
+                    chunk.append(row)
+                    if len(chunk) == chunk_size:
+                        yield chunk
+                        chunk = []
+                if chunk:
+                    yield chunk
+            finally:
+                # недочитанный COPY (отмена выгрузки) держит соединение занятым
+                while copy.read():
+                    pass
+
+
+def copy_in(
+    session: Session, table_name: str, columns: Sequence[Column], rows: Iterable[Sequence]
+) -> None:
+    """Загрузка строк (значения в порядке columns) в table_name через COPY … FROM STDIN."""
+    dialect = session.get_bind().dialect
+    quote = dialect.identifier_preparer.quote
+    processors = [c.type.bind_processor(dialect) for c in columns]
+    sql = f"COPY {quote(table_name)} ({', '.join(quote(c.name) for c in columns)}) FROM STDIN"
+    with _cursor(session) as cursor, cursor.copy(sql) as copy:
+        for row in rows:
+            copy.write_row([
+                proc(value) if proc is not None and value is not None else value
+                for proc, value in zip(processors, row)
+            ])
@@ -1,7 +1,7 @@
 from sqlalchemy.orm import Session
 from sqlalchemy import select, delete
 
-from database.models import Qor15Result
+from database.models import Qor15Result, PersonScales
 
 
 class Qor15Repository:
@@ -12,6 +12,14 @@ class Qor15Repository:
         stmt = select(Qor15Result).where(Qor15Result.scales_id == scales_id)
         return self.session.execute(stmt).scalar_one_or_none()
 
+    def get_by_person_id(self, person_id: int) -> Qor15Result | None:
+        stmt = (
+            select(Qor15Result)
+            .join(PersonScales, PersonScales.id == Qor15Result.scales_id)
+            .where(PersonScales.person_id == person_id)
+        )
+        return self.session.execute(stmt).scalar_one_or_none()
+
     def add(self, obj: Qor15Result) -> Qor15Result:
         self.session.add(obj)
         return obj
@@ -0,0 +1,74 @@
+from typing import Iterable, Iterator, Sequence
+
+from sqlalchemy import Row, delete, select
+from sqlalchemy.orm import Session
+
+from database.models import Base, PersonSlices
+
+
+class SliceRepository:
+    """Общий репозиторий для таблиц срезов slice_t0 … slice_t12."""
+
+    # ограничение на число параметров в IN (SQLite: 32766)
+    IN_CHUNK = 1000
+
+    def __init__(self, session: Session, model: type[Base]):
+        self.session = session
+        self.model = model
+
+    def get_by_slices_id(self, slices_id: int):
+        stmt = select(self.model).where(self.model.slices_id == slices_id)
+        return self.session.execute(stmt).scalar_one_or_none()
+
+    def get_by_person_id(self, person_id: int):
+        stmt = (
+            select(self.model)
+            .join(PersonSlices, PersonSlices.id == self.model.slices_id)
+            .where(PersonSlices.person_id == person_id)
+        )
+        return self.session.execute(stmt).scalar_one_or_none()
+
+    def iter_by_person_ids(self, person_ids: Iterable[int] | None) -> Iterator[tuple[int, object]]:
+        """
+        Пары (person_id, строка среза) для набора пациентов.
+        person_ids=None — все пациенты; иначе запросы идут пачками по IN_CHUNK.
+        """
+        return self._by_person_ids(select(PersonSlices.person_id, self.model), person_ids)
+
+    def iter_rows_by_person_ids(
+        self, person_ids: Iterable[int] | None, columns: Sequence[str]
+    ) -> Iterator[Row]:
+        """
+        То же без ORM: Core-строки (person_id, *columns) — без identity map,
+        отслеживания изменений и загрузки атрибутов.
+        """
+        table = self.model.__table__
+        stmt = select(PersonSlices.person_id, *(table.c[name] for name in columns))
+        return self._by_person_ids(stmt, person_ids)
+
+    def _by_person_ids(self, stmt, person_ids: Iterable[int] | None) -> Iterator[Row]:
+        stmt = stmt.join(PersonSlices, PersonSlices.id == self.model.slices_id)
+        if person_ids is None:
+            yield from self.session.execute(stmt).tuples()
+            return
+        ids = sorted(set(person_ids))
+        for i in range(0, len(ids), self.IN_CHUNK):
+            chunk = ids[i:i + self.IN_CHUNK]
+            yield from self.session.execute(
+                stmt.where(PersonSlices.person_id.in_(chunk))
+            ).tuples()
+
+    def add(self, obj):
+        self.session.add(obj)
+        return obj
+
+    def update_fields(self, obj, **fields):
+        for k, v in fields.items():
+            if v is not None:
+                setattr(obj, k, v)
+        return obj
+
+    def delete_by_slices_id(self, slices_id: int) -> int:
+        stmt = delete(self.model).where(self.model.slices_id == slices_id)
+        res = self.session.execute(stmt)
+        return res.rowcount or 0
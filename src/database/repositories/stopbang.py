@@ -1,7 +1,7 @@
 from sqlalchemy.orm import Session
 from sqlalchemy import select, delete
 
-from database.models import StopBangResult
+from database.models import StopBangResult, PersonScales
 
 
 class StopBangRepository:
@@ -12,6 +12,14 @@ class StopBangRepository:
         stmt = select(StopBangResult).where(StopBangResult.scales_id == scales_id)
         return self.session.execute(stmt).scalar_one_or_none()
 
+    def get_by_person_id(self, person_id: int) -> StopBangResult | None:
+        stmt = (
+            select(StopBangResult)
+            .join(PersonScales, PersonScales.id == StopBangResult.scales_id)
+            .where(PersonScales.person_id == person_id)
+        )
+        return self.session.execute(stmt).scalar_one_or_none()
+
     def add(self, obj: StopBangResult) -> StopBangResult:
         self.session.add(obj)
         return obj
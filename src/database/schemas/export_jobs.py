@@ -0,0 +1,33 @@
+from datetime import datetime
+from typing import Literal, Optional
+
+from pydantic import BaseModel
+
+JobStatus = Literal["queued", "running", "done", "failed", "cancelled"]
+ExportLayout = Literal["wide", "long"]
+
+
+class ExportJobRead(BaseModel):
+    id: str
+    tables: dict[str, Optional[list[str]]] | list[str]  # выбор таблиц/полей (Selection)
+    fmt: str
+    layout: ExportLayout = "wide"  # long — срезы строкой на значение
+    status: JobStatus = "queued"
+    rows_done: int = 0  # в процессе — строк источника, по готовности — строк в файле
+    rows_total: Optional[int] = None
+    path: Optional[str] = None  # готовый файл, только для status == "done"
+    error: Optional[str] = None
+    cached: bool = False  # файл взят из кэша выгрузок без повторного расчёта
+    created_at: datetime
+    finished_at: Optional[datetime] = None
+
+    @property
+    def progress(self) -> float:
+        if not self.rows_total:
+            return 1.0 if self.status == "done" else 0.0
+        return min(1.0, self.rows_done / self.rows_total)
+
+    @property
+    def file_name(self) -> str:
+        prefix = "slices_long" if self.layout == "long" else "patients_export"
+        return f"{prefix}_{self.created_at:%Y%m%d_%H%M%S}.{self.fmt}"
@@ -1,6 +1,15 @@
 from typing import Optional
 from pydantic import BaseModel, ConfigDict
+from database.schemas.aldrete import AldreteRead
+from database.schemas.ariscat import AriscatRead
+from database.schemas.caprini import CapriniRead
+from database.schemas.elganzouri import ElGanzouriRead
+from database.schemas.las_vegas import LasVegasRead
+from database.schemas.lee import LeeRcriRead
 from database.schemas.mmse import MMSEResultRead
+from database.schemas.qor15 import Qor15Read
+from database.schemas.soba import SobaRead
+from database.schemas.stopbang import StopBangRead
 
 
 class PersonScalesRead(BaseModel):
@@ -33,3 +42,19 @@ class PersonScalesUpdate(BaseModel):
     mmse_t10_filled: Optional[bool] = None
     aldrete_filled: Optional[bool] = None
     qor15_filled: Optional[bool] = None
+
+
+class PersonScalesResults(BaseModel):
+    """Все результаты шкал пациента; None — шкала не заполнена."""
+
+    el_ganzouri: ElGanzouriRead | None = None
+    ariscat: AriscatRead | None = None
+    stopbang: StopBangRead | None = None
+    soba: SobaRead | None = None
+    lee_rcri: LeeRcriRead | None = None
+    caprini: CapriniRead | None = None
+    las_vegas: LasVegasRead | None = None
+    aldrete: AldreteRead | None = None
+    qor15: Qor15Read | None = None
+    mmse_t0: MMSEResultRead | None = None
+    mmse_t10: MMSEResultRead | None = None
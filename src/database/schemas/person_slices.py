@@ -1,6 +1,20 @@
 from typing import Optional
 
-from pydantic import BaseModel
+from pydantic import BaseModel, ConfigDict
+
+from database.schemas.slice_t0 import SliceT0Read
+from database.schemas.slice_t1 import SliceT1Read
+from database.schemas.slice_t2 import SliceT2Read
+from database.schemas.slice_t3 import SliceT3Read
+from database.schemas.slice_t4 import SliceT4Read
+from database.schemas.slice_t5 import SliceT5Read
+from database.schemas.slice_t6 import SliceT6Read
+from database.schemas.slice_t7 import SliceT7Read
+from database.schemas.slice_t8 import SliceT8Read
+from database.schemas.slice_t9 import SliceT9Read
+from database.schemas.slice_t10 import SliceT10Read
+from database.schemas.slice_t11 import SliceT11Read
+from database.schemas.slice_t12 import SliceT12Read
 
 
 class PersonSlicesRead(BaseModel):
@@ -37,3 +51,22 @@ class PersonSlicesUpdate(BaseModel):
     t11_filled: Optional[bool] = None
     t12_filled: Optional[bool] = None
 
+
+class PersonSlicesResults(BaseModel):
+    """Данные всех срезов пациента; None — срез не заполнен."""
+
+    model_config = ConfigDict(from_attributes=True)
+
+    t0: SliceT0Read | None = None
+    t1: SliceT1Read | None = None
+    t2: SliceT2Read | None = None
+    t3: SliceT3Read | None = None
+    t4: SliceT4Read | None = None
+    t5: SliceT5Read | None = None
+    t6: SliceT6Read | None = None
+    t7: SliceT7Read | None = None
+    t8: SliceT8Read | None = None
+    t9: SliceT9Read | None = None
+    t10: SliceT10Read | None = None
+    t11: SliceT11Read | None = None
+    t12: SliceT12Read | None = None
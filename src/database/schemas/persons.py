@@ -1,11 +1,11 @@
 from pydantic import BaseModel, Field
 
-from typing import Optional
+from typing import List, Optional
 from datetime import date
 
 from database.enums.anesthesia import AnesthesiaType
-from database.schemas.person_scales import PersonScalesRead
-from database.schemas.person_slices import PersonSlicesRead
+from database.schemas.person_scales import PersonScalesRead, PersonScalesResults
+from database.schemas.person_slices import PersonSlicesRead, PersonSlicesResults
 
 
 # ----- базовые -----
@@ -48,3 +48,33 @@ class PersonRead(PersonBase):
 
     class Config:
         from_attributes = True
+
+
+class PatientBundle(BaseModel):
+    """
+    Снимок пациента для страниц: карточка с флагами заполненности,
+    результаты всех шкал и данные всех срезов.
+    В варианте header_only заполнена только карточка (scales/slices = None).
+    """
+
+    person: PersonRead
+    scales: Optional[PersonScalesResults] = None
+    slices: Optional[PersonSlicesResults] = None
+
+
+class PersonSearchPage(BaseModel):
+    """
+    Страница поиска. Курсоры — ключ (фамилия, имя, id) крайней записи страницы:
+    next_cursor передаётся как after, prev_cursor — как before; None — страницы нет.
+    """
+
+    items: List[PersonRead]
+    next_cursor: Optional[tuple[str, str, int]] = None
+    prev_cursor: Optional[tuple[str, str, int]] = None
+
+
+class PersonSearchHit(BaseModel):
+    """Результат нечёткого поиска: пациент и похожесть запроса на его ФИО/номер (0…1)."""
+
+    person: PersonRead
+    similarity: float
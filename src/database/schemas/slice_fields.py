@@ -0,0 +1,840 @@
+"""
+Поля срезов T0–T12 в порядке форм: (поле, подпись, единица, тип поля формы).
+
+Общие для форм Streamlit (frontend/tN.py) и длинной выгрузки срезов.
+"""
+
+SLICE_T0_FIELDS = [
+    ("date", "Дата", "", "date"),
+    ("time", "Время", "", "time"),
+    ("rr_spont", "ЧД спонтан", "вдох/мин", "float"),
+    ("fev1", "ОФВ1", "л", "float"),
+    ("fvc", "ФЖЕЛ", "л", "float"),
+    ("frc", "ФОЕ", "л", "float"),
+    ("tlc", "ОЕЛ", "л", "float"),
+    ("rv", "ООЛ", "л", "float"),
+    ("fev1_fvc", "ОФВ1/ФЖЕЛ", "%", "float"),
+    ("pef", "ПОС", "л/с", "float"),
+    ("mef25", "МОС25", "л/с", "float"),
+    ("mef50", "МОС50", "л/с", "float"),
+    ("mef75", "МОС75", "л/с", "float"),
+    ("fef25_75", "СОС 25-75", "л/с", "float"),
+    ("heart_rate", "ЧСС", "уд/мин", "float"),
+    ("sbp", "АДсис", "мм рт.ст.", "float"),
+    ("dbp", "АДдиас", "мм рт.ст.", "float"),
+    ("map", "АДср", "мм рт.ст.", "float"),
+    ("spo2", "SpO2", "%", "float"),
+    ("urine_ml_per_h", "Диурез мл/ч", "мл/ч", "float"),
+    ("hemoglobin", "Гемоглобин", "г/л", "float"),
+    ("neutrophils", "Нейтрофилы", "%", "float"),
+    ("lymphocytes", "Лимфоциты", "%", "float"),
+    ("hematocrit", "Гематокрит", "%", "float"),
+    ("leukocytes", "Лейкоциты", "10^9/л", "float"),
+    ("bands", "п/я", "%", "float"),
+    ("albumin", "Альбумин", "г/л", "float"),
+    ("creatinine", "Креатинин", "мкмоль/л", "float"),
+    ("gfr", "СКФ", "мл/мин", "float"),
+    ("nlr", "NLR", "", "float"),
+    ("glucose", "Глюкоза крови", "ммоль/л", "float"),
+    ("polo", "ПОЛО", "", "bool"),
+    ("aki", "ОПП", "", "bool"),
+    ("complications", "Осложнения", "", "str"),
+    ("pain_nrs", "Боль/ ЦРШ", "баллы", "float"),
+    ("pain_nrs_min", "Боль/ ЦРШ Мин", "баллы", "float"),
+    ("pain_nrs_max", "Боль/ ЦРШ Макс", "баллы", "float"),
+    ("nausea_vomiting", "Тошнота/рвота", "", "bool"),
+    ("aldrete_score", "Шкала Aldrete", "баллы", "float"),
+    ("aldrete_time", "Время достижения Aldrete 9-10 б.", "мин", "float"),
+    ("t_activation", "t активизации", "ч", "float"),
+    ("t_peristalsis", "t восс. перистал.", "ч", "float"),
+    ("t_first_gas", "t отхожд. газов", "ч", "float"),
+    ("opioid_consumption", "Расход опиатов", "мг", "float"),
+    ("urinary_catheter_pain", "Боль мочев кат", "баллы", "float"),
+    ("t_in_aro", "t в АРО", "ч", "float"),
+    ("t_intense_pain", "t интенсив. боли", "ч", "float"),
+    ("t_restore_frc", "t восс. ФОЕ", "ч", "float"),
+    ("t_restore_gfr", "t восс. СКФ", "ч", "float"),
+    ("t_in_ward", "t в стационаре", "ч", "float"),
+    ("qor15", "QoR-15", "баллы", "float"),
+    ("satisfied", "Удовлетворен.", "", "bool"),
+]
+
+SLICE_T1_FIELDS = [
+    ("date", "Дата", "", "date"),
+    ("time", "Время", "", "time"),
+    ("rr_spont", "ЧД спонтан", "вдох/мин", "float"),
+    ("heart_rate", "ЧСС", "уд/мин", "float"),
+    ("sbp", "АДсис", "мм рт.ст.", "float"),
+    ("dbp", "АДдиас", "мм рт.ст.", "float"),
+    ("map", "АДср", "мм рт.ст.", "float"),
+    ("spo2", "SpO2", "%", "float"),
+    ("urine_ml_per_h", "Диурез мл/ч", "мл/ч", "float"),
+    ("hemoglobin", "Гемоглобин", "г/л", "float"),
+    ("stroke_volume", "УО", "мл", "float"),
+    ("cardiac_index", "СИ", "л/мин/м²", "float"),
+    ("svri", "ИОПСС", "дин·с·см⁻⁵·м²", "float"),
+    ("cao", "СаО", "мл/дл", "float"),
+    ("do2", "DO2", "мл/мин", "float"),
+    ("vbd", "ВБД", "", "float"),
+    ("fio2", "FiO2", "%", "float"),
+    ("uzl_score", "Балл УЗЛ", "баллы", "float"),
+    ("ph_arterial", "pH артер.", "", "float"),
+    ("be_arterial", "BE артер.", "ммоль/л", "float"),
+    ("hco3_arterial", "HCO3 артер.", "ммоль/л", "float"),
+    ("lactate_arterial", "Лактат артер.", "ммоль/л", "float"),
+    ("pao2", "РаО2", "мм рт.ст.", "float"),
+    ("pao2_fio2", "РаО2/FiO2", "", "float"),
+    ("paco2", "РаСО2", "мм рт.ст.", "float"),
+    ("sao2", "SаO2", "%", "float"),
+    ("polo", "ПОЛО", "", "bool"),
+    ("aki", "ОПП", "", "bool"),
+    ("complications", "Осложнения", "", "str"),
+    ("pain_nrs", "Боль/ ЦРШ", "баллы", "float"),
+    ("pain_nrs_min", "Боль/ ЦРШ Мин", "баллы", "float"),
+    ("pain_nrs_max", "Боль/ ЦРШ Макс", "баллы", "float"),
+    ("nausea_vomiting", "Тошнота/рвота", "", "bool"),
+    ("aldrete_score", "Шкала Aldrete", "баллы", "float"),
+    ("aldrete_time", "Время достижения Aldrete 9-10 б.", "мин", "float"),
+    ("t_activation", "t активизации", "ч", "float"),
+    ("t_peristalsis", "t восс. перистал.", "ч", "float"),
+    ("t_first_gas", "t отхожд. газов", "ч", "float"),
+    ("opioid_consumption", "Расход опиатов", "мг", "float"),
+    ("urinary_catheter_pain", "Боль мочев кат", "баллы", "float"),
+    ("t_in_aro", "t в АРО", "ч", "float"),
+    ("t_intense_pain", "t интенсив. боли", "ч", "float"),
+    ("t_restore_frc", "t восс. ФОЕ", "ч", "float"),
+    ("t_restore_gfr", "t восс. СКФ", "ч", "float"),
+    ("t_in_ward", "t в стационаре", "ч", "float"),
+    ("qor15", "QoR-15", "баллы", "float"),
+    ("satisfied", "Удовлетворен.", "", "bool"),
+]
+
+SLICE_T2_FIELDS = [
+    ("date", "Дата", "", "date"),
+    ("time", "Время", "", "time"),
+    ("heart_rate", "ЧСС", "уд/мин", "float"),
+    ("sbp", "АДсис", "мм рт.ст.", "float"),
+    ("dbp", "АДдиас", "мм рт.ст.", "float"),
+    ("map", "АДср", "мм рт.ст.", "float"),
+    ("spo2", "SpO2", "%", "float"),
+    ("stroke_volume", "УО", "мл", "float"),
+    ("cardiac_index", "СИ", "л/мин/м²", "float"),
+    ("svri", "ИОПСС", "дин·с·см⁻⁵·м²", "float"),
+    ("cao", "СаО", "мл/дл", "float"),
+    ("do2", "DO2", "мл/мин", "float"),
+    ("vbd", "ВБД", "", "float"),
+    ("fio2", "FiO2", "%", "float"),
+    ("uzl_score", "Балл УЗЛ", "баллы", "float"),
+    ("pin_prick", "Рin-prick", "", "bool"),
+    ("cold_test", "Cold-test", "", "bool"),
+    ("motor_block", "Моторный блок", "", "bool"),
+    ("polo", "ПОЛО", "", "bool"),
+    ("aki", "ОПП", "", "bool"),
+    ("complications", "Осложнения", "", "str"),
+    ("pain_nrs", "Боль/ ЦРШ", "баллы", "float"),
+    ("pain_nrs_min", "Боль/ ЦРШ Мин", "баллы", "float"),
+    ("pain_nrs_max", "Боль/ ЦРШ Макс", "баллы", "float"),
+    ("nausea_vomiting", "Тошнота/рвота", "", "bool"),
+    ("aldrete_score", "Шкала Aldrete", "баллы", "float"),
+    ("aldrete_time", "Время достижения Aldrete 9-10 б.", "мин", "float"),
+    ("t_activation", "t активизации", "ч", "float"),
+    ("t_peristalsis", "t восс. перистал.", "ч", "float"),
+    ("t_first_gas", "t отхожд. газов", "ч", "float"),
+    ("opioid_consumption", "Расход опиатов", "мг", "float"),
+    ("urinary_catheter_pain", "Боль мочев кат", "баллы", "float"),
+    ("t_in_aro", "t в АРО", "ч", "float"),
+    ("t_intense_pain", "t интенсив. боли", "ч", "float"),
+    ("t_restore_frc", "t восс. ФОЕ", "ч", "float"),
+    ("t_restore_gfr", "t восс. СКФ", "ч", "float"),
+    ("t_in_ward", "t в стационаре", "ч", "float"),
+    ("qor15", "QoR-15", "баллы", "float"),
+    ("satisfied", "Удовлетворен.", "", "bool"),
+]
+
+SLICE_T3_FIELDS = [
+    ("date", "Дата", "", "date"),
+    ("time", "Время", "", "time"),
+    ("heart_rate", "ЧСС", "уд/мин", "float"),
+    ("sbp", "АДсис", "мм рт.ст.", "float"),
+    ("dbp", "АДдиас", "мм рт.ст.", "float"),
+    ("map", "АДср", "мм рт.ст.", "float"),
+    ("spo2", "SpO2", "%", "float"),
+    ("hemoglobin", "Гемоглобин", "г/л", "float"),
+    ("stroke_volume", "УО", "мл", "float"),
+    ("cardiac_index", "СИ", "л/мин/м²", "float"),
+    ("svri", "ИОПСС", "дин·с·см⁻⁵·м²", "float"),
+    ("cao", "СаО", "мл/дл", "float"),
+    ("do2", "DO2", "мл/мин", "float"),
+    ("vbd", "ВБД", "", "float"),
+    ("fio2", "FiO2", "%", "float"),
+    ("etco2", "EtCO2", "мм рт.ст.", "float"),
+    ("vt", "VT", "мл", "float"),
+    ("f", "f", "1/мин", "float"),
+    ("mv", "MV", "л/мин", "float"),
+    ("peep", "PEEP", "см H2O", "float"),
+    ("ppik", "Pпик", "см H2O", "float"),
+    ("rplato", "Рплато", "см H2O", "float"),
+    ("delta_p", "ΔP", "см H2O", "float"),
+    ("cstat", "Сstat", "мл/см H2O", "float"),
+    ("cdyn", "Cdyn", "мл/см H2O", "float"),
+    ("uzl_score", "Балл УЗЛ", "баллы", "float"),
+    ("mac", "МАС", "%", "float"),
+    ("qcon", "qCon", "", "float"),
+    ("qnox", "qNOX", "", "float"),
+    ("emg", "EMG", "", "float"),
+    ("pn_arterial", "Pн артер.", "мм рт.ст.", "float"),
+    ("be_arterial", "BE артер.", "ммоль/л", "float"),
+    ("hco3_arterial", "HCO3 артер.", "ммоль/л", "float"),
+    ("lactate_arterial", "Лактат артер.", "ммоль/л", "float"),
+    ("pao2", "РаО2", "мм рт.ст.", "float"),
+    ("pao2_fio2", "РаО2/FiO2", "", "float"),
+    ("paco2", "РаСО2", "мм рт.ст.", "float"),
+    ("sao2", "SаO2", "%", "float"),
+    ("polo", "ПОЛО", "", "bool"),
+    ("aki", "ОПП", "", "bool"),
+    ("complications", "Осложнения", "", "str"),
+    ("pain_nrs", "Боль/ ЦРШ", "баллы", "float"),
+    ("pain_nrs_min", "Боль/ ЦРШ Мин", "баллы", "float"),
+    ("pain_nrs_max", "Боль/ ЦРШ Макс", "баллы", "float"),
+    ("nausea_vomiting", "Тошнота/рвота", "", "bool"),
+    ("aldrete_score", "Шкала Aldrete", "баллы", "float"),
+    ("aldrete_time", "Время достижения Aldrete 9-10 б.", "мин", "float"),
+    ("t_activation", "t активизации", "ч", "float"),
+    ("t_peristalsis", "t восс. перистал.", "ч", "float"),
+    ("t_first_gas", "t отхожд. газов", "ч", "float"),
+    ("opioid_consumption", "Расход опиатов", "мг", "float"),
+    ("urinary_catheter_pain", "Боль мочев кат", "баллы", "float"),
+    ("t_in_aro", "t в АРО", "ч", "float"),
+    ("t_intense_pain", "t интенсив. боли", "ч", "float"),
+    ("t_restore_frc", "t восс. ФОЕ", "ч", "float"),
+    ("t_restore_gfr", "t восс. СКФ", "ч", "float"),
+    ("t_in_ward", "t в стационаре", "ч", "float"),
+    ("qor15", "QoR-15", "баллы", "float"),
+    ("satisfied", "Удовлетворен.", "", "bool"),
+]
+
+SLICE_T4_FIELDS = [
+    ("date", "Дата", "", "date"),
+    ("time", "Время", "", "time"),
+    ("heart_rate", "ЧСС", "уд/мин", "float"),
+    ("sbp", "АДсис", "мм рт.ст.", "float"),
+    ("dbp", "АДдиас", "мм рт.ст.", "float"),
+    ("map", "АДср", "мм рт.ст.", "float"),
+    ("spo2", "SpO2", "%", "float"),
+    ("stroke_volume", "УО", "мл", "float"),
+    ("cardiac_index", "СИ", "л/мин/м²", "float"),
+    ("svri", "ИОПСС", "дин·с·см⁻⁵·м²", "float"),
+    ("cao", "СаО", "мл/дл", "float"),
+    ("do2", "DO2", "мл/мин", "float"),
+    ("vbd", "ВБД", "", "float"),
+    ("fio2", "FiO2", "%", "float"),
+    ("etco2", "EtCO2", "мм рт.ст.", "float"),
+    ("vt", "VT", "мл", "float"),
+    ("f", "f", "1/мин", "float"),
+    ("mv", "MV", "л/мин", "float"),
+    ("peep", "PEEP", "см H2O", "float"),
+    ("ppik", "Pпик", "см H2O", "float"),
+    ("rplato", "Рплато", "см H2O", "float"),
+    ("delta_p", "ΔP", "см H2O", "float"),
+    ("cstat", "Сstat", "мл/см H2O", "float"),
+    ("cdyn", "Cdyn", "мл/см H2O", "float"),
+    ("uzl_score", "Балл УЗЛ", "баллы", "float"),
+    ("mac", "МАС", "%", "float"),
+    ("qcon", "qCon", "", "float"),
+    ("qnox", "qNOX", "", "float"),
+    ("emg", "EMG", "", "float"),
+    ("polo", "ПОЛО", "", "bool"),
+    ("aki", "ОПП", "", "bool"),
+    ("complications", "Осложнения", "", "str"),
+    ("pain_nrs", "Боль/ ЦРШ", "баллы", "float"),
+    ("pain_nrs_min", "Боль/ ЦРШ Мин", "баллы", "float"),
+    ("pain_nrs_max", "Боль/ ЦРШ Макс", "баллы", "float"),
+    ("nausea_vomiting", "Тошнота/рвота", "", "bool"),
+    ("aldrete_score", "Шкала Aldrete", "баллы", "float"),
+    ("aldrete_time", "Время достижения Aldrete 9-10 б.", "мин", "float"),
+    ("t_activation", "t активизации", "ч", "float"),
+    ("t_peristalsis", "t восс. перистал.", "ч", "float"),
+    ("t_first_gas", "t отхожд. газов", "ч", "float"),
+    ("opioid_consumption", "Расход опиатов", "мг", "float"),
+    ("urinary_catheter_pain", "Боль мочев кат", "баллы", "float"),
+    ("t_in_aro", "t в АРО", "ч", "float"),
+    ("t_intense_pain", "t интенсив. боли", "ч", "float"),
+    ("t_restore_frc", "t восс. ФОЕ", "ч", "float"),
+    ("t_restore_gfr", "t восс. СКФ", "ч", "float"),
+    ("t_in_ward", "t в стационаре", "ч", "float"),
+    ("qor15", "QoR-15", "баллы", "float"),
+    ("satisfied", "Удовлетворен.", "", "bool"),
+]
+
+SLICE_T5_FIELDS = [
+    ("date", "Дата", "", "date"),
+    ("time", "Время", "", "time"),
+    ("heart_rate", "ЧСС", "уд/мин", "float"),
+    ("sbp", "АДсис", "мм рт.ст.", "float"),
+    ("dbp", "АДдиас", "мм рт.ст.", "float"),
+    ("map", "АДср", "мм рт.ст.", "float"),
+    ("spo2", "SpO2", "%", "float"),
+    ("stroke_volume", "УО", "мл", "float"),
+    ("cardiac_index", "СИ", "л/мин/м²", "float"),
+    ("svri", "ИОПСС", "дин·с·см⁻⁵·м²", "float"),
+    ("cao", "СаО", "мл/дл", "float"),
+    ("do2", "DO2", "мл/мин", "float"),
+    ("vbd", "ВБД", "", "float"),
+    ("fio2", "FiO2", "%", "float"),
+    ("etco2", "EtCO2", "мм рт.ст.", "float"),
+    ("vt", "VT", "мл", "float"),
+    ("f", "f", "1/мин", "float"),
+    ("mv", "MV", "л/мин", "float"),
+    ("peep", "PEEP", "см H2O", "float"),
+    ("ppik", "Pпик", "см H2O", "float"),
+    ("rplato", "Рплато", "см H2O", "float"),
+    ("delta_p", "ΔP", "см H2O", "float"),
+    ("cstat", "Сstat", "мл/см H2O", "float"),
+    ("cdyn", "Cdyn", "мл/см H2O", "float"),
+    ("uzl_score", "Балл УЗЛ", "баллы", "float"),
+    ("mac", "МАС", "%", "float"),
+    ("qcon", "qCon", "", "float"),
+    ("qnox", "qNOX", "", "float"),
+    ("emg", "EMG", "", "float"),
+    ("polo", "ПОЛО", "", "bool"),
+    ("aki", "ОПП", "", "bool"),
+    ("complications", "Осложнения", "", "str"),
+    ("pain_nrs", "Боль/ ЦРШ", "баллы", "float"),
+    ("pain_nrs_min", "Боль/ ЦРШ Мин", "баллы", "float"),
+    ("pain_nrs_max", "Боль/ ЦРШ Макс", "баллы", "float"),
+    ("nausea_vomiting", "Тошнота/рвота", "", "bool"),
+    ("aldrete_score", "Шкала Aldrete", "баллы", "float"),
+    ("aldrete_time", "Время достижения Aldrete 9-10 б.", "мин", "float"),
+    ("t_activation", "t активизации", "ч", "float"),
+    ("t_peristalsis", "t восс. перистал.", "ч", "float"),
+    ("t_first_gas", "t отхожд. газов", "ч", "float"),
+    ("opioid_consumption", "Расход опиатов", "мг", "float"),
+    ("urinary_catheter_pain", "Боль мочев кат", "баллы", "float"),
+    ("t_in_aro", "t в АРО", "ч", "float"),
+    ("t_intense_pain", "t интенсив. боли", "ч", "float"),
+    ("t_restore_frc", "t восс. ФОЕ", "ч", "float"),
+    ("t_restore_gfr", "t восс. СКФ", "ч", "float"),
+    ("t_in_ward", "t в стационаре", "ч", "float"),
+    ("qor15", "QoR-15", "баллы", "float"),
+    ("satisfied", "Удовлетворен.", "", "bool"),
+]
+
+SLICE_T6_FIELDS = [
+    ("date", "Дата", "", "date"),
+    ("time", "Время", "", "time"),
+    ("heart_rate", "ЧСС", "уд/мин", "float"),
+    ("sbp", "АДсис", "мм рт.ст.", "float"),
+    ("dbp", "АДдиас", "мм рт.ст.", "float"),
+    ("map", "АДср", "мм рт.ст.", "float"),
+    ("spo2", "SpO2", "%", "float"),
+    ("urine_ml_per_h", "Диурез мл/ч", "мл/ч", "float"),
+    ("stroke_volume", "УО", "мл", "float"),
+    ("cardiac_index", "СИ", "л/мин/м²", "float"),
+    ("svri", "ИОПСС", "дин·с·см⁻⁵·м²", "float"),
+    ("cao", "СаО", "мл/дл", "float"),
+    ("do2", "DO2", "мл/мин", "float"),
+    ("vbd", "ВБД", "", "float"),
+    ("fio2", "FiO2", "%", "float"),
+    ("etco2", "EtCO2", "мм рт.ст.", "float"),
+    ("vt", "VT", "мл", "float"),
+    ("f", "f", "1/мин", "float"),
+    ("mv", "MV", "л/мин", "float"),
+    ("peep", "PEEP", "см H2O", "float"),
+    ("ppik", "Pпик", "см H2O", "float"),
+    ("rplato", "Рплато", "см H2O", "float"),
+    ("delta_p", "ΔP", "см H2O", "float"),
+    ("cstat", "Сstat", "мл/см H2O", "float"),
+    ("cdyn", "Cdyn", "мл/см H2O", "float"),
+    ("uzl_score", "Балл УЗЛ", "баллы", "float"),
+    ("mac", "МАС", "%", "float"),
+    ("qcon", "qCon", "", "float"),
+    ("qnox", "qNOX", "", "float"),
+    ("emg", "EMG", "", "float"),
+    ("polo", "ПОЛО", "", "bool"),
+    ("aki", "ОПП", "", "bool"),
+    ("complications", "Осложнения", "", "str"),
+    ("pain_nrs", "Боль/ ЦРШ", "баллы", "float"),
+    ("pain_nrs_min", "Боль/ ЦРШ Мин", "баллы", "float"),
+    ("pain_nrs_max", "Боль/ ЦРШ Макс", "баллы", "float"),
+    ("nausea_vomiting", "Тошнота/рвота", "", "bool"),
+    ("aldrete_score", "Шкала Aldrete", "баллы", "float"),
+    ("aldrete_time", "Время достижения Aldrete 9-10 б.", "мин", "float"),
+    ("t_activation", "t активизации", "ч", "float"),
+    ("t_peristalsis", "t восс. перистал.", "ч", "float"),
+    ("t_first_gas", "t отхожд. газов", "ч", "float"),
+    ("opioid_consumption", "Расход опиатов", "мг", "float"),
+    ("urinary_catheter_pain", "Боль мочев кат", "баллы", "float"),
+    ("t_in_aro", "t в АРО", "ч", "float"),
+    ("t_intense_pain", "t интенсив. боли", "ч", "float"),
+    ("t_restore_frc", "t восс. ФОЕ", "ч", "float"),
+    ("t_restore_gfr", "t восс. СКФ", "ч", "float"),
+    ("t_in_ward", "t в стационаре", "ч", "float"),
+    ("qor15", "QoR-15", "баллы", "float"),
+    ("satisfied", "Удовлетворен.", "", "bool"),
+]
+
+SLICE_T7_FIELDS = [
+    ("date", "Дата", "", "date"),
+    ("time", "Время", "", "time"),
+    ("heart_rate", "ЧСС", "уд/мин", "float"),
+    ("sbp", "АДсис", "мм рт.ст.", "float"),
+    ("dbp", "АДдиас", "мм рт.ст.", "float"),
+    ("map", "АДср", "мм рт.ст.", "float"),
+    ("spo2", "SpO2", "%", "float"),
+    ("urine_ml_per_h", "Диурез мл/ч", "мл/ч", "float"),
+    ("stroke_volume", "УО", "мл", "float"),
+    ("cardiac_index", "СИ", "л/мин/м²", "float"),
+    ("svri", "ИОПСС", "дин·с·см⁻⁵·м²", "float"),
+    ("cao", "СаО", "мл/дл", "float"),
+    ("do2", "DO2", "мл/мин", "float"),
+    ("vbd", "ВБД", "", "float"),
+    ("fio2", "FiO2", "%", "float"),
+    ("etco2", "EtCO2", "мм рт.ст.", "float"),
+    ("vt", "VT", "мл", "float"),
+    ("f", "f", "1/мин", "float"),
+    ("mv", "MV", "л/мин", "float"),
+    ("peep", "PEEP", "см H2O", "float"),
+    ("ppik", "Pпик", "см H2O", "float"),
+    ("rplato", "Рплато", "см H2O", "float"),
+    ("delta_p", "ΔP", "см H2O", "float"),
+    ("cstat", "Сstat", "мл/см H2O", "float"),
+    ("cdyn", "Cdyn", "мл/см H2O", "float"),
+    ("uzl_score", "Балл УЗЛ", "баллы", "float"),
+    ("mac", "МАС", "%", "float"),
+    ("qcon", "qCon", "", "float"),
+    ("qnox", "qNOX", "", "float"),
+    ("emg", "EMG", "", "float"),
+    ("polo", "ПОЛО", "", "bool"),
+    ("aki", "ОПП", "", "bool"),
+    ("complications", "Осложнения", "", "str"),
+    ("pain_nrs", "Боль/ ЦРШ", "баллы", "float"),
+    ("pain_nrs_min", "Боль/ ЦРШ Мин", "баллы", "float"),
+    ("pain_nrs_max", "Боль/ ЦРШ Макс", "баллы", "float"),
+    ("nausea_vomiting", "Тошнота/рвота", "", "bool"),
+    ("aldrete_score", "Шкала Aldrete", "баллы", "float"),
+    ("aldrete_time", "Время достижения Aldrete 9-10 б.", "мин", "float"),
+    ("t_activation", "t активизации", "ч", "float"),
+    ("t_peristalsis", "t восс. перистал.", "ч", "float"),
+    ("t_first_gas", "t отхожд. газов", "ч", "float"),
+    ("opioid_consumption", "Расход опиатов", "мг", "float"),
+    ("urinary_catheter_pain", "Боль мочев кат", "баллы", "float"),
+    ("t_in_aro", "t в АРО", "ч", "float"),
+    ("t_intense_pain", "t интенсив. боли", "ч", "float"),
+    ("t_restore_frc", "t восс. ФОЕ", "ч", "float"),
+    ("t_restore_gfr", "t восс. СКФ", "ч", "float"),
+    ("t_in_ward", "t в стационаре", "ч", "float"),
+    ("qor15", "QoR-15", "баллы", "float"),
+    ("satisfied", "Удовлетворен.", "", "bool"),
+]
+
+SLICE_T8_FIELDS = [
+    ("date", "Дата", "", "date"),
+    ("time", "Время", "", "time"),
+    ("rr_spont", "ЧД спонтан", "вдох/мин", "float"),
+    ("heart_rate", "ЧСС", "уд/мин", "float"),
+    ("heart_rate_min", "ЧСС мин", "уд/мин", "float"),
+    ("heart_rate_max", "ЧСС макс", "уд/мин", "float"),
+    ("sbp", "АДсис", "мм рт.ст.", "float"),
+    ("sbp_min", "Адсис мин", "мм рт.ст.", "float"),
+    ("sbp_max", "Адсис макс", "мм рт.ст.", "float"),
+    ("dbp", "АДдиас", "мм рт.ст.", "float"),
+    ("dbp_min", "Аддиас мин", "мм рт.ст.", "float"),
+    ("dbp_max", "Аддиас макс", "мм рт.ст.", "float"),
+    ("map", "АДср", "мм рт.ст.", "float"),
+    ("map_min", "Адср мин", "мм рт.ст.", "float"),
+    ("map_max", "Адср макс", "мм рт.ст.", "float"),
+    ("spo2", "SpO2", "%", "float"),
+    ("hemoglobin", "Гемоглобин", "г/л", "float"),
+    ("stroke_volume", "УО", "мл", "float"),
+    ("cardiac_index", "СИ", "л/мин/м²", "float"),
+    ("svri", "ИОПСС", "дин·с·см⁻⁵·м²", "float"),
+    ("cao", "СаО", "мл/дл", "float"),
+    ("do2", "DO2", "мл/мин", "float"),
+    ("vbd", "ВБД", "", "float"),
+    ("fio2", "FiO2", "%", "float"),
+    ("uzl_score", "Балл УЗЛ", "баллы", "float"),
+    ("mac", "МАС", "%", "float"),
+    ("qcon", "qCon", "", "float"),
+    ("qnox", "qNOX", "", "float"),
+    ("emg", "EMG", "", "float"),
+    ("ph_arterial", "pH артер.", "", "float"),
+    ("be_arterial", "BE артер.", "ммоль/л", "float"),
+    ("hco3_arterial", "HCO3 артер.", "ммоль/л", "float"),
+    ("lactate_arterial", "Лактат артер.", "ммоль/л", "float"),
+    ("pao2", "РаО2", "мм рт.ст.", "float"),
+    ("pao2_fio2", "РаО2/FiO2", "", "float"),
+    ("paco2", "РаСО2", "мм рт.ст.", "float"),
+    ("sao2", "SаO2", "%", "float"),
+    ("pin_prick", "Рin-prick", "", "bool"),
+    ("cold_test", "Cold-test", "", "bool"),
+    ("motor_block", "Моторный блок", "", "bool"),
+    ("t_operation", "t операции", "мин", "float"),
+    ("t_awakening", "t пробуждения", "мин", "float"),
+    ("t_before_extubation", "t до экстубации", "мин", "float"),
+    ("infusion_volume", "Объем инфузии", "мл", "float"),
+    ("polo", "ПОЛО", "", "bool"),
+    ("aki", "ОПП", "", "bool"),
+    ("complications", "Осложнения", "", "str"),
+    ("pain_nrs", "Боль/ ЦРШ", "баллы", "float"),
+    ("pain_nrs_min", "Боль/ ЦРШ Мин", "баллы", "float"),
+    ("pain_nrs_max", "Боль/ ЦРШ Макс", "баллы", "float"),
+    ("nausea_vomiting", "Тошнота/рвота", "", "bool"),
+    ("aldrete_score", "Шкала Aldrete", "баллы", "float"),
+    ("aldrete_time", "Время достижения Aldrete 9-10 б.", "мин", "float"),
+    ("t_activation", "t активизации", "ч", "float"),
+    ("t_peristalsis", "t восс. перистал.", "ч", "float"),
+    ("t_first_gas", "t отхожд. газов", "ч", "float"),
+    ("opioid_consumption", "Расход опиатов", "мг", "float"),
+    ("urinary_catheter_pain", "Боль мочев кат", "баллы", "float"),
+    ("t_in_aro", "t в АРО", "ч", "float"),
+    ("t_intense_pain", "t интенсив. боли", "ч", "float"),
+    ("t_restore_frc", "t восс. ФОЕ", "ч", "float"),
+    ("t_restore_gfr", "t восс. СКФ", "ч", "float"),
+    ("t_in_ward", "t в стационаре", "ч", "float"),
+    ("qor15", "QoR-15", "баллы", "float"),
+    ("satisfied", "Удовлетворен.", "", "bool"),
+]
+
+SLICE_T9_FIELDS = [
+    ("date", "Дата", "", "date"),
+    ("time", "Время", "", "time"),
+    ("rr_spont", "ЧД спонтан", "вдох/мин", "float"),
+    ("fev1", "ОФВ1", "л", "float"),
+    ("fvc", "ФЖЕЛ", "л", "float"),
+    ("frc", "ФОЕ", "л", "float"),
+    ("tlc", "ОЕЛ", "л", "float"),
+    ("rv", "ООЛ", "л", "float"),
+    ("fev1_fvc", "ОФВ1/ФЖЕЛ", "%", "float"),
+    ("pef", "ПОС", "л/с", "float"),
+    ("mef25", "МОС25", "л/с", "float"),
+    ("mef50", "МОС50", "л/с", "float"),
+    ("mef75", "МОС75", "л/с", "float"),
+    ("fef25_75", "СОС 25-75", "л/с", "float"),
+    ("heart_rate", "ЧСС", "уд/мин", "float"),
+    ("heart_rate_min", "ЧСС мин", "уд/мин", "float"),
+    ("heart_rate_max", "ЧСС макс", "уд/мин", "float"),
+    ("sbp", "АДсис", "мм рт.ст.", "float"),
+    ("sbp_min", "Адсис мин", "мм рт.ст.", "float"),
+    ("sbp_max", "Адсис макс", "мм рт.ст.", "float"),
+    ("dbp", "АДдиас", "мм рт.ст.", "float"),
+    ("dbp_min", "Аддиас мин", "мм рт.ст.", "float"),
+    ("dbp_max", "Аддиас макс", "мм рт.ст.", "float"),
+    ("map", "АДср", "мм рт.ст.", "float"),
+    ("map_min", "Адср мин", "мм рт.ст.", "float"),
+    ("map_max", "Адср макс", "мм рт.ст.", "float"),
+    ("spo2", "SpO2", "%", "float"),
+    ("urine_ml_per_h", "Диурез мл/ч", "мл/ч", "float"),
+    ("hemoglobin", "Гемоглобин", "г/л", "float"),
+    ("neutrophils", "Нейтрофилы", "%", "float"),
+    ("lymphocytes", "Лимфоциты", "%", "float"),
+    ("hematocrit", "Гематокрит", "%", "float"),
+    ("leukocytes", "Лейкоциты", "10^9/л", "float"),
+    ("bands", "п/я", "%", "float"),
+    ("albumin", "Альбумин", "г/л", "float"),
+    ("creatinine", "Креатинин", "мкмоль/л", "float"),
+    ("gfr", "СКФ", "мл/мин", "float"),
+    ("nlr", "NLR", "", "float"),
+    ("glucose", "Глюкоза крови", "ммоль/л", "float"),
+    ("stroke_volume", "УО", "мл", "float"),
+    ("cardiac_index", "СИ", "л/мин/м²", "float"),
+    ("svri", "ИОПСС", "дин·с·см⁻⁵·м²", "float"),
+    ("cao", "СаО", "мл/дл", "float"),
+    ("do2", "DO2", "мл/мин", "float"),
+    ("vbd", "ВБД", "", "float"),
+    ("fio2", "FiO2", "%", "float"),
+    ("etco2", "EtCO2", "мм рт.ст.", "float"),
+    ("vt", "VT", "мл", "float"),
+    ("f", "f", "вдох/мин", "float"),
+    ("mv", "MV", "л/мин", "float"),
+    ("peep", "PEEP", "см H2O", "float"),
+    ("ppik", "Pпик", "см H2O", "float"),
+    ("rplato", "Рплато", "см H2O", "float"),
+    ("delta_p", "ΔP", "см H2O", "float"),
+    ("cstat", "Сstat", "мл/см H2O", "float"),
+    ("cdyn", "Cdyn", "мл/см H2O", "float"),
+    ("uzl_score", "Балл УЗЛ", "баллы", "float"),
+    ("mac", "МАС", "%", "float"),
+    ("qcon", "qCon", "", "float"),
+    ("qnox", "qNOX", "", "float"),
+    ("emg", "EMG", "", "float"),
+    ("ph_arterial", "pH артер.", "", "float"),
+    ("be_arterial", "BE артер.", "ммоль/л", "float"),
+    ("hco3_arterial", "HCO3 артер.", "ммоль/л", "float"),
+    ("lactate_arterial", "Лактат артер.", "ммоль/л", "float"),
+    ("pao2", "РаО2", "мм рт.ст.", "float"),
+    ("pao2_fio2", "РаО2/FiO2", "", "float"),
+    ("paco2", "РаСО2", "мм рт.ст.", "float"),
+    ("sao2", "SаO2", "%", "float"),
+    ("pin_prick", "Рin-prick", "", "bool"),
+    ("cold_test", "Cold-test", "", "bool"),
+    ("motor_block", "Моторный блок", "", "bool"),
+    ("t_operation", "t операции", "мин", "float"),
+    ("t_awakening", "t пробуждения", "мин", "float"),
+    ("t_before_extubation", "t до экстубации", "мин", "float"),
+    ("infusion_volume", "Объем инфузии", "мл", "float"),
+    ("polo", "ПОЛО", "", "bool"),
+    ("phrenic_syndrome", "Френикус синд.", "", "bool"),
+    ("phrenic_crsh", "Френикус/ ЦРШ", "", "bool"),
+    ("aki", "ОПП", "", "bool"),
+    ("complications", "Осложнения", "", "str"),
+    ("pain_nrs", "Боль/ ЦРШ", "баллы", "float"),
+    ("pain_nrs_min", "Боль/ ЦРШ Мин", "баллы", "float"),
+    ("pain_nrs_max", "Боль/ ЦРШ Макс", "баллы", "float"),
+    ("nausea_vomiting", "Тошнота/рвота", "", "bool"),
+    ("aldrete_score", "Шкала Aldrete", "баллы", "float"),
+    ("aldrete_time", "Время достижения Aldrete 9-10 б.", "мин", "float"),
+    ("t_activation", "t активизации", "ч", "float"),
+    ("t_peristalsis", "t восс. перистал.", "ч", "float"),
+    ("t_first_gas", "t отхожд. газов", "ч", "float"),
+    ("opioid_consumption", "Расход опиатов", "мг", "float"),
+    ("urinary_catheter_pain", "Боль мочев кат", "баллы", "float"),
+    ("t_in_aro", "t в АРО", "ч", "float"),
+    ("t_intense_pain", "t интенсив. боли", "ч", "float"),
+    ("t_restore_frc", "t восс. ФОЕ", "ч", "float"),
+    ("t_restore_gfr", "t восс. СКФ", "ч", "float"),
+    ("t_in_ward", "t в стационаре", "ч", "float"),
+    ("qor15", "QoR-15", "баллы", "float"),
+    ("satisfied", "Удовлетворен.", "", "bool"),
+]
+
+SLICE_T10_FIELDS = [
+    ("date", "Дата", "", "date"),
+    ("time", "Время", "", "time"),
+    ("rr_spont", "ЧД спонтан", "вдох/мин", "float"),
+    ("fev1", "ОФВ1", "л", "float"),
+    ("fvc", "ФЖЕЛ", "л", "float"),
+    ("frc", "ФОЕ", "л", "float"),
+    ("tlc", "ОЕЛ", "л", "float"),
+    ("rv", "ООЛ", "л", "float"),
+    ("fev1_fvc", "ОФВ1/ФЖЕЛ", "%", "float"),
+    ("pef", "ПОС", "л/с", "float"),
+    ("mef25", "МОС25", "л/с", "float"),
+    ("mef50", "МОС50", "л/с", "float"),
+    ("mef75", "МОС75", "л/с", "float"),
+    ("fef25_75", "СОС 25-75", "л/с", "float"),
+    ("heart_rate", "ЧСС", "уд/мин", "float"),
+    ("sbp", "АДсис", "мм рт.ст.", "float"),
+    ("dbp", "АДдиас", "мм рт.ст.", "float"),
+    ("map", "АДср", "мм рт.ст.", "float"),
+    ("spo2", "SpO2", "%", "float"),
+    ("urine_ml_per_h", "Диурез мл/ч", "мл/ч", "float"),
+    ("hemoglobin", "Гемоглобин", "г/л", "float"),
+    ("neutrophils", "Нейтрофилы", "%", "float"),
+    ("lymphocytes", "Лимфоциты", "%", "float"),
+    ("hematocrit", "Гематокрит", "%", "float"),
+    ("leukocytes", "Лейкоциты", "10^9/л", "float"),
+    ("bands", "п/я", "%", "float"),
+    ("albumin", "Альбумин", "г/л", "float"),
+    ("creatinine", "Креатинин", "мкмоль/л", "float"),
+    ("gfr", "СКФ", "мл/мин", "float"),
+    ("nlr", "NLR", "", "float"),
+    ("glucose", "Глюкоза крови", "ммоль/л", "float"),
+    ("stroke_volume", "УО", "мл", "float"),
+    ("cardiac_index", "СИ", "л/мин/м²", "float"),
+    ("svri", "ИОПСС", "дин·с·см⁻⁵·м²", "float"),
+    ("cao", "СаО", "мл/дл", "float"),
+    ("do2", "DO2", "мл/мин", "float"),
+    ("vbd", "ВБД", "", "float"),
+    ("uzl_score", "Балл УЗЛ", "баллы", "float"),
+    ("ph_arterial", "pH артер.", "", "float"),
+    ("be_arterial", "BE артер.", "ммоль/л", "float"),
+    ("hco3_arterial", "HCO3 артер.", "ммоль/л", "float"),
+    ("lactate_arterial", "Лактат артер.", "ммоль/л", "float"),
+    ("pao2", "РаО2", "мм рт.ст.", "float"),
+    ("pao2_fio2", "РаО2/FiO2", "", "float"),
+    ("paco2", "РаСО2", "мм рт.ст.", "float"),
+    ("sao2", "SаO2", "%", "float"),
+    ("pin_prick", "Рin-prick", "", "bool"),
+    ("cold_test", "Cold-test", "", "bool"),
+    ("motor_block", "Моторный блок", "", "bool"),
+    ("polo", "ПОЛО", "", "bool"),
+    ("phrenic_syndrome", "Френикус синд.", "", "bool"),
+    ("phrenic_crsh", "Френикус/ ЦРШ", "", "bool"),
+    ("aki", "ОПП", "", "bool"),
+    ("complications", "Осложнения", "", "str"),
+    ("pain_nrs", "Боль/ ЦРШ", "баллы", "float"),
+    ("pain_nrs_min", "Боль/ ЦРШ Мин", "баллы", "float"),
+    ("pain_nrs_max", "Боль/ ЦРШ Макс", "баллы", "float"),
+    ("nausea_vomiting", "Тошнота/рвота", "", "bool"),
+    ("aldrete_score", "Шкала Aldrete", "баллы", "float"),
+    ("aldrete_time", "Время достижения Aldrete 9-10 б.", "мин", "float"),
+    ("t_activation", "t активизации", "ч", "float"),
+    ("t_peristalsis", "t восс. перистал.", "ч", "float"),
+    ("t_first_gas", "t отхожд. газов", "ч", "float"),
+    ("opioid_consumption", "Расход опиатов", "мг", "float"),
+    ("urinary_catheter_pain", "Боль мочев кат", "баллы", "float"),
+    ("t_in_aro", "t в АРО", "ч", "float"),
+    ("t_intense_pain", "t интенсив. боли", "ч", "float"),
+    ("t_restore_frc", "t восс. ФОЕ", "ч", "float"),
+    ("t_restore_gfr", "t восс. СКФ", "ч", "float"),
+    ("t_in_ward", "t в стационаре", "ч", "float"),
+    ("qor15", "QoR-15", "баллы", "float"),
+    ("satisfied", "Удовлетворен.", "", "bool"),
+]
+
+SLICE_T11_FIELDS = [
+    ("date", "Дата", "", "date"),
+    ("time", "Время", "", "time"),
+    ("rr_spont", "ЧД спонтан", "вдох/мин", "float"),
+    ("fev1", "ОФВ1", "л", "float"),
+    ("fvc", "ФЖЕЛ", "л", "float"),
+    ("frc", "ФОЕ", "л", "float"),
+    ("tlc", "ОЕЛ", "л", "float"),
+    ("rv", "ООЛ", "л", "float"),
+    ("fev1_fvc", "ОФВ1/ФЖЕЛ", "%", "float"),
+    ("pef", "ПОС", "л/с", "float"),
+    ("mef25", "МОС25", "л/с", "float"),
+    ("mef50", "МОС50", "л/с", "float"),
+    ("mef75", "МОС75", "л/с", "float"),
+    ("fef25_75", "СОС 25-75", "л/с", "float"),
+    ("heart_rate", "ЧСС", "уд/мин", "float"),
+    ("sbp", "АДсис", "мм рт.ст.", "float"),
+    ("dbp", "АДдиас", "мм рт.ст.", "float"),
+    ("map", "АДср", "мм рт.ст.", "float"),
+    ("spo2", "SpO2", "%", "float"),
+    ("urine_ml_per_h", "Диурез мл/ч", "мл/ч", "float"),
+    ("hemoglobin", "Гемоглобин", "г/л", "float"),
+    ("neutrophils", "Нейтрофилы", "%", "float"),
+    ("lymphocytes", "Лимфоциты", "%", "float"),
+    ("hematocrit", "Гематокрит", "%", "float"),
+    ("leukocytes", "Лейкоциты", "10^9/л", "float"),
+    ("bands", "п/я", "%", "float"),
+    ("albumin", "Альбумин", "г/л", "float"),
+    ("creatinine", "Креатинин", "мкмоль/л", "float"),
+    ("gfr", "СКФ", "мл/мин", "float"),
+    ("nlr", "NLR", "", "float"),
+    ("glucose", "Глюкоза крови", "ммоль/л", "float"),
+    ("stroke_volume", "УО", "мл", "float"),
+    ("cardiac_index", "СИ", "л/мин/м²", "float"),
+    ("svri", "ИОПСС", "дин·с·см⁻⁵·м²", "float"),
+    ("cao", "СаО", "мл/дл", "float"),
+    ("do2", "DO2", "мл/мин", "float"),
+    ("vbd", "ВБД", "", "float"),
+    ("uzl_score", "Балл УЗЛ", "баллы", "float"),
+    ("ph_arterial", "pH артер.", "", "float"),
+    ("be_arterial", "BE артер.", "ммоль/л", "float"),
+    ("hco3_arterial", "HCO3 артер.", "ммоль/л", "float"),
+    ("lactate_arterial", "Лактат артер.", "ммоль/л", "float"),
+    ("pao2", "РаО2", "мм рт.ст.", "float"),
+    ("pao2_fio2", "РаО2/FiO2", "", "float"),
+    ("paco2", "РаСО2", "мм рт.ст.", "float"),
+    ("sao2", "SаO2", "%", "float"),
+    ("pin_prick", "Рin-prick", "", "bool"),
+    ("cold_test", "Cold-test", "", "bool"),
+    ("motor_block", "Моторный блок", "", "bool"),
+    ("polo", "ПОЛО", "", "bool"),
+    ("phrenic_syndrome", "Френикус синд.", "", "bool"),
+    ("phrenic_crsh", "Френикус/ ЦРШ", "", "bool"),
+    ("aki", "ОПП", "", "bool"),
+    ("complications", "Осложнения", "", "str"),
+    ("pain_nrs", "Боль/ ЦРШ", "баллы", "float"),
+    ("pain_nrs_min", "Боль/ ЦРШ Мин", "баллы", "float"),
+    ("pain_nrs_max", "Боль/ ЦРШ Макс", "баллы", "float"),
+    ("nausea_vomiting", "Тошнота/рвота", "", "bool"),
+    ("aldrete_score", "Шкала Aldrete", "баллы", "float"),
+    ("aldrete_time", "Время достижения Aldrete 9-10 б.", "мин", "float"),
+    ("t_activation", "t активизации", "ч", "float"),
+    ("t_peristalsis", "t восс. перистал.", "ч", "float"),
+    ("t_first_gas", "t отхожд. газов", "ч", "float"),
+    ("opioid_consumption", "Расход опиатов", "мг", "float"),
+    ("urinary_catheter_pain", "Боль мочев кат", "баллы", "float"),
+    ("t_in_aro", "t в АРО", "ч", "float"),
+    ("t_intense_pain", "t интенсив. боли", "ч", "float"),
+    ("t_restore_frc", "t восс. ФОЕ", "ч", "float"),
+    ("t_restore_gfr", "t восс. СКФ", "ч", "float"),
+    ("t_in_ward", "t в стационаре", "ч", "float"),
+    ("qor15", "QoR-15", "баллы", "float"),
+    ("satisfied", "Удовлетворен.", "", "bool"),
+]
+
+SLICE_T12_FIELDS = [
+    ("date", "Дата", "", "date"),
+    ("time", "Время", "", "time"),
+    ("rr_spont", "ЧД спонтан", "вдох/мин", "float"),
+    ("fev1", "ОФВ1", "л", "float"),
+    ("fvc", "ФЖЕЛ", "л", "float"),
+    ("frc", "ФОЕ", "л", "float"),
+    ("tlc", "ОЕЛ", "л", "float"),
+    ("rv", "ООЛ", "л", "float"),
+    ("fev1_fvc", "ОФВ1/ФЖЕЛ", "%", "float"),
+    ("pef", "ПОС", "л/с", "float"),
+    ("mef25", "МОС25", "л/с", "float"),
+    ("mef50", "МОС50", "л/с", "float"),
+    ("mef75", "МОС75", "л/с", "float"),
+    ("fef25_75", "СОС 25-75", "л/с", "float"),
+    ("heart_rate", "ЧСС", "уд/мин", "float"),
+    ("sbp", "АДсис", "мм рт.ст.", "float"),
+    ("dbp", "АДдиас", "мм рт.ст.", "float"),
+    ("map", "АДср", "мм рт.ст.", "float"),
+    ("spo2", "SpO2", "%", "float"),
+    ("urine_ml_per_h", "Диурез мл/ч", "мл/ч", "float"),
+    ("hemoglobin", "Гемоглобин", "г/л", "float"),
+    ("neutrophils", "Нейтрофилы", "%", "float"),
+    ("lymphocytes", "Лимфоциты", "%", "float"),
+    ("hematocrit", "Гематокрит", "%", "float"),
+    ("leukocytes", "Лейкоциты", "10^9/л", "float"),
+    ("bands", "п/я", "%", "float"),
+    ("albumin", "Альбумин", "г/л", "float"),
+    ("creatinine", "Креатинин", "мкмоль/л", "float"),
+    ("gfr", "СКФ", "мл/мин", "float"),
+    ("nlr", "NLR", "", "float"),
+    ("glucose", "Глюкоза крови", "ммоль/л", "float"),
+    ("stroke_volume", "УО", "мл", "float"),
+    ("cardiac_index", "СИ", "л/мин/м²", "float"),
+    ("svri", "ИОПСС", "дин·с·см⁻⁵·м²", "float"),
+    ("cao", "СаО", "мл/дл", "float"),
+    ("do2", "DO2", "мл/мин", "float"),
+    ("vbd", "ВБД", "", "float"),
+    ("uzl_score", "Балл УЗЛ", "баллы", "float"),
+    ("ph_arterial", "pH артер.", "", "float"),
+    ("be_arterial", "BE артер.", "ммоль/л", "float"),
+    ("hco3_arterial", "HCO3 артер.", "ммоль/л", "float"),
+    ("lactate_arterial", "Лактат артер.", "ммоль/л", "float"),
+    ("pao2", "РаО2", "мм рт.ст.", "float"),
+    ("pao2_fio2", "РаО2/FiO2", "", "float"),
+    ("paco2", "РаСО2", "мм рт.ст.", "float"),
+    ("sao2", "SаO2", "%", "float"),
+    ("pin_prick", "Рin-prick", "", "bool"),
+    ("cold_test", "Cold-test", "", "bool"),
+    ("motor_block", "Моторный блок", "", "bool"),
+    ("polo", "ПОЛО", "", "bool"),
+    ("phrenic_syndrome", "Френикус синд.", "", "bool"),
+    ("phrenic_crsh", "Френикус/ ЦРШ", "", "bool"),
+    ("aki", "ОПП", "", "bool"),
+    ("complications", "Осложнения", "", "str"),
+    ("pain_nrs", "Боль/ ЦРШ", "баллы", "float"),
+    ("pain_nrs_min", "Боль/ ЦРШ Мин", "баллы", "float"),
+    ("pain_nrs_max", "Боль/ ЦРШ Макс", "баллы", "float"),
+    ("nausea_vomiting", "Тошнота/рвота", "", "bool"),
+    ("aldrete_score", "Шкала Aldrete", "баллы", "float"),
+    ("aldrete_time", "Время достижения Aldrete 9-10 б.", "мин", "float"),
+    ("t_activation", "t активизации", "ч", "float"),
+    ("t_peristalsis", "t восс. перистал.", "ч", "float"),
+    ("t_first_gas", "t отхожд. газов", "ч", "float"),
+    ("opioid_consumption", "Расход опиатов", "мг", "float"),
+    ("urinary_catheter_pain", "Боль мочев кат", "баллы", "float"),
+    ("t_in_aro", "t в АРО", "ч", "float"),
+    ("t_intense_pain", "t интенсив. боли", "ч", "float"),
+    ("t_restore_frc", "t восс. ФОЕ", "ч", "float"),
+    ("t_restore_gfr", "t восс. СКФ", "ч", "float"),
+    ("t_in_ward", "t в стационаре", "ч", "float"),
+    ("qor15", "QoR-15", "баллы", "float"),
+    ("satisfied", "Удовлетворен.", "", "bool"),
+]
+
+# номер среза -> поля
+SLICE_FIELDS = {
+    0: SLICE_T0_FIELDS,
+    1: SLICE_T1_FIELDS,
+    2: SLICE_T2_FIELDS,
+    3: SLICE_T3_FIELDS,
+    4: SLICE_T4_FIELDS,
+    5: SLICE_T5_FIELDS,
+    6: SLICE_T6_FIELDS,
+    7: SLICE_T7_FIELDS,
+    8: SLICE_T8_FIELDS,
+    9: SLICE_T9_FIELDS,
+    10: SLICE_T10_FIELDS,
+    11: SLICE_T11_FIELDS,
+    12: SLICE_T12_FIELDS,
+}
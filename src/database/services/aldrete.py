@@ -21,13 +21,7 @@ class AldreteService:
             self.session.flush()
         return ps
 
-    def upsert_result(self, person_id: int, data: AldreteInput) -> AldreteRead:
-        ps = self._get_or_create_ps(person_id)
-        res = self.repo.get_by_scales_id(ps.id)
-        if res is None:
-            res = AldreteResult(scales_id=ps.id)
-            self.repo.add(res)
-
+    def apply_input(self, res: AldreteResult, data: AldreteInput) -> AldreteResult:
         res.activity_score = int(data.activity_score)
         res.respiration_score = int(data.respiration_score)
         res.pressure_score = int(data.pressure_score)
@@ -40,11 +34,19 @@ class AldreteService:
             res.consciousness_score +
             res.spo2_score
         )
+        return res
+
+    def upsert_result(self, person_id: int, data: AldreteInput) -> AldreteRead:
+        ps = self._get_or_create_ps(person_id)
+        res = self.repo.get_by_scales_id(ps.id)
+        if res is None:
+            res = AldreteResult(scales_id=ps.id)
+            self.repo.add(res)
+
+        self.apply_input(res, data)
 
         self.ps_repo.update_fields(ps, aldrete_filled=True)
         self.session.commit()
-        self.session.refresh(res)
-        self.session.refresh(ps)
         return AldreteRead.model_validate(res)
 
     def clear_result(self, person_id: int) -> bool:
@@ -58,10 +60,7 @@ class AldreteService:
         return bool(affected)
 
     def get_result(self, person_id: int) -> AldreteRead:
-        ps = self.ps_repo.get_by_person_id(person_id)
-        if not ps:
-            raise NotFoundError("PersonScales not found")
-        res = self.repo.get_by_scales_id(ps.id)
+        res = self.repo.get_by_person_id(person_id)
         if not res:
             raise NotFoundError("AldreteResult not found")
         return AldreteRead.model_validate(res)
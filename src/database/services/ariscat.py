@@ -62,13 +62,7 @@ class AriscatService:
             self.session.flush()
         return ps
 
-    def upsert_result(self, person_id: int, data: AriscatInput) -> AriscatRead:
-        ps = self._get_or_create_ps(person_id)
-        res = self.repo.get_by_scales_id(ps.id)
-        if res is None:
-            res = AriscatResult(scales_id=ps.id)
-            self.repo.add(res)
-
+    def apply_input(self, res: AriscatResult, data: AriscatInput) -> AriscatResult:
         # категории
         res.cat_age = _age_cat(data.age_years)
         res.cat_spo2 = _spo2_cat(data.spo2_percent)
@@ -97,19 +91,25 @@ class AriscatService:
                 + res.cat_duration.value
                 + res.cat_emerg.value
         )
+        return res
+
+    def upsert_result(self, person_id: int, data: AriscatInput) -> AriscatRead:
+        ps = self._get_or_create_ps(person_id)
+        res = self.repo.get_by_scales_id(ps.id)
+        if res is None:
+            res = AriscatResult(scales_id=ps.id)
+            self.repo.add(res)
+
+        self.apply_input(res, data)
 
         # отметить флаг заполнения
         self.ps_repo.update_fields(ps, ariscat_filled=True)
 
         self.session.commit()
-        self.session.refresh(res)
         return AriscatRead.model_validate(res)
 
     def get_result(self, person_id: int) -> AriscatRead:
-        ps = self.ps_repo.get_by_person_id(person_id)
-        if not ps:
-            raise NotFoundError("PersonScales not found")
-        res = self.repo.get_by_scales_id(ps.id)
+        res = self.repo.get_by_person_id(person_id)
         if not res:
             raise NotFoundError("AriscatResult not found")
         return AriscatRead.model_validate(res)
@@ -0,0 +1,127 @@
+from typing import Iterable
+
+from pydantic import BaseModel
+from sqlalchemy import inspect
+from sqlalchemy.orm import Session
+
+from database.models import Base, PersonScales, PersonSlices, SobaAssessment, StopBangResult
+from database.repositories.bulk import BulkRepository
+from database.services.scales import get_scale_spec
+from database.services.slices import get_slice_spec
+
+_SKIP_COLUMNS = {"id", "created_at", "updated_at"}
+
+
+def _column_values(obj: Base) -> dict:
+    """Значения колонок объекта для INSERT; пустые — Python-default колонки."""
+    values = {}
+    for col in inspect(type(obj)).columns:
+        if col.key in _SKIP_COLUMNS:
+            continue
+        value = getattr(obj, col.key)
+        if value is None and col.default is not None and col.default.is_scalar:
+            value = col.default.arg
+        values[col.key] = value
+    return values
+
+
+class BulkUpsertService:
+    """
+    Массовая запись шкал и срезов по многим пациентам: set-based
+    INSERT … ON CONFLICT DO UPDATE, флаги *_filled — одним UPDATE, один commit.
+    Повторные записи одного пациента сливаются по порядку (последняя побеждает).
+    """
+
+    def __init__(self, session: Session):
+        self.session = session
+        self.repo = BulkRepository(session)
+
+    def _begin(self) -> None:
+        # несохранённые ORM-изменения должны попасть в БД до Core-запросов
+        self.session.flush()
+
+    def _finish(self) -> None:
+        self.session.commit()
+        # строки менялись в обход ORM — загруженные объекты могли устареть
+        self.session.expire_all()
+
+    def upsert_scales(self, scale: str, records: Iterable[tuple[int, BaseModel]]) -> int:
+        """
+        records — пары (person_id, ввод шкалы). Баллы считаются тем же
+        apply_input, что и при одиночном сохранении, на копии сохранённой строки.
+        Возвращает число записанных строк.
+        """
+        spec = get_scale_spec(scale)
+        records = list(records)
+        if not records:
+            return 0
+        self._begin()
+
+        scales_ids = self.repo.ensure_parent_rows(PersonScales, (pid for pid, _ in records))
+        fixed, where = {}, []
+        if spec.timepoint is not None:
+            fixed["timepoint"] = spec.timepoint
+            where.append(spec.model.timepoint == spec.timepoint)
+        existing = {
+            row.scales_id: row
+            for row in self.repo.fetch_rows(
+                spec.model, spec.model.scales_id, scales_ids.values(), *where
+            )
+        }
+        stopbang = {}
+        if spec.model is SobaAssessment:
+            stopbang = {
+                row.scales_id: row
+                for row in self.repo.fetch_rows(
+                    StopBangResult, StopBangResult.scales_id, scales_ids.values()
+                )
+            }
+
+        svc = spec.service(self.session)
+        objs: dict[int, Base] = {}
+        for person_id, data in records:
+            scales_id = scales_ids[person_id]
+            obj = objs.get(scales_id)
+            if obj is None:
+                # transient-копия: в сессию не добавляется, пишется только upsert'ом
+                row = existing.get(scales_id)
+                obj = spec.model(**row._mapping) if row else spec.model(scales_id=scales_id, **fixed)
+                objs[scales_id] = obj
+            if spec.model is SobaAssessment:
+                svc.apply_input(obj, data, stopbang.get(scales_id))
+            else:
+                svc.apply_input(obj, data)
+
+        rows = [_column_values(obj) for obj in objs.values()]
+        written = self.repo.upsert(spec.model, rows, ["scales_id", *fixed])
+        self.repo.set_flags(PersonScales, objs.keys(), **{spec.flag: True})
+        self._finish()
+        return written
+
+    def upsert_slices(self, timepoint: int, records: Iterable[tuple[int, BaseModel]]) -> int:
+        """
+        records — пары (person_id, SliceTNInput). Как и при одиночном сохранении,
+        незаданные и пустые (None) поля не затирают сохранённые значения.
+        Возвращает число записанных строк.
+        """
+        spec = get_slice_spec(timepoint)
+        records = list(records)
+        if not records:
+            return 0
+        self._begin()
+
+        slices_ids = self.repo.ensure_parent_rows(PersonSlices, (pid for pid, _ in records))
+        merged: dict[int, dict] = {}
+        for person_id, data in records:
+            values = {k: v for k, v in data.model_dump(exclude_unset=True).items() if v is not None}
+            merged.setdefault(slices_ids[person_id], {}).update(values)
+
+        columns = sorted(set().union(*merged.values()))
+        rows = [
+            {"slices_id": slices_id, **{c: values.get(c) for c in columns}}
+            for slices_id, values in merged.items()
+        ]
+        written = self.repo.upsert(spec.model, rows, ["slices_id"], coalesce=True)
+        self.repo.set_flags(PersonSlices, merged.keys(), **{spec.flag: True})
+        self._finish()
+        return written
@@ -104,15 +104,9 @@ class CapriniService:
             self.session.flush()
         return ps
 
-    def upsert_result(self, person_id: int, data: CapriniInput | CapriniUpdate) -> CapriniRead:
-        ps = self._get_or_create_ps(person_id)
-        obj = self.repo.get_by_scales_id(ps.id)
+    def apply_input(self, obj: CapriniResult, data: CapriniInput | CapriniUpdate) -> CapriniResult:
         payload = data.model_dump(exclude_unset=True)
 
-        if obj is None:
-            obj = CapriniResult(scales_id=ps.id)
-            self.repo.add(obj)
-
         # обновляем сырые поля, если пришли
         for fld in ("age_years", "height_cm", "weight_kg"):
             if fld in payload:
@@ -136,19 +130,25 @@ class CapriniService:
         # Пересчёт баллов и риска
         obj.total_score = _score_caprini(obj)
         obj.risk_level = _risk_band(obj.total_score)
+        return obj
+
+    def upsert_result(self, person_id: int, data: CapriniInput | CapriniUpdate) -> CapriniRead:
+        ps = self._get_or_create_ps(person_id)
+        obj = self.repo.get_by_scales_id(ps.id)
+        if obj is None:
+            obj = CapriniResult(scales_id=ps.id)
+            self.repo.add(obj)
+
+        self.apply_input(obj, data)
 
         # флаг у пациента
         self.ps_repo.update_fields(ps, caprini_filled=True)
 
         self.session.commit()
-        self.session.refresh(obj)
         return CapriniRead.model_validate(obj)
 
     def get_result(self, person_id: int) -> CapriniRead:
-        ps = self.ps_repo.get_by_person_id(person_id)
-        if not ps:
-            raise NotFoundError("PersonScales not found")
-        obj = self.repo.get_by_scales_id(ps.id)
+        obj = self.repo.get_by_person_id(person_id)
         if not obj:
             raise NotFoundError("Caprini not found")
         return CapriniRead.model_validate(obj)
@@ -72,15 +72,7 @@ class ElGanzouriService:
             self.session.flush()  # получим ps.id до коммита
         return ps
 
-    # C/U (upsert)
-    def upsert_result(self, person_id: int, data: ElGanzouriInput) -> ElGanzouriRead:
-        ps = self._get_or_create_person_scales(person_id)
-
-        res = self.elg_repo.get_by_scales_id(ps.id)
-        if res is None:
-            res = ElGanzouriResult(scales_id=ps.id)
-            self.elg_repo.add(res)
-
+    def apply_input(self, res: ElGanzouriResult, data: ElGanzouriInput) -> ElGanzouriResult:
         # map raw → enum
         res.mouth_opening = _cls_mouth_opening(data.interincisor_cm)
         res.thyromental = _cls_thyromental(data.thyromental_cm)
@@ -96,20 +88,28 @@ class ElGanzouriService:
         res.neck_ext_deg = data.neck_ext_deg
         res.weight_kg = data.weight_kg
         res.mallampati_raw = data.mallampati_raw
+        return res
+
+    # C/U (upsert)
+    def upsert_result(self, person_id: int, data: ElGanzouriInput) -> ElGanzouriRead:
+        ps = self._get_or_create_person_scales(person_id)
+
+        res = self.elg_repo.get_by_scales_id(ps.id)
+        if res is None:
+            res = ElGanzouriResult(scales_id=ps.id)
+            self.elg_repo.add(res)
+
+        self.apply_input(res, data)
 
         # статус в person_scales
         self.ps_repo.update_fields(ps, el_ganzouri_filled=True)
 
         self.session.commit()
-        self.session.refresh(res)
         return ElGanzouriRead.model_validate(res)
 
     # R
     def get_result(self, person_id: int) -> ElGanzouriRead:
-        ps = self.ps_repo.get_by_person_id(person_id)
-        if not ps:
-            raise NotFoundError("PersonScales not found")
-        res = self.elg_repo.get_by_scales_id(ps.id)
+        res = self.elg_repo.get_by_person_id(person_id)
         if not res:
             raise NotFoundError("ElGanzouriResult not found")
         return ElGanzouriRead.model_validate(res)
@@ -0,0 +1,646 @@
+import csv
+import os
+import tempfile
+from datetime import date, datetime, time, timedelta
+from enum import Enum
+from typing import Callable, Iterable, Iterator, Mapping, NamedTuple, Sequence
+
+from sqlalchemy import Enum as SAEnum, Select
+from sqlalchemy.orm import Session
+
+from database.models import ElGanzouriResult, Person, PersonScales, PersonSlices
+from database.repositories.export import ExportRepository
+from database.schemas.slice_fields import SLICE_FIELDS
+from database.services.scales import SCALES
+from database.services.slices import SLICES
+
+
+def _plain(value):
+    return value.value if isinstance(value, Enum) else value
+
+
+class ExportColumn(NamedTuple):
+    field: str  # поле таблицы (без префикса) — по нему выбираются колонки
+    name: str  # имя колонки в выгрузке
+    type: type  # Python-тип значения (для схемы Parquet)
+    sql: tuple  # колонки SELECT, из которых считается значение
+    convert: Callable | None = None  # значения sql -> значение; по умолчанию _plain
+
+
+class ExportTable(NamedTuple):
+    key: str
+    sheet: str  # "persons" | "scales" | "slices"
+    columns: tuple[ExportColumn, ...]
+    select: Callable[[ExportRepository, Sequence, Iterable[int] | None], Select]
+    models: tuple = ()  # модели, из которых читает select (кроме Person) — для версии данных
+
+    @property
+    def names(self) -> tuple[str, ...]:
+        return tuple(c.name for c in self.columns)
+
+    @property
+    def fields(self) -> tuple[str, ...]:
+        return tuple(c.field for c in self.columns)
+
+    def project(self, fields: Iterable[str]) -> "ExportTable":
+        """Только выбранные поля (в порядке таблицы): в SELECT попадут лишь их колонки."""
+        wanted = set(fields)
+        unknown = wanted.difference(self.fields)
+        if unknown:
+            raise ValueError(f"Unknown fields of {self.key}: {sorted(unknown)}")
+        return self._replace(columns=tuple(c for c in self.columns if c.field in wanted))
+
+    def sql_columns(self) -> list:
+        seen = {}
+        for column in self.columns:
+            for expr in column.sql:
+                seen.setdefault(id(expr), expr)
+        return list(seen.values())
+
+    def statement(self, repo: ExportRepository, person_ids) -> Select:
+        return self.select(repo, self.sql_columns(), person_ids)
+
+    def converter(self) -> Callable[[tuple], tuple]:
+        """Строка SELECT (patient_id, *sql_columns) -> значения колонок таблицы."""
+        positions = {id(expr): i for i, expr in enumerate(self.sql_columns(), start=1)}
+        plan = [(c.convert or _plain, [positions[id(e)] for e in c.sql]) for c in self.columns]
+        return lambda row: tuple(fn(*(row[i] for i in idx)) for fn, idx in plan)
+
+
+# выбор таблиц: список ключей (все поля) или {ключ: поля | None}
+Selection = Sequence[str] | Mapping[str, Sequence[str] | None]
+
+
+class ExportResult(NamedTuple):
+    """Колоночный результат: {таблица: {колонка: [значения по patient_ids]}}."""
+
+    patient_ids: list[int]
+    tables: dict[str, dict[str, list]]
+
+    def sheet(self, keys: Iterable[str]) -> dict[str, list]:
+        """Склейка выбранных таблиц в один лист; первая колонка — patient_id."""
+        out = {"patient_id": list(self.patient_ids)}
+        for key in keys:
+            out.update(self.tables.get(key, {}))
+        return out
+
+
+def _age(birth_date: date | None, ref: date | None) -> int | None:
+    # как Person.age: на дату включения, а без неё — на сегодня
+    if not birth_date:
+        return None
+    ref = ref or date.today()
+    return ref.year - birth_date.year - ((ref.month, ref.day) < (birth_date.month, birth_date.day))
+
+
+def _bmi(weight_kg, height_cm) -> float | None:
+    if not weight_kg or not height_cm:
+        return None
+    h_m = float(height_cm) / 100.0
+    return round(float(weight_kg) / (h_m * h_m), 1) if h_m > 0 else None
+
+
+def _python_type(column) -> type:
+    if isinstance(column.type, SAEnum) and column.type.enum_class is not None:
+        return type(next(iter(column.type.enum_class)).value)
+    return column.type.python_type
+
+
+def _stored(column, name: str) -> ExportColumn:
+    return ExportColumn(column.key, name, _python_type(column), (column,))
+
+
+_PERSON_COLUMNS = (
+    _stored(Person.card_number, "card_number"),
+    _stored(Person.last_name, "last_name"),
+    _stored(Person.first_name, "first_name"),
+    _stored(Person.patronymic, "patronymic"),
+    _stored(Person.inclusion_date, "inclusion_date"),
+    ExportColumn("anesthesia_type", "anesthesia_type", str, (Person.anesthesia_type,),
+                 lambda v: v.value if v else ""),
+    ExportColumn("age", "age", int, (Person.birth_date, Person.inclusion_date), _age),
+    _stored(Person.height, "height"),
+    _stored(Person.weight, "weight"),
+    ExportColumn("gender", "gender", str, (Person.gender,), lambda v: "Ж" if v else "М"),
+    ExportColumn("bmi", "bmi", float, (Person.weight, Person.height), _bmi),
+)
+
+_FLAG_COLUMNS = tuple(
+    # у пациента без строки PersonScales статусы пустые, а не False
+    ExportColumn(spec.flag, spec.flag, bool, (getattr(PersonScales, spec.flag),),
+                 lambda v: None if v is None else bool(v))
+    for spec in SCALES.values()
+)
+
+# префиксы колонок шкал в выгрузке (исторические имена)
+_SCALE_PREFIX = {"el_ganzouri": "elg", "lee_rcri": "rcri"}
+
+# total_score El-Ganzouri — гибридное свойство по 7 категориям, считается в Python
+_ELG_CATEGORIES = (
+    ElGanzouriResult.mouth_opening, ElGanzouriResult.thyromental, ElGanzouriResult.mallampati,
+    ElGanzouriResult.neck_mobility, ElGanzouriResult.mandible_protrusion,
+    ElGanzouriResult.weight_band, ElGanzouriResult.diff_intubation_hx,
+)
+
+
+def _elg_total(*categories) -> int | None:
+    return sum(c.value for c in categories) if all(c is not None for c in categories) else None
+
+
+def _scale_table(key: str) -> ExportTable:
+    spec = SCALES[key]
+    table = spec.model.__table__
+    prefix = _SCALE_PREFIX.get(key, key)
+    columns = []
+    for field in spec.read_schema.model_fields:
+        if field in ("id", "scales_id"):
+            continue
+        name = f"{prefix}_{field}"
+        if field in table.c:
+            columns.append(_stored(table.c[field], name))
+        else:  # вычисляемое поле — total_score El-Ganzouri
+            columns.append(ExportColumn(field, name, int, _ELG_CATEGORIES, _elg_total))
+    return ExportTable(
+        key,
+        "scales",
+        tuple(columns),
+        lambda repo, sql, ids: repo.scale_stmt(spec.model, sql, ids, spec.timepoint),
+        (PersonScales, spec.model),
+    )
+
+
+def _slice_table(timepoint: int) -> ExportTable:
+    spec = SLICES[timepoint]
+    table = spec.model.__table__
+    prefix = f"t{timepoint}"
+    return ExportTable(
+        prefix,
+        "slices",
+        tuple(_stored(table.c[f], f"{prefix}_{f}") for f in spec.input_schema.model_fields),
+        lambda repo, sql, ids: repo.slice_stmt(spec.model, sql, ids),
+        (PersonSlices, spec.model),
+    )
+
+
+TABLES: dict[str, ExportTable] = {
+    "persons": ExportTable(
+        "persons", "persons", _PERSON_COLUMNS,
+        lambda repo, sql, ids: repo.persons_stmt(sql, ids),
+    ),
+    "scales_status": ExportTable(
+        "scales_status", "scales", _FLAG_COLUMNS,
+        lambda repo, sql, ids: repo.scale_flags_stmt(sql, ids),
+        (PersonScales,),
+    ),
+    **{key: _scale_table(key) for key in SCALES},
+    **{f"t{t}": _slice_table(t) for t in SLICES},
+}
+
+
+def resolve_selection(tables: Selection) -> list[ExportTable]:
+    """Выбор -> таблицы реестра с выбранными полями; таблицы без полей отбрасываются."""
+    items = list(tables.items()) if isinstance(tables, Mapping) else [(k, None) for k in tables]
+    unknown = [key for key, _ in items if key not in TABLES]
+    if unknown:
+        raise ValueError(f"Unknown export tables: {unknown}")
+    resolved = [TABLES[key] if fields is None else TABLES[key].project(fields) for key, fields in items]
+    return [table for table in resolved if table.columns]
+
+
+def selection_dict(tables: Selection) -> dict[str, list[str] | None]:
+    """Выбор в сериализуемом виде {ключ: поля | None} (с проверкой ключей и полей)."""
+    resolve_selection(tables)
+    if isinstance(tables, Mapping):
+        return {key: None if fields is None else list(fields) for key, fields in tables.items()}
+    return dict.fromkeys(tables)
+
+
+# готовые наборы полей срезов для типичных исследований (+ карточка пациента)
+EXPORT_PRESETS: dict[str, tuple[str, ...]] = {
+    "Гемодинамика": (
+        "date", "time", "heart_rate", "sbp", "dbp", "map", "spo2", "stroke_volume",
+        "cardiac_index", "svri", "cao", "do2", "urine_ml_per_h", "lactate_arterial",
+    ),
+    "Дыхание": (
+        "date", "time", "rr_spont", "spo2", "fio2", "etco2", "vt", "f", "mv", "peep", "ppik",
+        "rplato", "delta_p", "cstat", "cdyn", "pao2", "paco2", "pao2_fio2", "sao2",
+        "ph_arterial", "fev1", "fvc", "frc", "tlc", "rv", "fev1_fvc", "pef",
+        "mef25", "mef50", "mef75", "fef25_75",
+    ),
+}
+
+
+def preset_selection(fields: Iterable[str]) -> dict[str, list[str] | None]:
+    """Набор полей -> выбор: карточка целиком и эти поля во всех срезах, где они есть."""
+    fields = list(fields)
+    selection: dict[str, list[str] | None] = {"persons": None}
+    for key, table in TABLES.items():
+        if table.sheet == "slices":
+            present = [f for f in fields if f in table.fields]
+            if present:
+                selection[key] = present
+    return selection
+
+
+EXPORT_CHUNK = int(os.getenv("EXPORT_CHUNK", "1000"))
+
+EXPORT_FORMATS = ("csv", "parquet", "xlsx")
+
+# артефакт с более свежими правками не кэшируется: транзакция, начатая раньше
+# и зафиксированная позже выгрузки, не сдвинет max(updated_at)
+EXPORT_CACHE_SETTLE = timedelta(seconds=int(os.getenv("EXPORT_CACHE_SETTLE_S", "5")))
+
+# wide — строка на пациента; long — строка на непустое значение среза
+EXPORT_LAYOUTS = ("wide", "long")
+
+# длинный формат срезов: значение лежит в колонке своего типа, остальные пустые
+LONG_HEADER = (
+    "patient_id", "timepoint", "date", "time", "parameter", "label", "unit",
+    "value_num", "value_bool", "value_text",
+)
+LONG_TYPES = (int, int, date, time, str, str, str, float, bool, str)
+_LONG_SLOT = {float: 7, bool: 8, str: 9}
+
+# запас отметки дельта-выгрузки: транзакции, начатые до выгрузки и
+# зафиксированные после, попадут в следующую дельту (строки могут повториться)
+EXPORT_DELTA_OVERLAP = timedelta(seconds=int(os.getenv("EXPORT_DELTA_OVERLAP_S", "300")))
+
+# листы xlsx: колонки каких таблиц (ExportTable.sheet) попадают на лист
+XLSX_SHEETS = {
+    "Шкалы": ("persons", "scales"),
+    "Срезы": ("persons", "slices"),
+}
+XLSX_LONG_SHEET = "Срезы"
+
+
+def write_csv(path: str, header: Sequence[str], chunks: Iterable[list[tuple]]) -> int:
+    # utf-8-sig — чтобы Excel сразу открывал кириллицу; bool -> 1/0, как в xlsx
+    written = 0
+    with open(path, "w", newline="", encoding="utf-8-sig") as fh:
+        writer = csv.writer(fh)
+        writer.writerow(header)
+        for chunk in chunks:
+            writer.writerows(
+                [int(v) if isinstance(v, bool) else v for v in row] for row in chunk
+            )
+            written += len(chunk)
+    return written
+
+
+def write_parquet(
+    path: str, header: Sequence[str], types: Sequence[type], chunks: Iterable[list[tuple]]
+) -> int:
+    """Каждая порция — отдельная row group; схема задана заранее по типам колонок."""
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    arrow_types = {
+        bool: pa.bool_(), int: pa.int64(), float: pa.float64(), str: pa.string(),
+        date: pa.date32(), datetime: pa.timestamp("us"), time: pa.time64("us"),
+    }
+    schema = pa.schema([(name, arrow_types.get(t, pa.string())) for name, t in zip(header, types)])
+    written = 0
+    with pq.ParquetWriter(path, schema) as writer:
+        for chunk in chunks:
+            arrays = [
+                pa.array([row[i] for row in chunk], type=field.type)
+                for i, field in enumerate(schema)
+            ]
+            writer.write_table(pa.Table.from_arrays(arrays, schema=schema))
+            written += len(chunk)
+    return written
+
+
+def write_xlsx(
+    target, header: Sequence[str], sheets: dict[str, Sequence[int]], chunks: Iterable[list[tuple]]
+) -> int:
+    """
+    XLSX в режиме openpyxl write_only: строки сразу уходят во временные файлы
+    листов, в памяти нет графа ячеек. sheets — {лист: индексы колонок строки}.
+    target — путь или бинарный файловый объект.
+    """
+    from openpyxl import Workbook
+
+    wb = Workbook(write_only=True)
+    layout = [(wb.create_sheet(name), list(idx)) for name, idx in sheets.items()]
+    for ws, idx in layout:
+        ws.append([header[i] for i in idx])
+    written = 0
+    for chunk in chunks:
+        for row in chunk:
+            row = [int(v) if isinstance(v, bool) else v for v in row]
+            for ws, idx in layout:
+                ws.append([row[i] for i in idx])
+        written += len(chunk)
+    wb.save(target)
+    return written
+
+
+def _person_ids(person_ids):
+    # список материализуется один раз; подзапрос (Select) передаётся как есть
+    if person_ids is None or isinstance(person_ids, Select):
+        return person_ids
+    return list(person_ids)
+
+
+def _reporting(chunks: Iterable[list[tuple]], progress: Callable[[int], None]):
+    done = 0
+    for chunk in chunks:
+        yield chunk
+        done += len(chunk)
+        progress(done)
+
+
+class LongSlice(NamedTuple):
+    """Срез в длинной выгрузке: запрос непустых строк и план разворота колонок."""
+
+    timepoint: int
+    stmt: Select
+    # (parameter, label, unit, позиция в строке SELECT, колонка значения в LONG_HEADER)
+    params: tuple[tuple[str, str, str, int, int], ...]
+
+
+def _long_slice(repo: ExportRepository, table: ExportTable, person_ids) -> LongSlice | None:
+    timepoint = int(table.key[1:])
+    model = SLICES[timepoint].model
+    labels = {name: (label, unit) for name, label, unit, _ in SLICE_FIELDS[timepoint]}
+    # дата и время среза — колонки каждой строки, а не параметры
+    values = [c for c in table.columns if c.field not in ("date", "time")]
+    if not values:
+        return None
+    stmt = repo.slice_rows_stmt(
+        model, (model.date, model.time), [c.sql[0] for c in values], person_ids
+    )
+    params = tuple(
+        (c.field, *labels.get(c.field, (c.field, "")), pos, _LONG_SLOT[c.type])
+        for pos, c in enumerate(values, start=3)
+    )
+    return LongSlice(timepoint, stmt, params)
+
+
+class DataVersion(NamedTuple):
+    token: str  # (count, max(updated_at)) таблиц выбора; другой token — другие данные
+    settled: bool  # последняя правка старше EXPORT_CACHE_SETTLE — по token можно кэшировать
+
+
+class ExportDelta(NamedTuple):
+    path: str
+    rows: int
+    since: datetime | None  # None — полная выгрузка (у потока ещё не было отметки)
+    watermark: datetime
+    # id пациентов, удалённых с since (при полной выгрузке — пусто); применять до строк файла:
+    # в SQLite id удалённого может достаться новому пациенту
+    deleted: list[int]
+
+
+class ExportService:
+    """Выгрузка пациентов: один SELECT на таблицу, независимо от числа пациентов."""
+
+    def __init__(self, session: Session):
+        self.session = session
+        self.repo = ExportRepository(session)
+
+    def export(self, tables: Selection, person_ids: Iterable[int] | None = None) -> ExportResult:
+        specs = resolve_selection(tables)
+        person_ids = _person_ids(person_ids)
+
+        patient_ids: list[int] | None = None
+        out: dict[str, dict[str, list]] = {}
+        for table in specs:
+            rows = self.repo.fetch(table.statement(self.repo, person_ids))
+            if patient_ids is None:
+                patient_ids = [row[0] for row in rows]
+            convert = table.converter()
+            values = [convert(row) for row in rows]
+            out[table.key] = {
+                name: [v[i] for v in values] for i, name in enumerate(table.names)
+            }
+
+        if patient_ids is None:
+            patient_ids = [row[0] for row in self.repo.fetch(self.repo.persons_stmt((), person_ids))]
+        return ExportResult(patient_ids, out)
+
+    @staticmethod
+    def header(tables: Selection) -> list[str]:
+        return ["patient_id", *(n for table in resolve_selection(tables) for n in table.names)]
+
+    @staticmethod
+    def sheet_layout(tables: Selection) -> dict[str, list[int]]:
+        """Индексы колонок широкой строки для каждого листа XLSX_SHEETS."""
+        layout = {name: [0] for name in XLSX_SHEETS}
+        pos = 1
+        for table in resolve_selection(tables):
+            idx = range(pos, pos + len(table.columns))
+            for name, kinds in XLSX_SHEETS.items():
+                if table.sheet in kinds:
+                    layout[name].extend(idx)
+            pos += len(table.columns)
+        return layout
+
+    def iter_chunks(
+        self,
+        tables: Selection,
+        person_ids: Iterable[int] | None = None,
+        chunk_size: int = EXPORT_CHUNK,
+    ) -> Iterator[list[tuple]]:
+        """
+        Широкие строки (patient_id, колонки всех таблиц) порциями по chunk_size.
+        Запросы таблиц читаются параллельно курсорами (yield_per) и склеиваются
+        по позиции, а в Postgres (psycopg) идут одним JOIN-запросом через COPY.
+        В памяти всегда не больше одной порции.
+        """
+        specs = resolve_selection(tables)
+        person_ids = _person_ids(person_ids)
+        stmts = [table.statement(self.repo, person_ids) for table in specs]
+        converters = [table.converter() for table in specs]
+        if not stmts:
+            stmts = [self.repo.persons_stmt((), person_ids)]
+        if self.repo.copy_supported:
+            yield from self._iter_combined(stmts, converters, chunk_size)
+            return
+        streams = [self.repo.stream(stmt, chunk_size) for stmt in stmts]
+
+        for parts in zip(*streams):
+            ids = [row[0] for row in parts[0]]
+            chunk = [[pid] for pid in ids]
+            for table, convert, part in zip(specs, converters, parts):
+                if [row[0] for row in part] != ids:
+                    raise RuntimeError(f"Export table {table.key} is out of order")
+                for out, row in zip(chunk, part):
+                    out.extend(convert(row))
+            yield [tuple(row) for row in chunk]
+
+    def _iter_combined(self, stmts: list[Select], converters: list, chunk_size: int):
+        # COPY — один поток на соединение: таблицы склеиваются JOIN'ом в одном запросе
+        widths = [len(stmt.selected_columns) - 1 for stmt in stmts]
+        for part in self.repo.stream(self.repo.combine(stmts), chunk_size):
+            chunk = []
+            for row in part:
+                out, pos = [row[0]], 1
+                for convert, width in zip(converters, widths):
+                    out.extend(convert((row[0], *row[pos:pos + width])))
+                    pos += width
+                chunk.append(tuple(out))
+            yield chunk
+
+    def _long_slices(self, tables: Selection, person_ids) -> list[LongSlice]:
+        # карточка и шкалы в длинный формат не входят — только выбранные срезы
+        specs = [t for t in resolve_selection(tables) if t.sheet == "slices"]
+        return [s for s in (_long_slice(self.repo, t, person_ids) for t in specs) if s]
+
+    def iter_long_chunks(
+        self,
+        tables: Selection,
+        person_ids: Iterable[int] | None = None,
+        chunk_size: int = EXPORT_CHUNK,
+        progress: Callable[[int], None] | None = None,
+    ) -> Iterator[list[tuple]]:
+        """
+        Срезы в длинном виде (LONG_HEADER): строка на каждое непустое значение.
+        На срез — один SELECT только по заполненным строкам; NULL отбрасываются
+        при развороте, так что пустые ячейки широкой строки не создаются вовсе.
+        progress получает число прочитанных строк срезов.
+        """
+        done = 0
+        for sl in self._long_slices(tables, _person_ids(person_ids)):
+            for part in self.repo.stream(sl.stmt, chunk_size):
+                chunk = []
+                for row in part:
+                    head = (row[0], sl.timepoint, row[1], row[2])
+                    for name, label, unit, pos, slot in sl.params:
+                        value = row[pos]
+                        if value is None:
+                            continue
+                        out = [*head, name, label, unit, None, None, None]
+                        out[slot] = value
+                        chunk.append(tuple(out))
+                done += len(part)
+                if progress is not None:
+                    progress(done)
+                if chunk:
+                    yield chunk
+
+    def count_long(self, tables: Selection, person_ids: Iterable[int] | None = None) -> int:
+        """Число заполненных строк выбранных срезов — объём работы длинной выгрузки."""
+        slices = self._long_slices(tables, _person_ids(person_ids))
+        return sum(self.repo.count_rows(sl.stmt) for sl in slices)
+
+    def count(self, person_ids: Iterable[int] | None = None) -> int:
+        return self.repo.count(person_ids)
+
+    def data_version(self, tables: Selection, layout: str = "wide") -> DataVersion:
+        """Дешёвый отпечаток данных выбранных таблиц: один запрос агрегатов."""
+        specs = resolve_selection(tables)
+        if layout == "long":
+            specs = [t for t in specs if t.sheet == "slices"]
+        models = list(dict.fromkeys(m for t in specs for m in t.models))
+        now, values = self.repo.data_version([Person, *models])
+        latest = max((v[1] for v in values if v[1] is not None), default=None)
+        token = ";".join(
+            f"{m.__tablename__}:{count}:{stamp}" for m, (count, stamp) in zip([Person, *models], values)
+        )
+        return DataVersion(token, latest is None or now - latest >= EXPORT_CACHE_SETTLE)
+
+    def write(
+        self,
+        tables: Selection,
+        fmt: str = "csv",
+        path: str | None = None,
+        person_ids: Iterable[int] | None = None,
+        chunk_size: int = EXPORT_CHUNK,
+        progress: Callable[[int], None] | None = None,
+        layout: str = "wide",
+    ) -> tuple[str, int]:
+        """
+        Потоковая выгрузка в файл CSV/Parquet/XLSX (по умолчанию — временный).
+        layout="long" — срезы в длинном виде (iter_long_chunks). progress
+        вызывается после каждой порции с числом обработанных строк источника
+        (пациентов или строк срезов); исключение из него прерывает выгрузку.
+        Возвращает (путь, строк записано).
+        """
+        if fmt not in EXPORT_FORMATS:
+            raise ValueError(f"Unknown export format: {fmt}")
+        if layout not in EXPORT_LAYOUTS:
+            raise ValueError(f"Unknown export layout: {layout}")
+        if path is None:
+            fd, path = tempfile.mkstemp(prefix="patients_export_", suffix=f".{fmt}")
+            os.close(fd)
+        if layout == "long":
+            header, types = list(LONG_HEADER), list(LONG_TYPES)
+            sheets = {XLSX_LONG_SHEET: range(len(header))}
+            chunks = self.iter_long_chunks(tables, person_ids, chunk_size, progress)
+        else:
+            header = self.header(tables)
+            types = [int, *(c.type for table in resolve_selection(tables) for c in table.columns)]
+            sheets = self.sheet_layout(tables)
+            chunks = self.iter_chunks(tables, person_ids, chunk_size)
+            if progress is not None:
+                chunks = _reporting(chunks, progress)
+        if fmt == "parquet":
+            return path, write_parquet(path, header, types, chunks)
+        if fmt == "xlsx":
+            return path, write_xlsx(path, header, sheets, chunks)
+        return path, write_csv(path, header, chunks)
+
+    def presets(self) -> dict[str, dict[str, list[str] | None]]:
+        """Готовые наборы, затем сохранённые (одноимённый сохранённый перекрывает готовый)."""
+        out = {name: preset_selection(fields) for name, fields in EXPORT_PRESETS.items()}
+        out.update((p.name, p.selection) for p in self.repo.list_presets())
+        return out
+
+    def save_preset(self, name: str, tables: Selection) -> str:
+        name = name.strip()
+        if not name:
+            raise ValueError("Preset name is empty")
+        self.repo.save_preset(name, selection_dict(tables))
+        self.session.commit()
+        return name
+
+    def delete_preset(self, name: str) -> bool:
+        deleted = self.repo.delete_preset(name)
+        self.session.commit()
+        return deleted
+
+    def watermark(self, feed: str) -> datetime | None:
+        mark = self.repo.get_watermark(feed)
+        return mark.watermark if mark else None
+
+    @staticmethod
+    def _person_models() -> tuple[list[type], list[type]]:
+        # модели шкал (MMSE — одна на два timepoint) и срезов пациента
+        return list(dict.fromkeys(spec.model for spec in SCALES.values())), [spec.model for spec in SLICES.values()]
+
+    def changed_person_ids(self, since: datetime) -> Select:
+        """Подзапрос id пациентов, изменённых с since (карточка, статусы, шкалы, срезы)."""
+        return self.repo.changed_person_ids_stmt(since, *self._person_models())
+
+    def person_version(self, person_id: int) -> DataVersion:
+        """Отпечаток данных одного пациента (карточка, шкалы, срезы) — ключ кэша его выгрузки."""
+        now, count, latest = self.repo.person_data_version(person_id, *self._person_models())
+        return DataVersion(f"{person_id}:{count}:{latest}", latest is None or now - latest >= EXPORT_CACHE_SETTLE)
+
+    def write_delta(
+        self,
+        tables: Selection,
+        fmt: str = "csv",
+        feed: str = "default",
+        path: str | None = None,
+        since: datetime | None = None,
+        chunk_size: int = EXPORT_CHUNK,
+    ) -> ExportDelta:
+        """
+        Выгрузка только пациентов, изменённых с отметки потока feed (или явного
+        since), целыми строками. Без отметки — полная выгрузка. Новая отметка
+        (время БД на начало выгрузки минус EXPORT_DELTA_OVERLAP) сохраняется
+        только после успешной записи файла. Удалённые пациенты в файл не
+        попадают — их id возвращаются в ExportDelta.deleted.
+        """
+        if since is None:
+            since = self.watermark(feed)
+        watermark = self.repo.db_now() - EXPORT_DELTA_OVERLAP
+        person_ids = None if since is None else self.changed_person_ids(since)
+        deleted = [] if since is None else self.repo.deleted_person_ids(since)
+        path, rows = self.write(tables, fmt, path, person_ids, chunk_size)
+        self.repo.save_watermark(feed, watermark, rows)
+        self.session.commit()
+        return ExportDelta(path, rows, since, watermark, deleted)
@@ -29,13 +29,7 @@ class LasVegasService:
             self.session.flush()
         return ps
 
-    def upsert_result(self, person_id: int, data: LasVegasInput) -> LasVegasRead:
-        ps = self._get_or_create_ps(person_id)
-        res = self.repo.get_by_scales_id(ps.id)
-        if res is None:
-            res = LasVegasResult(scales_id=ps.id)
-            self.repo.add(res)
-
+    def apply_input(self, res: LasVegasResult, data: LasVegasInput) -> LasVegasResult:
         # assign fields
         res.age_years = int(data.age_years)
         res.asa_ps = int(data.asa_ps)
@@ -80,11 +74,19 @@ class LasVegasService:
 
         res.total_score = score
         res.risk_level = _risk_level(score)
+        return res
+
+    def upsert_result(self, person_id: int, data: LasVegasInput) -> LasVegasRead:
+        ps = self._get_or_create_ps(person_id)
+        res = self.repo.get_by_scales_id(ps.id)
+        if res is None:
+            res = LasVegasResult(scales_id=ps.id)
+            self.repo.add(res)
+
+        self.apply_input(res, data)
 
         self.ps_repo.update_fields(ps, las_vegas_filled=True)
         self.session.commit()
-        self.session.refresh(res)
-        self.session.refresh(ps)
         return LasVegasRead.model_validate(res)
 
     def clear_result(self, person_id: int) -> bool:
@@ -98,10 +100,7 @@ class LasVegasService:
         return bool(affected)
 
     def get_result(self, person_id: int) -> LasVegasRead:
-        ps = self.ps_repo.get_by_person_id(person_id)
-        if not ps:
-            raise NotFoundError("PersonScales not found")
-        res = self.repo.get_by_scales_id(ps.id)
+        res = self.repo.get_by_person_id(person_id)
         if not res:
             raise NotFoundError("LasVegasResult not found")
         return LasVegasRead.model_validate(res)
@@ -56,16 +56,9 @@ class LeeRcriService:
         ])
         obj.risk_percent = _score_to_risk_percent(obj.total_score)
 
-    def upsert_result(self, person_id: int, data: LeeRcriInput | LeeRcriUpdate) -> LeeRcriRead:
-        ps = self._get_or_create_ps(person_id)
-        res = self.repo.get_by_scales_id(ps.id)
-
+    def apply_input(self, res: LeeRcriResult, data: LeeRcriInput | LeeRcriUpdate) -> LeeRcriResult:
         payload = data.model_dump(exclude_unset=True)
 
-        if res is None:
-            res = LeeRcriResult(scales_id=ps.id)
-            self.repo.add(res)
-
         # обновляем бинарные поля, если пришли
         for f in ("high_risk_surgery",
                   "ischemic_heart_disease",
@@ -84,19 +77,26 @@ class LeeRcriService:
 
         # пересчёт
         self._recalc_totals(res)
+        return res
+
+    def upsert_result(self, person_id: int, data: LeeRcriInput | LeeRcriUpdate) -> LeeRcriRead:
+        ps = self._get_or_create_ps(person_id)
+        res = self.repo.get_by_scales_id(ps.id)
+
+        if res is None:
+            res = LeeRcriResult(scales_id=ps.id)
+            self.repo.add(res)
+
+        self.apply_input(res, data)
 
         # флаг заполнения
         self.ps_repo.update_fields(ps, lee_rcri_filled=True)
 
         self.session.commit()
-        self.session.refresh(res)
         return LeeRcriRead.model_validate(res)
 
     def get_result(self, person_id: int) -> LeeRcriRead:
-        ps = self.ps_repo.get_by_person_id(person_id)
-        if not ps:
-            raise NotFoundError("PersonScales not found")
-        res = self.repo.get_by_scales_id(ps.id)
+        res = self.repo.get_by_person_id(person_id)
         if not res:
             raise NotFoundError("LeeRcriResult not found")
         return LeeRcriRead.model_validate(res)
@@ -36,6 +36,13 @@ class MMSEService:
             self.session.flush()
         return ps
 
+    def apply_input(self, res: MMSEResult, data: MMSEInput) -> MMSEResult:
+        for field in MMSE_FIELDS:
+            setattr(res, field, int(getattr(data, field)))
+
+        res.total_score = sum(getattr(res, f) for f in MMSE_FIELDS)
+        return res
+
     def upsert_result(self, person_id: int, timepoint: int, data: MMSEInput) -> MMSEResultRead:
         ps = self._get_or_create_ps(person_id)
         res = self.repo.get_by_scales_and_time(ps.id, timepoint)
@@ -43,10 +50,7 @@ class MMSEService:
             res = MMSEResult(scales_id=ps.id, timepoint=timepoint)
             self.repo.add(res)
 
-        for field in MMSE_FIELDS:
-            setattr(res, field, int(getattr(data, field)))
-
-        res.total_score = sum(getattr(res, f) for f in MMSE_FIELDS)
+        self.apply_input(res, data)
 
         if timepoint == 0:
             self.ps_repo.update_fields(ps, mmse_t0_filled=True)
@@ -54,15 +58,10 @@ class MMSEService:
             self.ps_repo.update_fields(ps, mmse_t10_filled=True)
 
         self.session.commit()
-        self.session.refresh(res)
-        self.session.refresh(ps)
         return MMSEResultRead.model_validate(res)
 
     def get_result(self, person_id: int, timepoint: int) -> MMSEResultRead:
-        ps = self.ps_repo.get_by_person_id(person_id)
-        if not ps:
-            raise NotFoundError("PersonScales not found")
-        res = self.repo.get_by_scales_and_time(ps.id, timepoint)
+        res = self.repo.get_by_person_and_time(person_id, timepoint)
         if not res:
             raise NotFoundError("MMSEResult not found")
         return MMSEResultRead.model_validate(res)
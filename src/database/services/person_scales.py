@@ -1,8 +1,12 @@
 from sqlalchemy.orm import Session
 
 from database.models import PersonScales
-from database.repositories.person_scales import PersonScalesRepository
-from database.schemas.person_scales import PersonScalesRead, PersonScalesUpdate
+from database.repositories.person_scales import SCALE_RESULT_RELATIONS, PersonScalesRepository
+from database.schemas.person_scales import (
+    PersonScalesRead,
+    PersonScalesResults,
+    PersonScalesUpdate,
+)
 from database.services.utils import NotFoundError
 
 
@@ -30,6 +34,22 @@ class PersonScalesService:
             raise NotFoundError(f"PersonScales for person #{person_id} not found")
         return PersonScalesRead.model_validate(ps)
 
+    def get_results(self, person_id: int) -> PersonScalesResults:
+        """Результаты всех шкал пациента не более чем за два запроса."""
+        ps = self.repo.get_with_results(person_id)
+        if ps is None:
+            # у пациента ещё нет ни одной шкалы
+            return PersonScalesResults()
+        return self.results_of(ps)
+
+    @staticmethod
+    def results_of(ps: PersonScales) -> PersonScalesResults:
+        """Собирает PersonScalesResults из PersonScales с уже загруженными связями."""
+        mmse = {r.timepoint: r for r in ps.mmse_results}
+        data = {rel: getattr(ps, rel) for rel in SCALE_RESULT_RELATIONS}
+        data.update(mmse_t0=mmse.get(0), mmse_t10=mmse.get(10))
+        return PersonScalesResults.model_validate(data, from_attributes=True)
+
     # C (idempotent create/ensure)
     def ensure(self, person_id: int) -> PersonScalesRead:
         ps = self._ensure(person_id)
@@ -41,7 +61,6 @@ class PersonScalesService:
         ps = self._ensure(person_id)
         self.repo.update_fields(ps, **data.model_dump(exclude_unset=True))
         self.session.commit()
-        self.session.refresh(ps)
         return PersonScalesRead.model_validate(ps)
 
     # Удобные шорткаты по одной шкале (если нужно)
@@ -70,7 +89,6 @@ class PersonScalesService:
         ps = self._ensure(person_id)
         setattr(ps, scale_name, bool(value))
         self.session.commit()
-        self.session.refresh(ps)
         return PersonScalesRead.model_validate(ps)
 
     # D (опционально — подчистить все статусы пациента)
@@ -36,7 +36,6 @@ class PersonSlicesService:
         ps = self._ensure(person_id)
         self.repo.update_fields(ps, **data.model_dump(exclude_unset=True))
         self.session.commit()
-        self.session.refresh(ps)
         return PersonSlicesRead.model_validate(ps)
 
     def set_flag(self, person_id: int, slice_name: str, value: bool) -> PersonSlicesRead:
@@ -46,7 +45,6 @@ class PersonSlicesService:
         ps = self._ensure(person_id)
         setattr(ps, slice_name, bool(value))
         self.session.commit()
-        self.session.refresh(ps)
         return PersonSlicesRead.model_validate(ps)
 
     def delete(self, person_id: int) -> bool:
@@ -3,10 +3,20 @@ from datetime import date
 
 from sqlalchemy.orm import Session
 from database.models import Person
-from database.repositories.persons import PersonsRepository
-from database.schemas.persons import PersonCreate, PersonRead, PersonUpdate
+from database.repositories.person_search import PersonSearchRepository
+from database.repositories.persons import PersonsRepository, SearchCursor
+from database.schemas.person_scales import PersonScalesResults
+from database.schemas.person_slices import PersonSlicesResults
+from database.person_index import remove_after_commit, upsert_after_commit
+from database.schemas.persons import (
+    PatientBundle,
+    PersonCreate,
+    PersonRead,
+    PersonSearchHit,
+    PersonSearchPage,
+    PersonUpdate,
+)
 from database.services.person_scales import PersonScalesService
-from database.services.person_slices import PersonSlicesService
 from database.services.utils import NotFoundError
 
 
@@ -20,25 +30,38 @@ class PersonsService:
     def create_person(self, data: PersonCreate) -> PersonRead:
         person = Person(**data.model_dump(exclude_none=True))
         self.repo.add(person)
+        upsert_after_commit(self.session, person)
         self.session.commit()
-        self.session.refresh(person)
         return PersonRead.model_validate(person)
 
     def get_person(self, person_id: int) -> PersonRead:
-        person = self.repo.get(person_id)
+        person = self.repo.get_with_details(person_id)
         if not person:
-            raise NotFoundError(...)
-        out = PersonRead.model_validate(person)
-        try:
-            out.scales = PersonScalesService(self.session).get(person_id)
-        except NotFoundError:
-            out.scales = None
+            raise NotFoundError(f"Person #{person_id} not found")
+        return PersonRead.model_validate(person)
 
-        try:
-            out.slices = PersonSlicesService(self.session).get(person_id)
-        except NotFoundError:
-            out.slices = None
-        return out
+    def get_bundle(self, person_id: int, header_only: bool = False) -> PatientBundle:
+        """
+        Снимок пациента за фиксированное число запросов:
+        header_only — карточка с флагами (2 запроса), иначе ещё все шкалы и срезы (3).
+        """
+        person = self.repo.get_with_details(person_id, results=not header_only)
+        if not person:
+            raise NotFoundError(f"Person #{person_id} not found")
+        bundle = PatientBundle(person=PersonRead.model_validate(person))
+        if header_only:
+            return bundle
+        bundle.scales = (
+            PersonScalesService.results_of(person.scales)
+            if person.scales is not None
+            else PersonScalesResults()
+        )
+        bundle.slices = (
+            PersonSlicesResults.model_validate(person.slices)
+            if person.slices is not None
+            else PersonSlicesResults()
+        )
+        return bundle
 
     def list_persons(self, limit: int = 100, offset: int = 0) -> list[PersonRead]:
         persons = self.repo.list(limit=limit, offset=offset)
@@ -49,12 +72,14 @@ class PersonsService:
         if not person:
             raise NotFoundError(f"Person #{person_id} not found")
         self.repo.update_fields(person, **data.model_dump(exclude_unset=True))
+        upsert_after_commit(self.session, person)
         self.session.commit()
-        self.session.refresh(person)
         return PersonRead.model_validate(person)
 
     def delete_person(self, person_id: int) -> bool:
         affected = self.repo.delete(person_id)
+        if affected:
+            remove_after_commit(self.session, person_id)
         self.session.commit()
         if affected == 0:
             raise NotFoundError(f"Person #{person_id} not found")
@@ -69,8 +94,11 @@ class PersonsService:
         age: int | None = None,
         card_number: str | None = None,
         inclusion_date: date | None = None,
+        match: str = "infix",
         limit: int = 50,
         offset: int = 0,
+        after: SearchCursor | None = None,
+        before: SearchCursor | None = None,
     ) -> List[PersonRead]:
         persons = self.repo.search(
             last_name=last_name,
@@ -79,7 +107,49 @@ class PersonsService:
             age=age,
             card_number=card_number,
             inclusion_date=inclusion_date,
+            match=match,
             limit=limit,
             offset=offset,
+            after=after,
+            before=before,
         )
         return [PersonRead.model_validate(p) for p in persons]
+
+    def search_page(
+        self,
+        *,
+        limit: int = 50,
+        after: SearchCursor | None = None,
+        before: SearchCursor | None = None,
+        **filters,
+    ) -> PersonSearchPage:
+        """Страница keyset-поиска: лишняя (limit+1) запись показывает, есть ли следующая."""
+        persons = list(self.repo.search(limit=limit + 1, after=after, before=before, **filters))
+        more = len(persons) > limit
+        if before is not None:
+            persons = persons[1:] if more else persons
+            has_prev, has_next = more, True
+        else:
+            persons = persons[:limit]
+            has_prev, has_next = after is not None, more
+        if not persons:
+            return PersonSearchPage(items=[])
+        first, last = persons[0], persons[-1]
+        return PersonSearchPage(
+            items=[PersonRead.model_validate(p) for p in persons],
+            prev_cursor=(first.last_name, first.first_name, first.id) if has_prev else None,
+            next_cursor=(last.last_name, last.first_name, last.id) if has_next else None,
+        )
+
+    def count_persons(self, **filters) -> int:
+        return self.repo.count(**filters)
+
+    def search_persons_fuzzy(self, query: str, limit: int = 20) -> List[PersonSearchHit]:
+        """Поиск с опечатками по ФИО и номеру истории, лучшие совпадения первыми."""
+        hits = PersonSearchRepository(self.session).fuzzy(query, limit)
+        persons = self.repo.get_many([person_id for person_id, _ in hits])
+        return [
+            PersonSearchHit(person=PersonRead.model_validate(persons[person_id]), similarity=score)
+            for person_id, score in hits
+            if person_id in persons
+        ]
@@ -18,6 +18,12 @@ class Qor15Service:
     def _get_or_create_ps(self, person_id: int) -> PersonScales:
         return self.ps_repo.get_or_create_for_person(person_id)
 
+    def apply_input(self, res: Qor15Result, data: Qor15Input) -> Qor15Result:
+        for i in range(1, 16):
+            setattr(res, f"q{i}", int(getattr(data, f"q{i}")))
+        res.total_score = sum(getattr(res, f"q{i}") for i in range(1, 16))
+        return res
+
     def upsert_result(self, person_id: int, data: Qor15Input) -> Qor15Read:
         ps = self._get_or_create_ps(person_id)
         res = self.repo.get_by_scales_id(ps.id)
@@ -25,15 +31,11 @@ class Qor15Service:
             res = Qor15Result(scales_id=ps.id)
             self.repo.add(res)
 
-        for i in range(1, 16):
-            setattr(res, f"q{i}", int(getattr(data, f"q{i}")))
-        res.total_score = sum(getattr(res, f"q{i}") for i in range(1, 16))
+        self.apply_input(res, data)
 
         self.ps_repo.update_fields(ps, qor15_filled=True)
 
         self.session.commit()
-        self.session.refresh(res)
-        self.session.refresh(ps)
         return Qor15Read.model_validate(res)
 
     def clear_result(self, person_id: int) -> bool:
@@ -47,10 +49,7 @@ class Qor15Service:
         return bool(affected)
 
     def get_result(self, person_id: int) -> Qor15Read:
-        ps = self.ps_repo.get_by_person_id(person_id)
-        if not ps:
-            raise NotFoundError("PersonScales not found")
-        res = self.repo.get_by_scales_id(ps.id)
+        res = self.repo.get_by_person_id(person_id)
         if not res:
             raise NotFoundError("Qor15Result not found")
         return Qor15Read.model_validate(res)
@@ -0,0 +1,68 @@
+from typing import NamedTuple
+
+from pydantic import BaseModel
+
+from database.models import (
+    AldreteResult,
+    AriscatResult,
+    Base,
+    CapriniResult,
+    ElGanzouriResult,
+    LasVegasResult,
+    LeeRcriResult,
+    MMSEResult,
+    Qor15Result,
+    SobaAssessment,
+    StopBangResult,
+)
+from database.schemas.aldrete import AldreteRead
+from database.schemas.ariscat import AriscatRead
+from database.schemas.caprini import CapriniRead
+from database.schemas.elganzouri import ElGanzouriRead
+from database.schemas.las_vegas import LasVegasRead
+from database.schemas.lee import LeeRcriRead
+from database.schemas.mmse import MMSEResultRead
+from database.schemas.qor15 import Qor15Read
+from database.schemas.soba import SobaRead
+from database.schemas.stopbang import StopBangRead
+from database.services.aldrete import AldreteService
+from database.services.ariscat import AriscatService
+from database.services.caprini import CapriniService
+from database.services.elganzouri import ElGanzouriService
+from database.services.las_vegas import LasVegasService
+from database.services.lee import LeeRcriService
+from database.services.mmse import MMSEService
+from database.services.qor15 import Qor15Service
+from database.services.soba import SobaService
+from database.services.stopbang import StopBangService
+
+
+class ScaleSpec(NamedTuple):
+    model: type[Base]
+    service: type
+    read_schema: type[BaseModel]
+    flag: str
+    timepoint: int | None = None
+
+
+# реестр шкал; ключи совпадают с полями PersonScalesResults
+SCALES: dict[str, ScaleSpec] = {
+    "el_ganzouri": ScaleSpec(ElGanzouriResult, ElGanzouriService, ElGanzouriRead, "el_ganzouri_filled"),
+    "ariscat": ScaleSpec(AriscatResult, AriscatService, AriscatRead, "ariscat_filled"),
+    "stopbang": ScaleSpec(StopBangResult, StopBangService, StopBangRead, "stopbang_filled"),
+    "soba": ScaleSpec(SobaAssessment, SobaService, SobaRead, "soba_filled"),
+    "lee_rcri": ScaleSpec(LeeRcriResult, LeeRcriService, LeeRcriRead, "lee_rcri_filled"),
+    "caprini": ScaleSpec(CapriniResult, CapriniService, CapriniRead, "caprini_filled"),
+    "las_vegas": ScaleSpec(LasVegasResult, LasVegasService, LasVegasRead, "las_vegas_filled"),
+    "aldrete": ScaleSpec(AldreteResult, AldreteService, AldreteRead, "aldrete_filled"),
+    "qor15": ScaleSpec(Qor15Result, Qor15Service, Qor15Read, "qor15_filled"),
+    "mmse_t0": ScaleSpec(MMSEResult, MMSEService, MMSEResultRead, "mmse_t0_filled", 0),
+    "mmse_t10": ScaleSpec(MMSEResult, MMSEService, MMSEResultRead, "mmse_t10_filled", 10),
+}
+
+
+def get_scale_spec(scale: str) -> ScaleSpec:
+    try:
+        return SCALES[scale]
+    except KeyError:
+        raise ValueError(f"Unknown scale: {scale}") from None
@@ -0,0 +1,171 @@
+from collections import namedtuple
+from functools import cache
+from typing import Iterable, NamedTuple
+
+from pydantic import BaseModel
+from sqlalchemy.orm import Session
+
+from database import models
+from database.models import PersonSlices
+from database.repositories.person_slices import PersonSlicesRepository
+from database.repositories.slices import SliceRepository
+from database.schemas.slice_t0 import SliceT0Input, SliceT0Read
+from database.schemas.slice_t1 import SliceT1Input, SliceT1Read
+from database.schemas.slice_t2 import SliceT2Input, SliceT2Read
+from database.schemas.slice_t3 import SliceT3Input, SliceT3Read
+from database.schemas.slice_t4 import SliceT4Input, SliceT4Read
+from database.schemas.slice_t5 import SliceT5Input, SliceT5Read
+from database.schemas.slice_t6 import SliceT6Input, SliceT6Read
+from database.schemas.slice_t7 import SliceT7Input, SliceT7Read
+from database.schemas.slice_t8 import SliceT8Input, SliceT8Read
+from database.schemas.slice_t9 import SliceT9Input, SliceT9Read
+from database.schemas.slice_t10 import SliceT10Input, SliceT10Read
+from database.schemas.slice_t11 import SliceT11Input, SliceT11Read
+from database.schemas.slice_t12 import SliceT12Input, SliceT12Read
+from database.services.utils import NotFoundError
+
+
+class SliceSpec(NamedTuple):
+    timepoint: int
+    model: type[models.Base]
+    input_schema: type[BaseModel]
+    read_schema: type[BaseModel]
+
+    @property
+    def name(self) -> str:
+        return f"T{self.timepoint}"
+
+    @property
+    def flag(self) -> str:
+        return f"t{self.timepoint}_filled"
+
+
+_SCHEMAS = [
+    (SliceT0Input, SliceT0Read),
+    (SliceT1Input, SliceT1Read),
+    (SliceT2Input, SliceT2Read),
+    (SliceT3Input, SliceT3Read),
+    (SliceT4Input, SliceT4Read),
+    (SliceT5Input, SliceT5Read),
+    (SliceT6Input, SliceT6Read),
+    (SliceT7Input, SliceT7Read),
+    (SliceT8Input, SliceT8Read),
+    (SliceT9Input, SliceT9Read),
+    (SliceT10Input, SliceT10Read),
+    (SliceT11Input, SliceT11Read),
+    (SliceT12Input, SliceT12Read),
+]
+
+# реестр срезов: номер точки -> модель и схемы
+SLICES: dict[int, SliceSpec] = {
+    t: SliceSpec(t, getattr(models, f"SliceT{t}"), inp, read)
+    for t, (inp, read) in enumerate(_SCHEMAS)
+}
+
+
+def get_slice_spec(timepoint: int) -> SliceSpec:
+    try:
+        return SLICES[timepoint]
+    except KeyError:
+        raise ValueError(f"Unknown slice timepoint: {timepoint}") from None
+
+
+@cache
+def slice_record(timepoint: int) -> type[tuple]:
+    """
+    Лёгкая запись среза для пакетной обработки: namedtuple с полями SliceTNRead
+    (атрибуты те же, _asdict() вместо model_dump()), без проверки Pydantic.
+    """
+    spec = get_slice_spec(timepoint)
+    return namedtuple(f"SliceT{timepoint}Record", spec.read_schema.model_fields)
+
+
+class SliceService:
+    """CRUD срезов T0–T12 по реестру SLICES и пакетное чтение нескольких точек."""
+
+    def __init__(self, session: Session):
+        self.session = session
+        self.ps_repo = PersonSlicesRepository(session)
+
+    def _repo(self, spec: SliceSpec) -> SliceRepository:
+        return SliceRepository(self.session, spec.model)
+
+    def _get_or_create_ps(self, person_id: int) -> PersonSlices:
+        ps = self.ps_repo.get_by_person_id(person_id)
+        if ps is None:
+            ps = PersonSlices(person_id=person_id)
+            self.ps_repo.add(ps)
+            self.session.flush()
+        return ps
+
+    def upsert(self, timepoint: int, person_id: int, data: BaseModel) -> BaseModel:
+        spec = get_slice_spec(timepoint)
+        repo = self._repo(spec)
+        ps = self._get_or_create_ps(person_id)
+        obj = repo.get_by_slices_id(ps.id)
+        if obj is None:
+            obj = spec.model(slices_id=ps.id)
+            repo.add(obj)
+        repo.update_fields(obj, **data.model_dump(exclude_unset=True))
+        self.ps_repo.update_fields(ps, **{spec.flag: True})
+        self.session.commit()
+        return spec.read_schema.model_validate(obj)
+
+    def get(self, timepoint: int, person_id: int) -> BaseModel:
+        spec = get_slice_spec(timepoint)
+        obj = self._repo(spec).get_by_person_id(person_id)
+        if not obj:
+            raise NotFoundError(f"Slice{spec.name} not found")
+        return spec.read_schema.model_validate(obj)
+
+    def delete(self, timepoint: int, person_id: int) -> bool:
+        spec = get_slice_spec(timepoint)
+        ps = self.ps_repo.get_by_person_id(person_id)
+        if not ps:
+            raise NotFoundError("PersonSlices not found")
+        affected = self._repo(spec).delete_by_slices_id(ps.id)
+        if affected:
+            self.ps_repo.update_fields(ps, **{spec.flag: False})
+        self.session.commit()
+        return bool(affected)
+
+    def get_many(
+        self,
+        person_ids: Iterable[int] | None = None,
+        timepoints: Iterable[int] | None = None,
+    ) -> dict[int, dict[int, BaseModel]]:
+        """
+        Срезы нескольких пациентов за несколько точек:
+        {person_id: {timepoint: SliceTNRead}}; незаполненных срезов в словаре нет.
+
+        Один SELECT на точку (плюс разбиение длинного списка person_ids),
+        а не отдельный запрос на каждую пару пациент × точка.
+        person_ids=None — все пациенты, timepoints=None — все T0–T12.
+        """
+        specs = [get_slice_spec(t) for t in (SLICES if timepoints is None else timepoints)]
+        ids = None if person_ids is None else list(person_ids)
+        result: dict[int, dict[int, BaseModel]] = {pid: {} for pid in ids or ()}
+        for spec in specs:
+            for person_id, obj in self._repo(spec).iter_by_person_ids(ids):
+                result.setdefault(person_id, {})[spec.timepoint] = spec.read_schema.model_validate(obj)
+        return result
+
+    def get_many_records(
+        self,
+        person_ids: Iterable[int] | None = None,
+        timepoints: Iterable[int] | None = None,
+    ) -> dict[int, dict[int, tuple]]:
+        """
+        Как get_many, но {person_id: {timepoint: slice_record(timepoint)}}:
+        значения берутся из Core-строк, без ORM-объектов и моделей Pydantic.
+        Для выгрузок и аналитики; формы по-прежнему работают через get_many.
+        """
+        specs = [get_slice_spec(t) for t in (SLICES if timepoints is None else timepoints)]
+        ids = None if person_ids is None else list(person_ids)
+        result: dict[int, dict[int, tuple]] = {pid: {} for pid in ids or ()}
+        for spec in specs:
+            record = slice_record(spec.timepoint)
+            rows = self._repo(spec).iter_rows_by_person_ids(ids, record._fields)
+            for person_id, *values in rows:
+                result.setdefault(person_id, {})[spec.timepoint] = record._make(values)
+        return result
@@ -16,41 +16,38 @@ class SobaService:
         # создаёт при отсутствии + flush() => ps.id гарантирован
         return self.scales_repo.get_or_create_for_person(person_id)
 
-    def _maybe_cache_stopbang(self, soba: SobaAssessment, ps) -> None:
-        if getattr(ps, "stopbang", None):
-            soba.stopbang_score_cached = getattr(ps.stopbang, "total_score", None)
-            soba.stopbang_risk_cached = getattr(ps.stopbang, "risk_level", None)
+    def _maybe_cache_stopbang(self, soba: SobaAssessment, stopbang) -> None:
+        if stopbang is not None:
+            soba.stopbang_score_cached = getattr(stopbang, "total_score", None)
+            soba.stopbang_risk_cached = getattr(stopbang, "risk_level", None)
+
+    def apply_input(self, soba: SobaAssessment, data: SobaCreate | SobaUpdate, stopbang=None) -> SobaAssessment:
+        # кэш STOP-BANG: для новой записи — всегда, для существующей — если пуст
+        is_new = soba.id is None
+        self.repo.update_fields(soba, **data.model_dump(exclude_unset=True))
+        if is_new or soba.stopbang_score_cached is None or soba.stopbang_risk_cached is None:
+            self._maybe_cache_stopbang(soba, stopbang)
+        return soba
 
     def upsert_for_person(self, person_id: int, data: SobaCreate | SobaUpdate) -> SobaRead:
         ps = self._ensure_scales(person_id)
 
         soba = self.repo.get_by_scales_id(ps.id)
-        payload = data.model_dump(exclude_unset=True)
-
         if soba is None:
             # ПРИВЯЗЫВАЕМ ЧЕРЕЗ RELATIONSHIP, а не через scales_id
-            soba = SobaAssessment(scales=ps, **payload)
-            self._maybe_cache_stopbang(soba, ps)
+            soba = SobaAssessment(scales=ps)
             self.session.add(soba)
-            ps.soba_filled = True
-        else:
-            self.repo.update_fields(soba, **payload)
-            if soba.stopbang_score_cached is None or soba.stopbang_risk_cached is None:
-                self._maybe_cache_stopbang(soba, ps)
-            ps.soba_filled = True
+
+        self.apply_input(soba, data, ps.stopbang)
+        ps.soba_filled = True
 
         # гарантируем, что всё пронумеровано до коммита
         self.session.flush()
         self.session.commit()
-        self.session.refresh(soba)
-        self.session.refresh(ps)
         return SobaRead.model_validate(soba)
 
     def get_for_person(self, person_id: int) -> SobaRead:
-        ps = self.scales_repo.get_by_person_id(person_id)
-        if not ps:
-            raise NotFoundError(f"SOBA for person #{person_id} not found")
-        soba = self.repo.get_by_scales_id(ps.id)
+        soba = self.repo.get_by_person_id(person_id)
         if not soba:
             raise NotFoundError(f"SOBA for person #{person_id} not found")
         return SobaRead.model_validate(soba)
@@ -33,13 +33,7 @@ class StopBangService:
             self.session.flush()
         return ps
 
-    def upsert_result(self, person_id: int, data: StopBangInput) -> StopBangRead:
-        ps = self._get_or_create_ps(person_id)
-        res = self.repo.get_by_scales_id(ps.id)
-        if res is None:
-            res = StopBangResult(scales_id=ps.id)
-            self.repo.add(res)
-
+    def apply_input(self, res: StopBangResult, data: StopBangInput) -> StopBangResult:
         # 1) Локальные булевы флаги (никаких None):
         s_snoring = bool(data.s_snoring)
         t_tired_daytime = bool(data.t_tired_daytime)
@@ -72,13 +66,21 @@ class StopBangService:
 
         # 4) Риск
         res.risk_level = _risk_level(res.total_score)
+        return res
+
+    def upsert_result(self, person_id: int, data: StopBangInput) -> StopBangRead:
+        ps = self._get_or_create_ps(person_id)
+        res = self.repo.get_by_scales_id(ps.id)
+        if res is None:
+            res = StopBangResult(scales_id=ps.id)
+            self.repo.add(res)
+
+        self.apply_input(res, data)
 
         # 5) Верный флаг заполненности:
         self.ps_repo.update_fields(ps, stopbang_filled=True)
 
         self.session.commit()
-        self.session.refresh(res)
-        self.session.refresh(ps)
         return StopBangRead.model_validate(res)
 
     def clear_result(self, person_id: int) -> bool:
@@ -93,10 +95,7 @@ class StopBangService:
         return bool(affected)
 
     def get_result(self, person_id: int) -> StopBangRead:
-        ps = self.ps_repo.get_by_person_id(person_id)
-        if not ps:
-            raise NotFoundError("PersonScales not found")
-        res = self.repo.get_by_scales_id(ps.id)
+        res = self.repo.get_by_person_id(person_id)
         if not res:
             raise NotFoundError("StopBangResult not found")
         return StopBangRead.model_validate(res)
@@ -1,4 +1,3 @@
-import io
 from importlib import import_module
 
 import pandas as pd
@@ -62,45 +61,41 @@ def _rcri_risk(score):
     return "≈11%+"
 
 
-def export_patient_data():
-    person_stub = st.session_state.get("current_patient_info")
-    if not person_stub:
-        st.error("Пациент не выбран.")
-        return
+EXPORT_PAGE_TTL_S = 600
 
-    st.title("📤 Выгрузка данных пациента")
 
-    # 1) Берём «свежего» пациента
-    person = _safe(db_funcs.get_person, person_stub.id, label="карточки пациента")
-    if not person:
-        st.error("Не удалось загрузить карточку пациента.")
-        return
+def _build_patient_export(person_id: int) -> tuple[dict, dict, bytes]:
+    """Строки листов «Шкалы» и «Срезы» и файл Excel одного пациента."""
+    # 1) Пациент сразу со всеми шкалами и срезами (3 запроса)
+    bundle = db_funcs.get_patient_bundle(person_id)
+    if bundle is None:
+        raise LookupError(f"пациент #{person_id} не найден")
+    person = bundle.person
 
-    # 2) Подтягиваем все шкалы (каждый вызов безопасный)
+    # 2) Шкалы
     from database.schemas.elganzouri import ElGanzouriRead
     from database.schemas.ariscat import AriscatRead
     from database.schemas.stopbang import StopBangRead
 
-    elg = _safe(db_funcs.elg_get_result, person.id, label="El-Ganzouri")  # -> ElGanzouriRead | None
-    ar = _safe(db_funcs.ar_get_result, person.id, label="ARISCAT")  # -> AriscatRead | None
-    sb = _safe(db_funcs.sb_get_result, person.id, label="STOP-BANG")  # -> StopBangRead | None
-    soba = _safe(db_funcs.get_soba, person.id, label="SOBA")  # -> SobaRead | None
-    rcri = _safe(db_funcs.rcri_get_result, person.id, label="RCRI")  # -> LeeRcriRead | None
-    cap = _safe(db_funcs.caprini_get_result, person.id, label="Caprini")  # -> CapriniRead | None
-    lv = _safe(db_funcs.lv_get_result, person.id, label="Las Vegas")
-    qor = _safe(db_funcs.qor15_get_result, person.id, label="QoR-15")
-    ald = _safe(db_funcs.ald_get_result, person.id, label="Aldrete")
-    mmse_t0 = _safe(db_funcs.mmse_get_result, person.id, 0, label="MMSE t0")
-    mmse_t10 = _safe(db_funcs.mmse_get_result, person.id, 10, label="MMSE t10")
-
-    # 2b) Подтягиваем все срезы динамически (T0…T12)
+    scales = bundle.scales
+    elg = scales.el_ganzouri
+    ar = scales.ariscat
+    sb = scales.stopbang
+    soba = scales.soba
+    rcri = scales.lee_rcri
+    cap = scales.caprini
+    lv = scales.las_vegas
+    qor = scales.qor15
+    ald = scales.aldrete
+    mmse_t0 = scales.mmse_t0
+    mmse_t10 = scales.mmse_t10
+
+    # 2b) Срезы (T0…T12)
     slices_data = []
     for idx in range(13):
-        getter = getattr(db_funcs, f"t{idx}_get_result", None)
-        data = _safe(getter, person.id, label=f"срез T{idx}") if getter else None
         schema_module = import_module(f"database.schemas.slice_t{idx}")
         schema_cls = getattr(schema_module, f"SliceT{idx}Input")
-        slices_data.append((f"T{idx}", data, schema_cls))
+        slices_data.append((f"T{idx}", getattr(bundle.slices, f"t{idx}"), schema_cls))
 
     # 3) Собираем одну строку с максимумом защит
     def g(obj, name, default=None):
@@ -187,7 +182,44 @@ def export_patient_data():
         for field in schema.model_fields.keys():
             row_slices[f"{name}: {field}"] = getattr(data, field, None) if data is not None else None
 
-    # 5) Покажем и дадим скачать
+    # 5) Одна строка: колонки обоих листов подряд, лист берёт свой диапазон
+    header = [*row_scales, *row_slices]
+    excel = db_funcs.export_xlsx_bytes(
+        header,
+        {"Шкалы": range(len(row_scales)), "Срезы": range(len(row_scales), len(header))},
+        [tuple(row_scales.values()) + tuple(row_slices.values())],
+    )
+    return row_scales, row_slices, excel
+
+
+# в памяти процесса, а не в кэше выгрузок на диске; version — отпечаток данных
+# пациента (patient_data_version): после правки ключ другой, старое уходит по TTL
+@st.cache_data(ttl=EXPORT_PAGE_TTL_S, max_entries=32, show_spinner=False)
+def _cached_patient_export(person_id: int, version: str) -> tuple[dict, dict, bytes]:
+    return _build_patient_export(person_id)
+
+
+def export_patient_data():
+    person_stub = st.session_state.get("current_patient_info")
+    if not person_stub:
+        st.error("Пациент не выбран.")
+        return
+
+    st.title("📤 Выгрузка данных пациента")
+
+    # повторный показ страницы без правок — один запрос версии вместо загрузки карточки;
+    # правка моложе EXPORT_CACHE_SETTLE_S может не сдвинуть версию — тогда без кэша
+    version = _safe(db_funcs.patient_data_version, person_stub.id, label="версии данных пациента")
+    if version is not None and version.settled:
+        export = _safe(_cached_patient_export, person_stub.id, version.token, label="карточки пациента")
+    else:
+        export = _safe(_build_patient_export, person_stub.id, label="карточки пациента")
+    if not export:
+        st.error("Не удалось загрузить карточку пациента.")
+        return
+    row_scales, row_slices, excel = export
+
+    # 6) Покажем и дадим скачать
     df_scales = pd.DataFrame([row_scales])
     df_slices = pd.DataFrame([row_slices])
     df_scales.replace({True: 1, False: 0}, inplace=True)
@@ -197,15 +229,10 @@ def export_patient_data():
     st.markdown("### Предпросмотр срезов")
     st.dataframe(df_slices, width="stretch")
 
-    excel_buf = io.BytesIO()
-    with pd.ExcelWriter(excel_buf, engine="openpyxl") as writer:
-        df_scales.to_excel(writer, index=False, sheet_name="Шкалы")
-        df_slices.to_excel(writer, index=False, sheet_name="Срезы")
-
     st.download_button(
         "⬇️ Скачать Excel",
-        data=excel_buf.getvalue(),
-        file_name=f"patient_{person.id}_export.xlsx",
+        data=excel,
+        file_name=f"patient_{person_stub.id}_export.xlsx",
         mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
         use_container_width=True,
     )
@@ -1,14 +1,23 @@
-import io
 import time
 from datetime import date
-from importlib import import_module
 
-import pandas as pd
 import streamlit as st
-from functools import reduce
+
+try:
+    from streamlit_searchbox import st_searchbox
+except ImportError:  # необязательный компонент streamlit-searchbox
+    st_searchbox = None
 
 import database.functions as db_funcs
-from database.functions import get_person, create_person, search_persons
+from database.schemas.slice_fields import SLICE_FIELDS
+from database.functions import (
+    count_persons,
+    create_person,
+    get_person,
+    search_persons_fuzzy,
+    search_persons_page,
+    suggest_persons,
+)
 from frontend.general import create_big_button
 from frontend.scales.stopbang import _sb_risk_label
 from frontend.utils import change_menu_item
@@ -23,18 +32,6 @@ def _safe(fetch_fn, *args, label="", default=None):
         return default
 
 
-def _bmi(weight_kg, height_cm):
-    try:
-        if not weight_kg or not height_cm:
-            return None
-        h_m = float(height_cm) / 100.0
-        if h_m <= 0:
-            return None
-        return round(float(weight_kg) / (h_m * h_m), 1)
-    except Exception:
-        return None
-
-
 def _elg_plan(score):
     if score is None:
         return "—"
@@ -176,9 +173,68 @@ def add_patient():
     create_big_button("Назад", on_click=change_menu_item, kwargs={"item": "patients"}, icon="⬅️")
 
 
+FIND_PAGE_SIZE = 50
+FIND_SUGGESTIONS = 8
+# без учёта регистра и ё/е; «с начала» идёт по индексу
+_FIND_MATCHES = {"с начала": "prefix", "в любом месте": "infix", "с опечатками": "fuzzy"}
+_FIND_TEXT_FIELDS = ("last_name", "first_name", "patronymic", "card_number")
+
+
+def _find_fuzzy(filters: dict) -> list:
+    """Поиск с опечатками по ФИО и номеру; возраст и дата включения — фильтром по найденному."""
+    query = " ".join(filters[k] for k in _FIND_TEXT_FIELDS if filters[k])
+    hits = search_persons_fuzzy(query, limit=FIND_PAGE_SIZE)
+    return [
+        h.person for h in hits
+        if (filters["age"] is None or h.person.age == filters["age"])
+        and (filters["inclusion_date"] is None or h.person.inclusion_date == filters["inclusion_date"])
+    ]
+
+
+def _hint_label(hint) -> str:
+    card = f" • № {hint.card_number}" if hint.card_number else ""
+    return f"{hint.fio} • {hint.birth_date:%d.%m.%Y}{card}"
+
+
+def _suggest_options(query: str) -> list[tuple[str, int]]:
+    return [(_hint_label(h), h.id) for h in suggest_persons(query or "", limit=FIND_SUGGESTIONS)]
+
+
+def _choose_patient(person_id: int) -> None:
+    st.session_state["current_patient_id"] = person_id
+    st.session_state["current_patient_info"] = get_person(person_id)
+    change_menu_item(item="diagnosis_patient")
+    st.rerun()
+
+
 def find_patient():
     st.title("🔍 Поиск пациента")
 
+    # подсказки из индекса в памяти процесса — без формы и без запроса к БД
+    placeholder = "Фамилия, имя или номер истории: «иван пет»"
+    if st_searchbox is not None:
+        # компонент обновляет подсказки при наборе (с задержкой, а не на каждый символ)
+        chosen = st_searchbox(
+            _suggest_options, label="Быстрый поиск", placeholder=placeholder,
+            clear_on_submit=True, key="patients_live_query",
+        )
+        if chosen is not None:
+            _choose_patient(chosen)
+    else:
+        # st.text_input перезапускает страницу только по Enter или уходу из поля
+        query = st.text_input(
+            "Быстрый поиск", key="patients_live_query", placeholder=placeholder,
+            help="Подсказки обновляются по Enter. Для подсказок прямо при наборе "
+                 "установите пакет streamlit-searchbox.",
+        )
+        for label, person_id in _suggest_options(query):
+            col1, col2 = st.columns([5, 1])
+            with col1:
+                st.markdown(label)
+            with col2:
+                if st.button("Выбрать", key=f"suggest_{person_id}"):
+                    _choose_patient(person_id)
+
     with st.form("find_patient_form", clear_on_submit=False):
         col1, col2, col3 = st.columns(3)
         with col1:
@@ -196,6 +252,11 @@ def find_patient():
         with col6:
             inclusion_date = st.date_input("Дата добавления", value=None, key="patients_find_date")
 
+        match = st.radio(
+            "Совпадение ФИО и номера", list(_FIND_MATCHES), horizontal=True, key="patients_find_match",
+            help="«С опечатками» — по ФИО и номеру истории; если заданы только возраст или дата, "
+                 "выполняется обычный поиск.",
+        )
         submitted = st.form_submit_button("Искать", width='stretch')
 
     if submitted:
@@ -205,22 +266,37 @@ def find_patient():
             "patronymic": (patronymic or "").strip() or None,
             "card_number": (card_number or "").strip() or None,
             "inclusion_date": inclusion_date,
+            "match": _FIND_MATCHES[match],
         }
         try:
             filters["age"] = int(age_str) if age_str.strip() else None
         except ValueError:
             st.warning("Возраст должен быть числом")
             filters["age"] = None
+        if filters["match"] == "fuzzy" and not any(filters[k] for k in _FIND_TEXT_FIELDS):
+            # опечатки ищутся только в ФИО и номере; по возрасту/дате — обычный поиск
+            filters["match"] = "infix"
         st.session_state["patients_find_filters"] = filters
+        # число найденных считается один раз на набор фильтров, страницы его не пересчитывают
+        if filters["match"] != "fuzzy":
+            st.session_state["patients_find_total"] = count_persons(**filters)
+        st.session_state["patients_find_cursor"] = {}
         st.rerun()
 
     filters = st.session_state.get("patients_find_filters")
     if filters:
-        results = search_persons(limit=100, **filters)
+        if filters["match"] == "fuzzy":
+            page, results = None, _find_fuzzy(filters)
+            total = len(results)
+        else:
+            cursor = st.session_state.get("patients_find_cursor", {})
+            page = search_persons_page(limit=FIND_PAGE_SIZE, **cursor, **filters)
+            results = page.items
+            total = st.session_state.get("patients_find_total", len(results))
         if not results:
             st.info("Ничего не найдено.")
         else:
-            st.markdown(f"Найдено: **{len(results)}**")
+            st.markdown(f"Найдено: **{total}**" + (" (лучшие совпадения)" if page is None else ""))
             for p in results:
                 col1, col2, col3, col4 = st.columns([4, 1, 1, 1])
                 with col1:
@@ -238,156 +314,197 @@ def find_patient():
                         st.write("—")
                 with col4:
                     if st.button("Выбрать", key=f"pick_{p.id}"):
-                        chosen = get_person(p.id)
-                        st.session_state["current_patient_id"] = p.id
-                        st.session_state["current_patient_info"] = chosen
-                        change_menu_item(item="diagnosis_patient")
-                        st.rerun()
+                        _choose_patient(p.id)
+
+        if page is not None and (page.prev_cursor or page.next_cursor):
+            col_prev, col_next = st.columns(2)
+            with col_prev:
+                if st.button("← Предыдущие", disabled=page.prev_cursor is None, key="patients_find_prev"):
+                    st.session_state["patients_find_cursor"] = {"before": page.prev_cursor}
+                    st.rerun()
+            with col_next:
+                if st.button("Следующие →", disabled=page.next_cursor is None, key="patients_find_next"):
+                    st.session_state["patients_find_cursor"] = {"after": page.next_cursor}
+                    st.rerun()
 
     st.markdown("---")
     create_big_button("⬅️ Назад", on_click=change_menu_item,
                       kwargs={"item": "patients"}, key="back_from_search")
 
 
+_JOB_STATUS = {
+    "queued": "⏳ В очереди",
+    "running": "⚙️ Выполняется",
+    "done": "✅ Готово",
+    "failed": "❌ Ошибка",
+    "cancelled": "🚫 Отменено",
+}
+
+
+def _job_active(job) -> bool:
+    return job.status in ("queued", "running")
+
+
+def _forget_download(job_id: str) -> None:
+    st.session_state.pop(f"prepared_{job_id}", None)
+
+
+def _job_download(job) -> None:
+    """Файл читается только по кнопке «Подготовить файл», а не при каждом обновлении панели."""
+    key = f"prepared_{job.id}"
+    if not st.session_state.get(key):
+        if st.button("Подготовить файл", key=f"prepare_{job.id}", use_container_width=True):
+            st.session_state[key] = True
+            st.rerun(scope="fragment")
+        return
+    try:
+        with open(job.path, "rb") as fh:
+            data = fh.read()
+    except OSError:  # выгрузку удалили из другой сессии
+        _forget_download(job.id)
+        st.caption("Файл уже удалён")
+        return
+    st.download_button("⬇️ Скачать", data=data, file_name=job.file_name, key=f"download_{job.id}",
+                       on_click=_forget_download, args=(job.id,), use_container_width=True)
+
+
+def _export_jobs_list():
+    jobs = _safe(db_funcs.list_export_jobs, label="списка выгрузок", default=[])
+    if st.session_state.get("export_jobs_active") and not any(map(_job_active, jobs)):
+        # всё завершилось — перезапуск страницы отключает автообновление
+        st.session_state["export_jobs_active"] = False
+        st.rerun()
+    if not jobs:
+        return
+    st.markdown("### Выгрузки")
+    for job in jobs:
+        col1, col2 = st.columns([3, 1])
+        with col1:
+            st.markdown(
+                f"**{job.created_at.astimezone():%d.%m.%Y %H:%M}** · {job.fmt.upper()}"
+                f"{' (длинный)' if job.layout == 'long' else ''} · {_JOB_STATUS[job.status]}"
+                f"{' · из кэша' if job.cached else ''}"
+            )
+            if job.status == "running":
+                st.progress(job.progress, text=f"{job.rows_done} из {job.rows_total or '?'}")
+            elif job.status == "failed":
+                st.caption(job.error or "")
+        with col2:
+            if _job_active(job):
+                st.button("Отменить", key=f"cancel_{job.id}",
+                          on_click=db_funcs.cancel_export_job, args=(job.id,))
+            elif job.status == "done":
+                _job_download(job)
+            else:
+                st.button("Удалить", key=f"delete_{job.id}",
+                          on_click=db_funcs.delete_export_job, args=(job.id,))
+
+
+def _export_jobs_panel():
+    """
+    Фоновые выгрузки: готовые файлы доступны любой сессии. Пока есть задачи в
+    очереди или в работе, список обновляется сам раз в 2 с, иначе — не обновляется.
+    """
+    jobs = _safe(db_funcs.list_export_jobs, label="списка выгрузок", default=[])
+    active = any(map(_job_active, jobs))
+    st.session_state["export_jobs_active"] = active
+    st.fragment(_export_jobs_list, run_every=2 if active else None)()
+
+
+def _slice_field_labels(key):
+    """Подписи полей среза из полей его формы: {поле: "ЧСС, уд/мин"}."""
+    defs = SLICE_FIELDS[int(key[1:])]
+    return {name: f"{label}, {unit}" if unit else label for name, label, unit, _ in defs}
+
+
 def export_patients():
     st.title("📤 Выгрузка всех пациентов")
 
+    # подпись в интерфейсе -> ключ таблицы в database.services.export.TABLES
     scale_map = {
-        "El-Ganzouri": ("elg", lambda pid: db_funcs.elg_get_result(pid)),
-        "ARISCAT": ("ariscat", lambda pid: db_funcs.ar_get_result(pid)),
-        "STOP-BANG": ("stopbang", lambda pid: db_funcs.sb_get_result(pid)),
-        "SOBA": ("soba", lambda pid: db_funcs.get_soba(pid)),
-        "RCRI": ("rcri", lambda pid: db_funcs.rcri_get_result(pid)),
-        "Caprini": ("caprini", lambda pid: db_funcs.caprini_get_result(pid)),
-        "Las Vegas": ("las_vegas", lambda pid: db_funcs.lv_get_result(pid)),
-        "QoR-15": ("qor15", lambda pid: db_funcs.qor15_get_result(pid)),
-        "Aldrete": ("aldrete", lambda pid: db_funcs.ald_get_result(pid)),
-        "MMSE t0": ("mmse_t0", lambda pid: db_funcs.mmse_get_result(pid, 0)),
-        "MMSE t10": ("mmse_t10", lambda pid: db_funcs.mmse_get_result(pid, 10)),
+        "El-Ganzouri": "el_ganzouri",
+        "ARISCAT": "ariscat",
+        "STOP-BANG": "stopbang",
+        "SOBA": "soba",
+        "RCRI": "lee_rcri",
+        "Caprini": "caprini",
+        "Las Vegas": "las_vegas",
+        "QoR-15": "qor15",
+        "Aldrete": "aldrete",
+        "MMSE t0": "mmse_t0",
+        "MMSE t10": "mmse_t10",
     }
-    slice_map = {f"T{i}": (f"t{i}", getattr(db_funcs, f"t{i}_get_result")) for i in range(13)}
+    slice_map = {f"T{i}": f"t{i}" for i in range(13)}
+    table_map = {"Пациенты": "persons", "Статусы шкал": "scales_status", **scale_map, **slice_map}
 
-    table_labels = ["Пациенты", "Статусы шкал"] + list(scale_map.keys()) + list(slice_map.keys())
+    table_labels = list(table_map.keys())
+    fields = _safe(db_funcs.export_fields, label="полей выгрузки", default={})
+    presets = _safe(db_funcs.list_export_presets, label="наборов полей", default={})
+
+    preset_name = st.selectbox("Набор полей", ["Все поля", *presets])
+    preset = presets.get(preset_name)
     select_all = st.checkbox("Отметить все")
+    default = table_labels if select_all else [
+        label for label in table_labels if preset and table_map[label] in preset
+    ]
     selected = st.multiselect(
         "Выберите таблицы для выгрузки",
         table_labels,
-        default=table_labels if select_all else [],
+        default=default,
+        key=f"export_tables_{preset_name}",
     )
     if select_all:
         selected = table_labels
 
-    if st.button("Сформировать выгрузку", use_container_width=True):
-        persons = search_persons(limit=100000)
-        if not persons:
-            st.info("Нет данных для экспорта.")
-            return
+    # выбранные поля уходят в SELECT: невыбранные колонки не читаются вовсе
+    selection = {}
+    with st.expander("Поля таблиц"):
+        for label in selected:
+            key = table_map[label]
+            options = fields.get(key, [])
+            chosen = (preset or {}).get(key) or options
+            labels = _slice_field_labels(key) if key in slice_map.values() else {}
+            picked = st.multiselect(
+                label,
+                options,
+                default=[f for f in chosen if f in options],
+                format_func=lambda f, labels=labels: labels.get(f, f),
+                key=f"export_fields_{preset_name}_{key}",
+            )
+            selection[key] = None if len(picked) == len(options) else picked
+
+    c1, c2 = st.columns([3, 1])
+    with c1:
+        new_preset = st.text_input("Сохранить выбор как набор", placeholder="Название набора")
+    with c2:
+        st.write("")
+        if st.button("Сохранить набор", use_container_width=True, disabled=not selection):
+            saved = _safe(db_funcs.save_export_preset, new_preset, selection, label="набора полей")
+            if saved:
+                st.success(f"Набор «{saved}» сохранён")
+
+    formats = {"Excel": "xlsx", "CSV": "csv", "Parquet": "parquet"}
+    fmt = st.radio(
+        "Формат",
+        list(formats),
+        horizontal=True,
+        help="Excel — листы «Шкалы» и «Срезы»; CSV и Parquet — одна широкая таблица",
+    )
+    layouts = {"Строка на пациента": "wide", "Срезы: строка на значение": "long"}
+    layout = st.radio(
+        "Вид таблицы",
+        list(layouts),
+        horizontal=True,
+        help="Длинный вид — patient_id, timepoint, parameter и значение; только выбранные срезы, "
+             "пустые значения пропускаются",
+    )
 
-        base_df = pd.DataFrame({"patient_id": [p.id for p in persons]})
-        dfs_scales = [base_df]
-        dfs_slices = [base_df.copy()]
-
-        if "Пациенты" in selected:
-            patient_rows = []
-            for person in persons:
-                atype = getattr(person, "anesthesia_type", None)
-                patient_rows.append(
-                    {
-                        "patient_id": person.id,
-                        "card_number": getattr(person, "card_number", ""),
-                        "last_name": getattr(person, "last_name", ""),
-                        "first_name": getattr(person, "first_name", ""),
-                        "patronymic": getattr(person, "patronymic", ""),
-                        "inclusion_date": getattr(person, "inclusion_date", None),
-                        "anesthesia_type": atype.value if atype else "",
-                        "age": getattr(person, "age", None),
-                        "height": getattr(person, "height", None),
-                        "weight": getattr(person, "weight", None),
-                        "gender": "Ж" if bool(getattr(person, "gender", False)) else "М",
-                        "bmi": _bmi(getattr(person, "weight", None), getattr(person, "height", None)),
-                    }
-                )
-            patient_df = pd.DataFrame(patient_rows)
-            dfs_scales.append(patient_df)
-            dfs_slices.append(patient_df.copy())
-
-        if "Статусы шкал" in selected:
-            status_rows = []
-            for person in persons:
-                full = _safe(get_person, person.id, label="карточки пациента")
-                sc = getattr(full, "scales", None) if full else None
-                row = {"patient_id": person.id}
-                if sc:
-                    for field in [
-                        "el_ganzouri_filled",
-                        "ariscat_filled",
-                        "stopbang_filled",
-                        "soba_filled",
-                        "lee_rcri_filled",
-                        "caprini_filled",
-                        "las_vegas_filled",
-                        "aldrete_filled",
-                        "mmse_t0_filled",
-                        "mmse_t10_filled",
-                        "qor15_filled",
-                    ]:
-                        row[field] = bool(getattr(sc, field, False))
-                status_rows.append(row)
-            dfs_scales.append(pd.DataFrame(status_rows))
-
-        for label, (prefix, getter) in scale_map.items():
-            if label not in selected:
-                continue
-            rows = []
-            for person in persons:
-                res = _safe(getter, person.id, label=label)
-                row = {"patient_id": person.id}
-                if res is not None:
-                    data = res.model_dump()
-                    data.pop("id", None)
-                    data.pop("scales_id", None)
-                    for k, v in data.items():
-                        row[f"{prefix}_{k}"] = v
-                rows.append(row)
-            dfs_scales.append(pd.DataFrame(rows))
-
-        for label, (prefix, getter) in slice_map.items():
-            if label not in selected:
-                continue
-            rows = []
-            schema_module = import_module(f"database.schemas.slice_{prefix}")
-            schema_cls = getattr(schema_module, f"Slice{prefix.upper()}Input")
-            fields = list(schema_cls.model_fields.keys())
-            for person in persons:
-                res = _safe(getter, person.id, label=f"срез {label}")
-                row = {"patient_id": person.id}
-                for f in fields:
-                    row[f"{prefix}_{f}"] = getattr(res, f, None) if res is not None else None
-                rows.append(row)
-            dfs_slices.append(pd.DataFrame(rows))
-
-        df_scales = reduce(lambda l, r: pd.merge(l, r, on="patient_id", how="left"), dfs_scales)
-        df_slices = reduce(lambda l, r: pd.merge(l, r, on="patient_id", how="left"), dfs_slices)
-        df_scales.replace({True: 1, False: 0}, inplace=True)
-        df_slices.replace({True: 1, False: 0}, inplace=True)
-
-        st.markdown("### Предпросмотр шкал")
-        st.dataframe(df_scales, width="stretch")
-        st.markdown("### Предпросмотр срезов")
-        st.dataframe(df_slices, width="stretch")
-
-        buf = io.BytesIO()
-        with pd.ExcelWriter(buf, engine="openpyxl") as writer:
-            df_scales.to_excel(writer, index=False, sheet_name="Шкалы")
-            df_slices.to_excel(writer, index=False, sheet_name="Срезы")
-        st.download_button(
-            "⬇️ Скачать Excel",
-            data=buf.getvalue(),
-            file_name="patients_export.xlsx",
-            mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
-            use_container_width=True,
-        )
+    if st.button("Сформировать выгрузку", use_container_width=True):
+        if _safe(db_funcs.submit_export_job, selection, formats[fmt], None, layouts[layout],
+                 label="выгрузки"):
+            st.success("Выгрузка поставлена в очередь — можно продолжать работу.")
 
+    _export_jobs_panel()
     create_big_button("Назад", on_click=change_menu_item, kwargs={"item": "patients"}, icon="⬅️")
 
 
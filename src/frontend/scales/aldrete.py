@@ -1,5 +1,6 @@
 import streamlit as st
 
+from database.db import unit_of_work
 from database.functions import ald_get_result, ald_upsert_result, get_person
 from database.schemas.aldrete import AldreteInput
 from frontend.components import create_big_button
@@ -79,9 +80,10 @@ def show_aldrete_scale():
             consciousness_score=consciousness_opts[consciousness_label],
             spo2_score=spo2_opts[spo2_label],
         )
-        saved = ald_upsert_result(person.id, data)
+        with unit_of_work(batch=True):
+            saved = ald_upsert_result(person.id, data)
+            st.session_state["current_patient_info"] = get_person(person.id)
         st.success(f"Сохранено. Баллы: **{saved.total_score}**")
-        st.session_state["current_patient_info"] = get_person(person.id)
 
     back_item = "preoperative_exam" if st.session_state.get("current_patient_info") else "calculators"
     create_big_button(
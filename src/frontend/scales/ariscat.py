@@ -1,5 +1,6 @@
 import streamlit as st
 
+from database.db import unit_of_work
 from database.functions import ar_get_result, ar_upsert_result, get_person
 from database.schemas.ariscat import AriscatInput
 from frontend.components import create_big_button
@@ -122,8 +123,9 @@ def show_ariscat_scale():
             duration_minutes=duration_minutes,
             is_emergency=emergency,
         )
-        saved = ar_upsert_result(person.id, data)
-        st.session_state["current_patient_info"] = get_person(person.id)
+        with unit_of_work(batch=True):
+            saved = ar_upsert_result(person.id, data)
+            st.session_state["current_patient_info"] = get_person(person.id)
         st.success(f"Сохранено. Сумма баллов: **{saved.total_score}** · {_risk_label(saved.total_score)}")
 
     create_big_button("⬅️ Назад", on_click=change_menu_item, kwargs={"item": "preoperative_exam"}, key="back_btn")
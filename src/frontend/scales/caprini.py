@@ -1,5 +1,6 @@
 import streamlit as st
 
+from database.db import unit_of_work
 from database.functions import (
     caprini_get_result,
     caprini_upsert_result,
@@ -287,10 +288,10 @@ def show_caprini_scale():
             fracture_pelvis_or_limb=bool(fracture_pelvis_or_limb),
         )
 
-        saved = caprini_upsert_result(person.id, payload)
+        with unit_of_work(batch=True):
+            saved = caprini_upsert_result(person.id, payload)
+            # обновим карточку пациента в сессии, чтобы список шкал показал «Заполнено» и подтянул новые возраст/рост/вес
+            st.session_state["current_patient_info"] = get_person(person.id)
         st.success(f"Сохранено. Сумма: **{saved.total_score}** · Уровень риска: **{_risk_label(saved.risk_level)}**")
 
-        # обновим карточку пациента в сессии, чтобы список шкал показал «Заполнено» и подтянул новые возраст/рост/вес
-        st.session_state["current_patient_info"] = get_person(person.id)
-
     create_big_button("⬅️ Назад", on_click=change_menu_item, kwargs={"item": "preoperative_exam"}, key="back_btn")
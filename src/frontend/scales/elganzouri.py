@@ -1,6 +1,7 @@
 # ui_el_ganzouri.py
 import streamlit as st
 
+from database.db import unit_of_work
 from database.functions import elg_get_result, elg_upsert_result, get_person
 from database.schemas.elganzouri import ElGanzouriInput
 from frontend.components import create_big_button
@@ -88,9 +89,10 @@ def show_el_ganzouri_form():
             can_protrude=can_protrude,
             diff_hx=diff_hx,
         )
-        saved = elg_upsert_result(person.id, data)
+        with unit_of_work(batch=True):
+            saved = elg_upsert_result(person.id, data)
+            # обновим кэш пациента (для статусов в списке шкал)
+            st.session_state["current_patient_info"] = get_person(person.id)
         st.success(f"Сохранено. Сумма: **{saved.total_score}** · риск: **{_elg_reco(saved.total_score)}**")
-        # обновим кэш пациента (для статусов в списке шкал)
-        st.session_state["current_patient_info"] = get_person(person.id)
 
     create_big_button("⬅️ Назад", on_click=change_menu_item, kwargs={"item": "preoperative_exam"}, key="back_btn")
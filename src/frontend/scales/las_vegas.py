@@ -1,5 +1,6 @@
 import streamlit as st
 
+from database.db import unit_of_work
 from database.functions import lv_get_result, lv_upsert_result, get_person
 from database.schemas.las_vegas import LasVegasInput
 from frontend.components import create_big_button
@@ -77,11 +78,12 @@ def show_las_vegas_scale():
             vasoactive_drugs=vasoactives,
             peep_cm_h2o=peep,
         )
-        saved = lv_upsert_result(person.id, data)
+        with unit_of_work(batch=True):
+            saved = lv_upsert_result(person.id, data)
+            st.session_state["current_patient_info"] = get_person(person.id)
         st.success(
             f"Сохранено. Баллы: **{saved.total_score}** · риск: **{_risk_label(saved.risk_level)}**"
         )
-        st.session_state["current_patient_info"] = get_person(person.id)
 
     create_big_button(
         "⬅️ Назад",
@@ -1,4 +1,5 @@
 import streamlit as st
+from database.db import unit_of_work
 from database.functions import rcri_get_result, rcri_upsert_result, get_person
 from database.schemas.lee import LeeRcriInput
 from frontend.components import create_big_button
@@ -68,13 +69,14 @@ def show_lee_scale():
             diabetes_on_insulin=diabetes_on_insulin,
             creatinine_gt_180_umol_l=creatinine_gt_180_umol_l,
         )
-        saved = rcri_upsert_result(person.id, payload)
+        with unit_of_work(batch=True):
+            saved = rcri_upsert_result(person.id, payload)
+            st.session_state["current_patient_info"] = get_person(person.id)
 
         st.success(
             f"Сохранено. Итог: **{saved.total_score}** балл(ов) · "
             f"риск осложнений: **{_fmt_pct(saved.risk_percent)}**"
         )
-        st.session_state["current_patient_info"] = get_person(person.id)
 
     create_big_button("⬅️ Назад", on_click=change_menu_item,
                       kwargs={"item": "preoperative_exam"}, key="back_btn_lee")
@@ -1,5 +1,6 @@
 import streamlit as st
 
+from database.db import unit_of_work
 from database.functions import mmse_get_result, mmse_upsert_result, get_person
 from database.schemas.mmse import MMSEInput
 from frontend.components import create_big_button
@@ -96,9 +97,10 @@ def _show_form(timepoint: int, back_item: str, title: str):
 
     if submitted:
         data = MMSEInput(**values)
-        saved = mmse_upsert_result(person.id, timepoint, data)
+        with unit_of_work(batch=True):
+            saved = mmse_upsert_result(person.id, timepoint, data)
+            st.session_state["current_patient_info"] = get_person(person.id)
         st.success(f"Сохранено. Баллы: **{saved.total_score}**")
-        st.session_state["current_patient_info"] = get_person(person.id)
 
     create_big_button("⬅️ Назад", on_click=change_menu_item, kwargs={"item": back_item}, key=f"back_mmse_{timepoint}")
 
@@ -1,5 +1,6 @@
 import streamlit as st
 
+from database.db import unit_of_work
 from database.functions import qor15_get_result, qor15_upsert_result, get_person
 from database.schemas.qor15 import Qor15Input
 from frontend.components import create_big_button
@@ -55,7 +56,8 @@ def show_qor15_scale():
 
     if submitted:
         data = Qor15Input(**values)
-        saved = qor15_upsert_result(person.id, data)
+        with unit_of_work(batch=True):
+            saved = qor15_upsert_result(person.id, data)
+            st.session_state["current_patient_info"] = get_person(person.id)
         st.success(f"Сохранено. Баллы: **{saved.total_score}**")
-        st.session_state["current_patient_info"] = get_person(person.id)
     create_big_button("⬅️ Назад", on_click=change_menu_item, kwargs={"item": "preoperative_exam"}, key="back_btn")
@@ -1,5 +1,6 @@
 import streamlit as st
 from database.schemas.soba import SobaCreate
+from database.db import unit_of_work
 from database.functions import (
     get_soba, upsert_soba, get_person, update_person_fields,
     sb_get_result,   # 👈 добавили импорт
@@ -109,14 +110,14 @@ def show_soba_scale():
             hypercapnia_co2_gt_28=hypercapnia_co2_gt_28,
             vte_history=vte_history,
         )
-        saved = upsert_soba(person.id, payload)
+        with unit_of_work(batch=True):
+            saved = upsert_soba(person.id, payload)
+            # обновим пациента в сессии
+            st.session_state["current_patient_info"] = get_person(person.id)
 
         # стоп-банг из кэша SOBA (сервис его подставляет)
         risk_label = _risk_label(getattr(saved, "stopbang_risk_cached", None))
         score = getattr(saved, "stopbang_score_cached", "—")
         st.success(f"SOBA сохранена. STOP-BANG: {score} баллов · риск: **{risk_label}**")
 
-        # обновим пациента в сессии
-        st.session_state["current_patient_info"] = get_person(person.id)
-
     create_big_button("⬅️ Назад", on_click=change_menu_item, kwargs={"item": "preoperative_exam"}, key="back_btn")
\ No newline at end of file
@@ -1,5 +1,6 @@
 import streamlit as st
 
+from database.db import unit_of_work
 from database.functions import sb_get_result, sb_upsert_result, get_person
 from database.schemas.stopbang import StopBangInput
 from frontend.components import create_big_button
@@ -90,7 +91,8 @@ def show_stopbang_scale():
             bmi_value=bmi_value,
             neck_circ_cm=neck_circ_cm,
         )
-        saved = sb_upsert_result(person.id, data)
+        with unit_of_work(batch=True):
+            saved = sb_upsert_result(person.id, data)
+            st.session_state["current_patient_info"] = get_person(person.id)
         st.success(f"Сохранено. Баллы: **{saved.total_score}** · риск: **{_sb_risk_label(saved.risk_level)}**")
-        st.session_state["current_patient_info"] = get_person(person.id)
     create_big_button("⬅️ Назад", on_click=change_menu_item, kwargs={"item": "preoperative_exam"}, key="back_btn")
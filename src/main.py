@@ -1,5 +1,11 @@
 import streamlit as st
 
+try:
+    from streamlit.runtime.scriptrunner_utils.exceptions import ScriptControlException
+except ImportError:  # streamlit < 1.38
+    from streamlit.runtime.scriptrunner.exceptions import ScriptControlException
+
+from database.db import unit_of_work
 from frontend.general import settings
 from frontend.calculate import show_calculators_menu
 from frontend.general import show_main_menu
@@ -79,7 +85,10 @@ menu_items = {
 
 
 def start_application():
-    menu_items[st.session_state.get("stage", "main")]()
+    # одна сессия БД на весь прогон скрипта Streamlit; st.rerun()/st.stop() —
+    # исключения управления, а не ошибки: сессия фиксируется и закрывается до перезапуска
+    with unit_of_work(commit_on=(ScriptControlException,)):
+        menu_items[st.session_state.get("stage", "main")]()
 
 
 if __name__ == "__main__":
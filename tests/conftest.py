@@ -0,0 +1,71 @@
+import contextlib
+import os
+import pathlib
+import sys
+from datetime import date
+
+import pytest
+
+# Тесты не должны трогать рабочий patients_db.sqlite3
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+
+sys.path.append(str(pathlib.Path(__file__).resolve().parents[1] / "src"))
+
+# Регистрируем настоящий пакет database до того, как отдельные тесты
+# подменят его заглушками через sys.modules.setdefault.
+import database  # noqa: E402,F401
+
+try:
+    import database.functions  # noqa: E402,F401
+except ImportError:  # нет sqlalchemy/pydantic — тесты БД будут пропущены
+    pass
+
+try:
+    # pyarrow обращается к pandas — пусть это будет настоящий модуль, а не заглушка
+    import pandas  # noqa: E402,F401
+except ImportError:
+    pass
+
+
+# типовой пациент для make_person; любое поле переопределяется аргументом
+PERSON_DEFAULTS = dict(
+    card_number=None, anesthesia_type=None, last_name="Тестов", first_name="Иван", patronymic=None,
+    birth_date=date(1970, 1, 1), inclusion_date=date(2024, 5, 1), height=170, weight=90, gender=True,
+)
+
+
+@pytest.fixture
+def make_person():
+    """Создаёт пациента через фасад database.functions."""
+    import database.functions as db_funcs
+
+    def make(card_number=None, **fields):
+        return db_funcs.create_person(**{**PERSON_DEFAULTS, "card_number": card_number, **fields})
+
+    return make
+
+
+@pytest.fixture
+def count_statements():
+    """
+    Контекстный менеджер: события engine внутри блока. Для before_cursor_execute
+    в списке SQL запросов, для прочих событий (например, checkout) — их аргументы.
+    """
+    from sqlalchemy import event
+
+    from database.db import engine
+
+    @contextlib.contextmanager
+    def counting(event_name="before_cursor_execute"):
+        seen = []
+
+        def listener(*args):
+            seen.append(args[2] if event_name == "before_cursor_execute" else args)
+
+        event.listen(engine, event_name, listener)
+        try:
+            yield seen
+        finally:
+            event.remove(engine, event_name, listener)
+
+    return counting
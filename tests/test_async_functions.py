@@ -0,0 +1,67 @@
+import asyncio
+from datetime import date
+
+import pytest
+
+pytest.importorskip("aiosqlite")
+
+import database.async_functions as adb  # noqa: E402
+from database.async_db import dispose_async_engine  # noqa: E402
+from database.schemas.slice_t0 import SliceT0Input  # noqa: E402
+
+
+def test_async_twin_matches_sync_facade(tmp_path, monkeypatch):
+    monkeypatch.setenv("ASYNC_DATABASE_URL", f"sqlite+aiosqlite:///{tmp_path / 'async.sqlite3'}")
+
+    async def scenario():
+        try:
+            person = await adb.create_person(
+                "a1", None, "Смирнов", "Павел", None, date(1970, 2, 3), date(2024, 6, 1), 178, 110, False
+            )
+            await adb.t0_upsert_result(person.id, SliceT0Input(heart_rate=72))
+            return await asyncio.gather(
+                adb.get_person(person.id),
+                adb.t0_get_result(person.id),
+                adb.t1_get_result(person.id),
+                adb.scales_get_results(person.id),
+            )
+        finally:
+            await dispose_async_engine()
+
+    card, t0, t1, scales = asyncio.run(scenario())
+    assert card.slices.t0_filled
+    assert t0.heart_rate == 72
+    assert t1 is None
+    assert scales.stopbang is None
+
+
+def test_async_engine_applies_sqlite_pragmas(tmp_path):
+    from sqlalchemy import text
+
+    from database.async_db import create_async_db_engine
+
+    async def scenario():
+        engine = create_async_db_engine(f"sqlite+aiosqlite:///{tmp_path / 'pragmas.sqlite3'}")
+        try:
+            async with engine.connect() as conn:
+                fk = (await conn.execute(text("PRAGMA foreign_keys"))).scalar()
+                mode = (await conn.execute(text("PRAGMA journal_mode"))).scalar()
+                return fk, mode
+        finally:
+            await engine.dispose()
+
+    assert asyncio.run(scenario()) == (1, "wal")
+    assert not hasattr(adb, "submit_export_job")
+
+
+def test_concurrent_first_calls_share_one_engine(tmp_path, monkeypatch):
+    monkeypatch.setenv("ASYNC_DATABASE_URL", f"sqlite+aiosqlite:///{tmp_path / 'first.sqlite3'}")
+
+    async def scenario():
+        try:
+            # самое первое обращение к новой БД — сразу параллельно: один движок, одна миграция
+            return await asyncio.gather(*(adb.t0_get_result(pid) for pid in range(1, 5)))
+        finally:
+            await dispose_async_engine()
+
+    assert asyncio.run(scenario()) == [None] * 4
@@ -0,0 +1,45 @@
+import pytest
+
+pytest.importorskip("sqlalchemy")
+
+import database.functions as db_funcs  # noqa: E402
+from database.schemas.lee import LeeRcriUpdate  # noqa: E402
+from database.schemas.slice_t2 import SliceT2Input  # noqa: E402
+from database.schemas.stopbang import StopBangInput  # noqa: E402
+
+
+def _stopbang(age):
+    return StopBangInput(
+        s_snoring=True, t_tired_daytime=True, o_observed_apnea=True, p_hypertension=False,
+        g_male=False, age_years=age, bmi_value=36, neck_circ_cm=38,
+    )
+
+
+def test_bulk_scales_scores_and_flags_in_fixed_statements(make_person, count_statements):
+    ids = [make_person(f"bs{i}").id for i in range(50)]
+    with count_statements() as statements:
+        written = db_funcs.bulk_upsert_scales("stopbang", [(pid, _stopbang(60)) for pid in ids])
+
+    assert written == 50
+    assert len(statements) <= 6
+    res = db_funcs.sb_get_result(ids[-1])
+    assert res.total_score == 5 and res.a_age_gt_50
+    assert db_funcs.get_person(ids[0]).scales.stopbang_filled
+
+    # повторная запись обновляет, а частичный ввод сливается с сохранённым
+    db_funcs.rcri_upsert_result(ids[0], LeeRcriUpdate(high_risk_surgery=True))
+    db_funcs.bulk_upsert_scales("lee_rcri", [(ids[0], LeeRcriUpdate(diabetes_on_insulin=True))])
+    assert db_funcs.rcri_get_result(ids[0]).total_score == 2
+
+
+def test_bulk_slices_keep_existing_values(make_person):
+    ids = [make_person(f"bl{i}").id for i in range(3)]
+    db_funcs.t2_upsert_result(ids[0], SliceT2Input(heart_rate=55, spo2=97))
+    db_funcs.bulk_upsert_slices(
+        2,
+        [(pid, SliceT2Input(heart_rate=80)) for pid in ids] + [(ids[1], SliceT2Input(spo2=92))],
+    )
+    first, second = db_funcs.t2_get_result(ids[0]), db_funcs.t2_get_result(ids[1])
+    assert (first.heart_rate, first.spo2) == (80, 97)
+    assert (second.heart_rate, second.spo2) == (80, 92)
+    assert db_funcs.get_person(ids[2]).slices.t2_filled
@@ -1,6 +1,8 @@
 import sys, types, pathlib
 # Ensure external dependencies are stubbed to avoid import issues during tests
-sys.modules.setdefault("streamlit", types.ModuleType("streamlit"))
+_st = sys.modules.setdefault("streamlit", types.ModuleType("streamlit"))
+if not hasattr(_st, "cache_data"):
+    _st.cache_data = lambda *args, **kwargs: (lambda fn: fn)
 sys.modules.setdefault("pandas", types.ModuleType("pandas"))
 
 # Stub database.functions module to avoid heavy dependencies during import
@@ -0,0 +1,100 @@
+import threading
+import time
+from datetime import datetime
+
+import pytest
+
+pytest.importorskip("sqlalchemy")
+
+import database.functions as db_funcs  # noqa: E402
+from database.db import engine  # noqa: E402
+from database.export_cache import ExportCache  # noqa: E402
+from database.export_jobs import ExportJobManager  # noqa: E402
+from database.models import Base  # noqa: E402
+
+
+def _wait(manager, job_id, timeout=10):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        job = manager.get(job_id)
+        if job.status not in ("queued", "running"):
+            return job
+        time.sleep(0.02)
+    raise AssertionError("export job did not finish")
+
+
+def test_job_writes_artifact_visible_to_new_manager(tmp_path, make_person):
+    for i in range(3):
+        make_person(f"job{i}")
+    manager = ExportJobManager(tmp_path)
+    job = _wait(manager, manager.submit(["persons", "t0"], "csv").id)
+    manager.shutdown()
+
+    assert job.status == "done", job.error
+    assert job.rows_done == job.rows_total >= 3 and job.progress == 1.0
+    assert open(job.path, encoding="utf-8-sig").readline().startswith("patient_id,card_number")
+
+    # другая сессия / перезапуск видит готовый файл без повторного расчёта
+    reloaded = ExportJobManager(tmp_path)
+    assert reloaded.get(job.id).path == job.path
+    assert reloaded.delete(job.id) and not list(tmp_path.iterdir())
+    reloaded.shutdown()
+
+
+def test_cancel_queued_job(tmp_path):
+    manager = ExportJobManager(tmp_path, max_workers=1)
+    gate = threading.Event()
+    manager._executor.submit(gate.wait)  # занимаем единственный поток
+    job = manager.submit(["persons"], "csv")
+    assert manager.cancel(job.id)
+    gate.set()
+
+    job = _wait(manager, job.id)
+    manager.shutdown()
+    assert job.status == "cancelled" and job.path is None
+    assert not manager.cancel(job.id)
+
+
+def _backdate():
+    # правки старше EXPORT_CACHE_SETTLE — иначе артефакт не кэшируется
+    with engine.begin() as conn:
+        for table in Base.metadata.sorted_tables:
+            if "updated_at" in table.c:
+                conn.execute(table.update().values(updated_at=datetime(2020, 1, 1)))
+
+
+def test_repeated_export_served_from_cache(tmp_path, make_person):
+    pid = make_person("cache0", weight=120).id
+    _backdate()
+    manager = ExportJobManager(tmp_path / "jobs", cache=ExportCache(tmp_path / "cache", 2**20, 10))
+    first = _wait(manager, manager.submit(["persons", "t1"], "csv").id)
+    assert first.status == "done" and not first.cached
+
+    # та же выгрузка без правок — готова сразу при постановке
+    second = manager.submit(["persons", "t1"], "csv")
+    assert second.status == "done" and second.cached and second.rows_done == first.rows_done
+    assert open(second.path, "rb").read() == open(first.path, "rb").read()
+    # удаление задачи не трогает файл в кэше
+    assert manager.delete(first.id) and manager.submit(["persons", "t1"], "csv").cached
+
+    # правка меняет версию данных; свежая правка ещё не кэшируется
+    db_funcs.update_person_fields(pid, weight=110)
+    third = manager.submit(["persons", "t1"], "csv")
+    assert third.status == "queued"
+    assert not _wait(manager, third.id).cached
+    assert manager.submit(["persons", "t1"], "csv").status == "queued"
+    manager.shutdown()
+
+
+def test_export_cache_lru_eviction(tmp_path):
+    cache = ExportCache(tmp_path, max_bytes=10, max_entries=2)
+    for key in "abc":
+        cache.put_bytes(key, "csv", b"1234", 1)
+        time.sleep(0.01)
+    assert cache.get("a", "csv") is None and cache.get("b", "csv")
+    time.sleep(0.01)
+    cache.put_bytes("d", "csv", b"1234", 1)  # b только что читали — вытесняется c
+    assert cache.get("b", "csv") and cache.get("c", "csv") is None
+
+    cache.put_bytes("e", "csv", b"12345678", 1)  # 4 + 8 > 10 байт
+    assert cache.get("e", "csv") and cache.get("b", "csv") is None and cache.get("d", "csv") is None
@@ -0,0 +1,61 @@
+from datetime import date
+
+import pytest
+
+pytest.importorskip("sqlalchemy")
+
+from sqlalchemy import create_engine, inspect, text  # noqa: E402
+from sqlalchemy.orm import Session  # noqa: E402
+
+from database.migrations import MIGRATIONS, current_version, migrate  # noqa: E402
+from database.models import PERSON_SEARCH_FIELDS, Base, Person  # noqa: E402
+
+
+def _index_names(engine):
+    return {ix["name"] for ix in inspect(engine).get_indexes("persons")}
+
+
+def test_fresh_database_is_created_and_stamped(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'fresh.sqlite3'}")
+    assert migrate(engine) == []
+    with engine.connect() as conn:
+        assert current_version(conn) == MIGRATIONS[-1].version
+    assert "ix_persons_search_order" in _index_names(engine)
+
+
+def test_existing_database_is_upgraded_in_place(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'old.sqlite3'}")
+    # схема до миграций: таблицы без индексов поиска, persons.updated_at и schema_version
+    Base.metadata.create_all(engine)
+    with engine.begin() as conn:
+        for name in _index_names(engine) - {"ix_persons_id"}:
+            conn.execute(text(f"DROP INDEX {name}"))
+        conn.execute(text("DROP INDEX ix_slice_t3_updated_at"))
+        conn.execute(text("ALTER TABLE persons DROP COLUMN updated_at"))
+        for field in PERSON_SEARCH_FIELDS:
+            conn.execute(text(f"ALTER TABLE persons DROP COLUMN {field}_norm"))
+        conn.execute(
+            text(
+                "INSERT INTO persons (last_name, first_name, birth_date, height, weight, gender) "
+                "VALUES ('Петров', 'Пётр', '1970-01-01', 180, 90, 0)"
+            )
+        )
+
+    assert migrate(engine) == [m.version for m in MIGRATIONS]
+    assert migrate(engine) == []
+    assert {"ix_persons_card_number", "ix_persons_birth_date_inclusion_date"} <= _index_names(engine)
+    assert "ix_slice_t3_updated_at" in {ix["name"] for ix in inspect(engine).get_indexes("slice_t3")}
+    with engine.connect() as conn:
+        assert conn.execute(text("SELECT count(*) FROM persons")).scalar() == 1
+        assert conn.execute(text("SELECT updated_at FROM persons")).scalar() is not None
+        assert conn.execute(text("SELECT first_name_norm FROM persons")).scalar() == "петр"
+
+    # схема после миграций совпадает с моделью: updated_at допускает NULL, а новые строки его получают
+    updated_at = {c["name"]: c for c in inspect(engine).get_columns("persons")}["updated_at"]
+    assert updated_at["nullable"] is True
+    with Session(engine) as session:
+        person = Person(last_name="Иванов", first_name="Иван", birth_date=date(1980, 1, 1),
+                        height=170, weight=80, gender=False)
+        session.add(person)
+        session.commit()
+        assert person.updated_at is not None
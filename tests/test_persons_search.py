@@ -0,0 +1,163 @@
+import uuid
+from datetime import date
+
+import pytest
+
+pytest.importorskip("sqlalchemy")
+
+import database.functions as db_funcs  # noqa: E402
+from database.db import session_scope, unit_of_work  # noqa: E402
+from database.person_index import get_person_index  # noqa: E402
+from database.repositories.person_search import similarity  # noqa: E402
+from database.services.persons import PersonsService  # noqa: E402
+
+
+# своя фамилия на каждый запуск: тестовая БД может быть постоянной (Postgres)
+LAST_NAME = f"Возрастов-{uuid.uuid4().hex[:8]}"
+
+
+def test_age_search_matches_python_age(make_person):
+    people = [
+        make_person(card, last_name=LAST_NAME, first_name=card, birth_date=birth, inclusion_date=inclusion)
+        for card, birth, inclusion in [
+            ("a1", date(1980, 5, 10), date(2025, 5, 10)),   # ровно 45 в день включения
+            ("a2", date(1980, 5, 11), date(2025, 5, 10)),   # 44 — день рождения завтра
+            ("a3", date(1979, 5, 11), date(2025, 5, 10)),   # 45
+            ("a4", date(1976, 2, 29), date(2021, 2, 28)),   # 44: 29.02 ещё не наступило
+            ("a5", date(1976, 2, 29), date(2021, 3, 1)),    # 45
+            ("a6", date(1960, 1, 1), date(2005, 12, 31)),   # 45, другая дата включения
+        ]
+    ]
+    found = db_funcs.search_persons(last_name=LAST_NAME, age=45, limit=100)
+    assert [p.card_number for p in found] == [p.card_number for p in people if p.age == 45]
+    assert {p.card_number for p in found} == {"a1", "a3", "a5", "a6"}
+
+    on_date = db_funcs.search_persons(last_name=LAST_NAME, age=44, inclusion_date=date(2025, 5, 10))
+    assert [p.card_number for p in on_date] == ["a2"]
+    assert db_funcs.search_persons(last_name=LAST_NAME, age=200) == []
+    # окно уходит за 1-й год — пустой результат, а не ValueError
+    assert db_funcs.search_persons(last_name=LAST_NAME, age=2024, inclusion_date=date(2024, 1, 1)) == []
+    assert db_funcs.search_persons(last_name=LAST_NAME, age=3000) == []
+
+    # LIMIT/OFFSET в SQL, порядок — фамилия, имя
+    page = db_funcs.search_persons(last_name=LAST_NAME, age=45, limit=2, offset=1)
+    assert [p.card_number for p in page] == ["a3", "a5"]
+
+
+def test_keyset_pages_forward_and_back(make_person, count_statements):
+    last_name = f"Страницын-{uuid.uuid4().hex[:8]}"
+    # одинаковые фамилия и имя у части записей — порядок добирается по id
+    ids = [make_person(f"k{i}", last_name=last_name, first_name="АБВ"[i % 3]).id for i in range(7)]
+    expected = [
+        p.id for p in sorted(db_funcs.search_persons(last_name=last_name, limit=100),
+                             key=lambda p: (p.last_name, p.first_name, p.id))
+    ]
+    assert sorted(expected) == ids
+    assert db_funcs.count_persons(last_name=last_name) == 7
+
+    pages, page = [], db_funcs.search_persons_page(last_name=last_name, limit=3)
+    assert page.prev_cursor is None
+    while True:
+        pages.append([p.id for p in page.items])
+        if page.next_cursor is None:
+            break
+        page = db_funcs.search_persons_page(last_name=last_name, limit=3, after=page.next_cursor)
+    assert [len(p) for p in pages] == [3, 3, 1]
+    assert sum(pages, []) == expected
+
+    back = db_funcs.search_persons_page(last_name=last_name, limit=3, before=page.prev_cursor)
+    assert [p.id for p in back.items] == pages[1]
+    back = db_funcs.search_persons_page(last_name=last_name, limit=3, before=back.prev_cursor)
+    assert [p.id for p in back.items] == pages[0] and back.prev_cursor is None
+
+    # флаги шкал/срезов — по запросу на связь для всей страницы, а не на пациента
+    with count_statements() as statements:
+        page = db_funcs.search_persons_page(last_name=last_name, limit=7)
+    assert len(page.items) == 7 and len(statements) <= 4
+
+
+def test_name_search_ignores_case_and_yo(make_person):
+    tag = uuid.uuid4().hex[:6]
+    person = make_person(f"ИБ-{tag}_1", last_name=f"Семёнова{tag}", first_name="Алёна", patronymic="  Петровна ")
+    make_person(f"ИБ-{tag}-2", last_name=f"Асеменова{tag}", first_name="Анна")
+
+    def cards(**filters):
+        return sorted(p.card_number for p in db_funcs.search_persons(limit=10, **filters))
+
+    assert cards(last_name=f"СЕМЕНОВА{tag}", first_name="алена", patronymic="петровна") == [f"ИБ-{tag}_1"]
+    assert cards(last_name=f"семенова{tag}") == sorted([f"ИБ-{tag}_1", f"ИБ-{tag}-2"])
+    assert cards(last_name=f"семенова{tag}", match="prefix") == [f"ИБ-{tag}_1"]
+    assert cards(card_number=f"иб-{tag}", match="prefix") == sorted([f"ИБ-{tag}_1", f"ИБ-{tag}-2"])
+    # _ и % в запросе — обычные символы, не шаблон LIKE
+    assert cards(card_number=f"{tag}_") == [f"ИБ-{tag}_1"]
+
+    # копии пересчитываются при изменении через ORM
+    db_funcs.update_person_fields(person.id, last_name=f"Ёлкина{tag}")
+    assert cards(last_name=f"елкина{tag}", match="prefix") == [f"ИБ-{tag}_1"]
+    with pytest.raises(ValueError):
+        db_funcs.search_persons(last_name="x", match="fuzzy")
+
+
+def test_fuzzy_search_ranks_typos_and_follows_writes(make_person, count_statements):
+    tag = uuid.uuid4().hex[:6]
+    target = make_person(f"F-{tag}", last_name=f"Ковалёва{tag}", first_name="Ирина", patronymic="Сергеевна")
+    near = make_person(last_name=f"Ковалев{tag}", first_name="Игорь")
+
+    # опечатка в фамилии: точнее совпадает Ковалёва, Ковалев — следом
+    hits = db_funcs.search_persons_fuzzy(f"коволева{tag}")
+    assert [h.person.id for h in hits[:2]] == [target.id, near.id]
+    assert hits[0].similarity > hits[1].similarity >= 0.3
+    # повтор: кандидаты (1–2 запроса), пациенты и их связи — без проверки индекса и N+1
+    with count_statements() as statements:
+        assert db_funcs.search_persons_fuzzy(f"коволева{tag}") == hits
+    assert len(statements) <= 5
+    # имя и отчество с пропущенными буквами отделяют пациентку от однофамильца
+    hits = db_funcs.search_persons_fuzzy(f"ковалева{tag} ирна сергевна")
+    assert hits[0].person.id == target.id and near.id not in [h.person.id for h in hits]
+
+    # индекс следит за изменениями и удалением
+    db_funcs.update_person_fields(near.id, last_name=f"Петренко{tag}")
+    assert near.id not in [h.person.id for h in db_funcs.search_persons_fuzzy(f"ковалев{tag}")]
+    with session_scope() as session:
+        PersonsService(session).delete_person(target.id)
+    assert target.id not in [h.person.id for h in db_funcs.search_persons_fuzzy(f"ковалева{tag}")]
+    assert db_funcs.search_persons_fuzzy("  ") == []
+
+
+def test_similarity_matches_pg_trgm():
+    # similarity('иванов', 'ивнов') в pg_trgm — 4 общих триграммы из 9
+    assert similarity("ивнов", " иванов ") == pytest.approx(4 / 9)
+    assert similarity("Иванов", " иванов иван ") == 1.0
+
+
+def test_prefix_index_follows_writes_without_queries(make_person):
+    tag = uuid.uuid4().hex[:6]
+    person = make_person(f"П{tag}", last_name=f"Жуков{tag}", first_name="Фёдор", patronymic="Ильич")
+    assert [h.id for h in db_funcs.suggest_persons(f"жуков{tag[:3]} фед")] == [person.id]
+
+    index = get_person_index()
+    loads = []
+    loader, index._loader = index._loader, lambda: loads.append(1) or loader()
+    try:
+        # после загрузки индекс обновляется записью через сервис, без перечитывания БД
+        other = make_person(last_name=f"Жукова{tag}", first_name="Алёна")
+        db_funcs.update_person_fields(person.id, last_name=f"Лебедев{tag}")
+        assert [h.id for h in db_funcs.suggest_persons(f"жукова{tag[:2]}")] == [other.id]
+        assert db_funcs.suggest_persons(f"жуков{tag}") == []
+        assert [h.fio for h in db_funcs.suggest_persons(f"лебедев{tag} ильич")] == [f"Лебедев{tag} Фёдор Ильич"]
+        assert db_funcs.suggest_persons(f"п{tag}")[0].id == person.id
+        assert db_funcs.suggest_persons("   ") == []
+
+        # в пакете индекс меняется только после настоящего commit; откат — без следа
+        with pytest.raises(RuntimeError):
+            with unit_of_work(batch=True):
+                make_person(last_name=f"Откатов{tag}")
+                raise RuntimeError("boom")
+        assert db_funcs.suggest_persons(f"откатов{tag}") == []
+        with unit_of_work(batch=True):
+            kept = make_person(last_name=f"Пакетов{tag}")
+            assert db_funcs.suggest_persons(f"пакетов{tag}") == []
+        assert [h.id for h in db_funcs.suggest_persons(f"пакетов{tag}")] == [kept.id]
+        assert loads == []
+    finally:
+        index._loader = loader
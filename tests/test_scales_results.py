@@ -0,0 +1,46 @@
+import pytest
+
+pytest.importorskip("sqlalchemy")
+
+import database.functions as db_funcs  # noqa: E402
+from database.schemas.mmse import MMSEInput  # noqa: E402
+from database.schemas.stopbang import StopBangInput  # noqa: E402
+
+
+def test_scales_results_in_two_queries(make_person, count_statements):
+    person = make_person("sc1")
+    assert db_funcs.scales_get_results(person.id).stopbang is None
+
+    db_funcs.sb_upsert_result(
+        person.id,
+        StopBangInput(
+            s_snoring=True, t_tired_daytime=True, o_observed_apnea=False, p_hypertension=False,
+            g_male=False, age_years=44, bmi_value=34.9, neck_circ_cm=38,
+        ),
+    )
+    db_funcs.mmse_upsert_result(person.id, 10, MMSEInput(**{f: True for f in MMSEInput.model_fields}))
+
+    with count_statements() as queries:
+        results = db_funcs.scales_get_results(person.id)
+
+    assert len(queries) <= 2
+    assert results.stopbang.total_score == 2
+    assert results.mmse_t10 is not None and results.mmse_t0 is None
+    assert results.caprini is None
+
+
+def test_patient_bundle_fixed_query_count(make_person, count_statements):
+    person = make_person("pb1")
+    db_funcs.mmse_upsert_result(person.id, 0, MMSEInput(**{f: True for f in MMSEInput.model_fields}))
+
+    with count_statements() as queries:
+        header = db_funcs.get_patient_bundle(person.id, header_only=True)
+        header_queries = len(queries)
+        bundle = db_funcs.get_patient_bundle(person.id)
+
+    assert header_queries <= 2 and header.scales is None
+    assert len(queries) - header_queries <= 3
+    assert bundle.person.scales.mmse_t0_filled
+    assert bundle.scales.mmse_t0 is not None
+    assert bundle.slices.t0 is None
+    assert db_funcs.get_patient_bundle(10**9) is None
@@ -0,0 +1,40 @@
+import pytest
+
+pytest.importorskip("sqlalchemy")
+
+import database.functions as db_funcs  # noqa: E402
+from database.schemas.slice_t0 import SliceT0Input  # noqa: E402
+from database.schemas.slice_t5 import SliceT5Input  # noqa: E402
+
+
+def test_get_many_one_query_per_timepoint(make_person, count_statements):
+    first, second, empty = make_person("s1"), make_person("s2"), make_person("s3")
+    db_funcs.t0_upsert_result(first.id, SliceT0Input(heart_rate=60))
+    db_funcs.t5_upsert_result(first.id, SliceT5Input(heart_rate=65))
+    db_funcs.t5_upsert_result(second.id, SliceT5Input(heart_rate=80))
+
+    with count_statements() as queries:
+        result = db_funcs.slices_get_many([first.id, second.id, empty.id], [0, 5, 12])
+
+    assert len(queries) == 3
+    assert sorted(result[first.id]) == [0, 5]
+    assert result[second.id][5].heart_rate == 80
+    assert result[empty.id] == {}
+
+
+def test_unknown_timepoint_rejected():
+    with pytest.raises(ValueError):
+        db_funcs.slice_get_result(13, 1)
+
+
+def test_records_match_read_models(make_person):
+    person = make_person("s4")
+    db_funcs.t0_upsert_result(person.id, SliceT0Input(heart_rate=72))
+    db_funcs.t5_upsert_result(person.id, SliceT5Input(heart_rate=90))
+
+    models = db_funcs.slices_get_many([person.id])[person.id]
+    records = db_funcs.slices_get_many_records([person.id])[person.id]
+    assert sorted(records) == sorted(models) == [0, 5]
+    assert records[5].heart_rate == 90
+    for t, model in models.items():
+        assert records[t]._asdict() == model.model_dump()
@@ -0,0 +1,58 @@
+import pytest
+
+pytest.importorskip("sqlalchemy")
+
+import database.functions as db_funcs  # noqa: E402
+from database.db import unit_of_work  # noqa: E402
+from database.schemas.slice_t0 import SliceT0Input  # noqa: E402
+from database.schemas.slice_t1 import SliceT1Input  # noqa: E402
+
+
+def test_batch_reuses_one_connection_and_commits_once(make_person, count_statements):
+    person = make_person("42")
+    with count_statements("checkout") as checkouts:
+        with unit_of_work(batch=True):
+            db_funcs.t0_upsert_result(person.id, SliceT0Input(heart_rate=70))
+            db_funcs.t1_upsert_result(person.id, SliceT1Input(heart_rate=75))
+            refreshed = db_funcs.get_person(person.id)
+
+    assert refreshed.slices.t0_filled and refreshed.slices.t1_filled
+    assert db_funcs.t1_get_result(person.id).heart_rate == 75
+    assert len(checkouts) <= 1
+
+
+def test_batch_rolls_back_on_error(make_person):
+    person = make_person("42")
+    with pytest.raises(RuntimeError):
+        with unit_of_work(batch=True):
+            db_funcs.t0_upsert_result(person.id, SliceT0Input(heart_rate=70))
+            raise RuntimeError("boom")
+    assert db_funcs.t0_get_result(person.id) is None
+
+
+def test_nested_unit_of_work_shares_session():
+    with unit_of_work() as outer:
+        with unit_of_work(batch=True) as inner:
+            assert inner is outer
+
+
+class _Rerun(BaseException):
+    pass
+
+
+def test_control_flow_exception_commits(make_person):
+    person = make_person("42")
+    with pytest.raises(_Rerun):
+        with unit_of_work(commit_on=(_Rerun,)):
+            with unit_of_work(batch=True):
+                db_funcs.t0_upsert_result(person.id, SliceT0Input(heart_rate=70))
+            db_funcs.get_person(person.id)
+            raise _Rerun()
+    assert db_funcs.t0_get_result(person.id).heart_rate == 70
+
+
+def test_shared_session_does_not_hold_read_transaction(make_person):
+    person = make_person("42")
+    with unit_of_work() as session:
+        db_funcs.get_person(person.id)
+        assert not session.in_transaction()